@@ -6,33 +6,55 @@ und Docstrings sowie einheitliche Formatierung hinzugefügt wurden.
 """
 
 import os
+import json
+import uuid
+import hashlib
+import hmac
+import csv
+import sqlite3
+import threading
+import queue
+import atexit
+import io
+import gzip
+import zipfile
+import re
+import glob
+import fcntl
 import logging
+import math
 import schedule
 import time
 import random
 import string
 import smtplib
 from email.mime.text import MIMEText
+from email.utils import format_datetime
 from datetime import datetime, timedelta
+from contextlib import contextmanager
+from functools import wraps
+from urllib.parse import urlencode
+from xml.sax.saxutils import escape as xml_escape
 from dotenv import load_dotenv
-from flask import Flask, jsonify, request, render_template_string, send_file
+from flask import Flask, Blueprint, Response, jsonify, request, send_file, make_response, stream_with_context
 from flask_caching import Cache
-from PIL import Image
-from threading import Thread
-from transformers import pipeline
+from markupsafe import Markup
+from werkzeug.http import parse_accept_header
+try:
+    import brotli
+except ImportError:
+    brotli = None
+from threading import Thread, Lock
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import shutil
-import pandas as pd
-import numpy as np
-import joblib
+import multiprocessing
+from image_worker import configure_pil, compress_image_bytes, derive_image_variant
 import psycopg2
 import redis
-from googleapiclient.discovery import build
-import praw
-from gtts import gTTS
-from moviepy.editor import AudioFileClip, ImageClip
-import tweepy
-from sklearn.ensemble import RandomForestClassifier
 from flask_split import split, ab_test
 
 ##############################################################################
@@ -46,12 +68,24 @@ logging.basicConfig(
 )
 
 app = Flask(__name__)
-cache = Cache(app, config={'CACHE_TYPE': 'simple'})
-split(app)  # Initialisierung von Flask-Split für A/B-Tests
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
+app.register_blueprint(split)  # Initialisierung von Flask-Split für A/B-Tests
 
 # KI-Textgenerierung: Wähle das Modell per ENV-Variable (Standard: gpt2; alternativ: mixtral oder llama2)
+# Das Modell wird erst beim ersten Aufruf von get_generator() geladen (transformers/torch kosten Sekunden und viel RAM)
 KI_MODEL = os.getenv("KI_MODEL", "gpt2")
-generator = pipeline("text-generation", model=KI_MODEL)
+_generator = None
+_generator_lock = Lock()
+
+def get_generator():
+    global _generator
+    if _generator is not None:
+        return _generator
+    with _generator_lock:
+        if _generator is None:
+            from transformers import pipeline
+            _generator = pipeline("text-generation", model=KI_MODEL)
+        return _generator
 
 # Simulationseinstellungen
 USE_SIMULATION = True
@@ -65,6 +99,7 @@ SATURN_PARTNER_ID = os.getenv("SATURN_PARTNER_ID")
 AMAZON_AFFILIATE_ID = os.getenv("AMAZON_AFFILIATE_ID")
 IFTTT_WEBHOOK_URL = os.getenv("IFTTT_WEBHOOK_URL")
 FACEBOOK_ACCESS_TOKEN = os.getenv("FACEBOOK_ACCESS_TOKEN")
+FACEBOOK_PAGE_ID = os.getenv("FACEBOOK_PAGE_ID")
 LINKEDIN_ACCESS_TOKEN = os.getenv("LINKEDIN_ACCESS_TOKEN")
 PINTEREST_ACCESS_TOKEN = os.getenv("PINTEREST_ACCESS_TOKEN")
 REDDIT_ACCESS_TOKEN = os.getenv("REDDIT_ACCESS_TOKEN")
@@ -79,6 +114,11 @@ HOSTING_DOMAIN = os.getenv("HOSTING_DOMAIN")
 GA_TRACKING_ID = os.getenv("GA_TRACKING_ID")
 HOTJAR_ID = os.getenv("HOTJAR_ID", "DEINE_HOTJAR_ID")
 SENDINBLUE_API_KEY = os.getenv("SENDINBLUE_API_KEY")
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")   # Pflicht-Header X-Admin-Token für ändernde Admin-Routen
+
+# API-Endpunkte (überschreibbar, z.B. für lokale Stand-ins im Lasttest)
+SENDINBLUE_API_URL = os.getenv("SENDINBLUE_API_URL", "https://api.sendinblue.com/v3/smtp/email")
+FCM_API_URL = os.getenv("FCM_API_URL", "https://fcm.googleapis.com/fcm/send")
 
 # Neue ENV-Variablen für Matomo Tracking & Dashboard
 MATOMO_URL = os.getenv("MATOMO_URL")         # z.B. "https://matomo.deinedomain.de"
@@ -86,6 +126,941 @@ MATOMO_SITE_ID = os.getenv("MATOMO_SITE_ID")   # z.B. "1"
 MATOMO_TOKEN = os.getenv("MATOMO_TOKEN")
 MATOMO_DASHBOARD_URL = os.getenv("MATOMO_DASHBOARD_URL", "https://matomo.deinedomain.de/index.php?module=Widgetize&action=iframe&widget=1")
 
+##############################################################################
+# Feature-Module & Worker-Rollen
+##############################################################################
+# Die Routen der nummerierten Abschnitte hängen an Feature-Blueprints. WORKER_ROLE legt fest, welche davon ein
+# Worker registriert und welche Hintergrund-Threads er startet (z.B. schlanke Edge-Worker ohne KI-Endpunkte).
+core_bp = Blueprint("core", __name__)
+shop_bp = Blueprint("shop", __name__)
+affiliate_bp = Blueprint("affiliate", __name__)
+images_bp = Blueprint("images", __name__)
+marketing_bp = Blueprint("marketing", __name__)
+seo_bp = Blueprint("seo", __name__)
+ai_bp = Blueprint("ai", __name__)
+admin_bp = Blueprint("admin", __name__)
+
+FEATURE_BLUEPRINTS = {
+    bp.name: bp for bp in (core_bp, shop_bp, affiliate_bp, images_bp, marketing_bp, seo_bp, ai_bp, admin_bp)
+}
+WORKER_ROLES = {
+    "all": tuple(FEATURE_BLUEPRINTS),
+    "edge": ("core", "shop", "affiliate", "images"),
+    "ai": ("core", "ai", "seo"),
+    "backoffice": ("core", "marketing", "admin")
+}
+WORKER_ROLE = os.getenv("WORKER_ROLE", "all").lower()
+if WORKER_ROLE not in WORKER_ROLES:
+    raise ValueError(f"Unbekannte WORKER_ROLE '{WORKER_ROLE}' (erlaubt: {', '.join(WORKER_ROLES)})")
+# WORKER_FEATURES (kommagetrennt) überschreibt die Auswahl der Rolle; "core" ist immer dabei
+WORKER_FEATURES = {"core"} | {
+    f.strip() for f in (os.getenv("WORKER_FEATURES") or ",".join(WORKER_ROLES[WORKER_ROLE])).split(",") if f.strip()
+}
+
+def feature_enabled(name):
+    return name in WORKER_FEATURES
+
+def env_flag(name, default):
+    """Boolesche ENV-Variable; ohne Angabe gilt `default` (meist abhängig von der Worker-Rolle)."""
+    return os.getenv(name, "true" if default else "false").lower() == "true"
+
+##############################################################################
+# Caching: In-Process-LRU vor Redis mit Pub/Sub-Invalidierung
+##############################################################################
+redis_cache = redis.Redis(
+    host=os.getenv("REDIS_HOST", "localhost"),
+    port=int(os.getenv("REDIS_PORT", 6379)),
+    db=0
+)
+
+LOCAL_CACHE_MAX_ITEMS = int(os.getenv("LOCAL_CACHE_MAX_ITEMS", 2048))
+LOCAL_CACHE_TTL = int(os.getenv("LOCAL_CACHE_TTL", 30))
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache-invalidation")
+
+_MISSING = object()
+
+class LRUCache:
+    """Begrenzter, threadsicherer In-Process-Cache (LRU) mit TTL pro Eintrag."""
+
+    def __init__(self, max_items=1024, default_ttl=60):
+        self.max_items = max_items
+        self.default_ttl = default_ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+class TwoTierCache:
+    """Zweistufiger Cache: lokaler LRU (Tier 1) vor Redis (Tier 2).
+
+    Jede Änderung wird über Redis Pub/Sub gemeldet, damit alle Worker ihre lokale Kopie verwerfen.
+    Werte müssen JSON-serialisierbar sein.
+    """
+
+    def __init__(self, redis_client, channel, max_items, local_ttl):
+        self.redis = redis_client
+        self.channel = channel
+        self.local_ttl = local_ttl
+        self.local = LRUCache(max_items, local_ttl)
+        self.instance_id = uuid.uuid4().hex
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "redis_errors": 0, "invalidations_received": 0}
+        self._stats_lock = Lock()
+        self._listener_lock = Lock()
+        self._listener = None
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def get(self, key, default=None):
+        self._ensure_listener()
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            self._count("local_hits")
+            return value
+        try:
+            raw = self.redis.get(key)
+        except redis.RedisError as e:
+            logging.warning(f"Redis-Cache nicht erreichbar ({key}): {e}")
+            self._count("redis_errors")
+            raw = None
+        if raw is None:
+            self._count("misses")
+            return default
+        value = json.loads(raw)
+        self.local.set(key, value, self.local_ttl)
+        self._count("redis_hits")
+        return value
+
+    def set(self, key, value, ttl=3600):
+        self.local.set(key, value, min(ttl, self.local_ttl))
+        try:
+            self.redis.setex(key, ttl, json.dumps(value))
+        except redis.RedisError as e:
+            logging.warning(f"Redis-Cache: Schreiben von {key} fehlgeschlagen: {e}")
+            self._count("redis_errors")
+        self._publish([key])
+
+    def delete(self, *keys):
+        if not keys:
+            return
+        for key in keys:
+            self.local.delete(key)
+        try:
+            self.redis.delete(*keys)
+        except redis.RedisError as e:
+            logging.warning(f"Redis-Cache: Löschen fehlgeschlagen: {e}")
+            self._count("redis_errors")
+        self._publish(keys)
+
+    def get_or_set(self, key, loader, ttl=3600):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value, ttl)
+        return value
+
+    def stats(self):
+        with self._stats_lock:
+            s = dict(self._stats)
+        lookups = s["local_hits"] + s["redis_hits"] + s["misses"]
+        redis_lookups = s["redis_hits"] + s["misses"]
+        s["local_items"] = len(self.local)
+        s["local_hit_ratio"] = round(s["local_hits"] / lookups, 4) if lookups else 0.0
+        s["redis_hit_ratio"] = round(s["redis_hits"] / redis_lookups, 4) if redis_lookups else 0.0
+        s["total_hit_ratio"] = round((s["local_hits"] + s["redis_hits"]) / lookups, 4) if lookups else 0.0
+        return s
+
+    def queue_delete(self, pipe, *keys):
+        """Hängt Löschen und Invalidierungsmeldung an eine Redis-Pipeline an (kein eigener Round Trip)."""
+        for key in keys:
+            self.local.delete(key)
+        pipe.delete(*keys)
+        pipe.publish(self.channel, self._invalidation_message(keys))
+
+    def _invalidation_message(self, keys):
+        return json.dumps({"origin": self.instance_id, "keys": list(keys)})
+
+    def _publish(self, keys):
+        try:
+            self.redis.publish(self.channel, self._invalidation_message(keys))
+        except redis.RedisError as e:
+            logging.warning(f"Cache-Invalidierung konnte nicht verteilt werden: {e}")
+            self._count("redis_errors")
+
+    def _ensure_listener(self):
+        if self._listener is not None:
+            return
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = Thread(target=self._listen, name="cache-invalidation", daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    data = json.loads(message["data"])
+                    if data.get("origin") == self.instance_id:
+                        continue
+                    for key in data.get("keys", []):
+                        self.local.delete(key)
+                    self._count("invalidations_received")
+            except (redis.RedisError, ValueError) as e:
+                # Während der Unterbrechung können Invalidierungen verloren gehen -> Tier 1 verwerfen
+                logging.warning(f"Cache-Invalidierungskanal unterbrochen: {e}")
+                self.local.clear()
+                time.sleep(5)
+
+tiered_cache = TwoTierCache(redis_cache, CACHE_INVALIDATION_CHANNEL, LOCAL_CACHE_MAX_ITEMS, LOCAL_CACHE_TTL)
+
+##############################################################################
+# SQLite-Speicher (thread-lokale Verbindungen)
+##############################################################################
+APP_DB_PATH = os.getenv("APP_DB_PATH", "app_data.db")
+_sqlite_local = threading.local()
+
+def get_sqlite_connection(path=APP_DB_PATH):
+    """Liefert eine thread-lokale SQLite-Verbindung (WAL-Modus, Zeilen als sqlite3.Row)."""
+    conns = getattr(_sqlite_local, "conns", None)
+    if conns is None:
+        conns = _sqlite_local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conns[path] = conn
+    return conn
+
+##############################################################################
+# Rate-Limiting für ausgehende Aufrufe
+##############################################################################
+class RateLimiter:
+    """Token-Bucket: im Mittel `rate` Aufrufe pro Sekunde, Bursts bis `burst`; acquire() blockiert bei Bedarf."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+##############################################################################
+# Ausgehende HTTP-Aufrufe: Keep-Alive, Timeouts, Retries, Circuit Breaker, Metriken
+##############################################################################
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 3.05))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 10))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 20))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", 30))
+
+class CircuitOpenError(Exception):
+    """Der Circuit Breaker eines Providers ist offen, der Aufruf wurde nicht ausgeführt."""
+
+class CircuitBreaker:
+    """Öffnet nach `threshold` Fehlern in Folge; nach `reset_seconds` wird ein Probeaufruf zugelassen."""
+
+    def __init__(self, threshold, reset_seconds):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = "half-open"
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = "closed"
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half-open" or self._failures >= self.threshold:
+                if self.state != "open":
+                    logging.warning(f"Circuit Breaker geöffnet nach {self._failures} Fehlern.")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+class OutboundHttpClient:
+    """Gemeinsamer Client für alle Integrationen.
+
+    Pro Provider gibt es eine requests.Session (Keep-Alive, Connection-Pool je Host), Standard-Timeouts,
+    Retries mit Backoff für idempotente Methoden, einen Circuit Breaker und Latenzmetriken. Innerhalb
+    von `deadline()` werden die Timeouts aller Aufrufe des Threads auf die Restzeit begrenzt.
+    """
+
+    def __init__(self):
+        self._providers = {}
+        self._lock = Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def deadline(self, seconds):
+        """Begrenzt alle Requests des aktuellen Threads auf `seconds` ab jetzt (verschachtelt: die engere gilt)."""
+        previous = getattr(self._local, "deadline", None)
+        deadline = time.monotonic() + seconds
+        self._local.deadline = deadline if previous is None else min(previous, deadline)
+        try:
+            yield
+        finally:
+            self._local.deadline = previous
+
+    def _bounded_timeout(self, provider_name, timeout):
+        deadline = getattr(self._local, "deadline", None)
+        if deadline is None:
+            return timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.Timeout(f"{provider_name}: Deadline überschritten")
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        return (min(connect, remaining), min(read, remaining))
+
+    def _provider(self, name):
+        provider = self._providers.get(name)
+        if provider is not None:
+            return provider
+        with self._lock:
+            if name not in self._providers:
+                retry = Retry(
+                    total=HTTP_MAX_RETRIES,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._providers[name] = {
+                    "session": session,
+                    "breaker": CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS),
+                    "latencies": deque(maxlen=1000),
+                    "calls": 0,
+                    "errors": 0,
+                    "rejected": 0,
+                    "lock": Lock()
+                }
+            return self._providers[name]
+
+    def request(self, provider_name, method, url, **kwargs):
+        provider = self._provider(provider_name)
+        breaker = provider["breaker"]
+        if not breaker.allow():
+            with provider["lock"]:
+                provider["rejected"] += 1
+            raise CircuitOpenError(f"{provider_name}: Circuit Breaker offen")
+        kwargs["timeout"] = self._bounded_timeout(provider_name, kwargs.get("timeout", (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)))
+        started = time.perf_counter()
+        failed = True
+        try:
+            response = provider["session"].request(method, url, **kwargs)
+            failed = response.status_code >= 500 or response.status_code == 429
+            return response
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with provider["lock"]:
+                provider["calls"] += 1
+                provider["errors"] += int(failed)
+                provider["latencies"].append(elapsed_ms)
+            if failed:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+    def get(self, provider_name, url, **kwargs):
+        return self.request(provider_name, "GET", url, **kwargs)
+
+    def post(self, provider_name, url, **kwargs):
+        return self.request(provider_name, "POST", url, **kwargs)
+
+    def metrics(self):
+        result = {}
+        for name, provider in list(self._providers.items()):
+            with provider["lock"]:
+                latencies = sorted(provider["latencies"])
+                stats = {
+                    "calls": provider["calls"],
+                    "errors": provider["errors"],
+                    "rejected": provider["rejected"],
+                    "circuit": provider["breaker"].state
+                }
+            if latencies:
+                stats["latency_ms"] = {
+                    "avg": round(sum(latencies) / len(latencies), 1),
+                    "p50": round(latencies[len(latencies) // 2], 1),
+                    "p95": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+                    "max": round(latencies[-1], 1)
+                }
+            result[name] = stats
+        return result
+
+http_client = OutboundHttpClient()
+
+##############################################################################
+# Analytics-Event-Bus: Events puffern und im Hintergrund gebündelt versenden
+##############################################################################
+ANALYTICS_BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", 100))
+ANALYTICS_FLUSH_INTERVAL = float(os.getenv("ANALYTICS_FLUSH_INTERVAL", 5))
+ANALYTICS_MAX_BUFFER = int(os.getenv("ANALYTICS_MAX_BUFFER", 10000))
+
+class AnalyticsEventBus:
+    """Puffert Analytics-Events im Speicher; ein Hintergrund-Thread versendet sie gebündelt pro Sink.
+
+    Geflusht wird bei `batch_size` Events oder spätestens nach `flush_interval` Sekunden. Ist der
+    Puffer voll, werden neue Events verworfen und gezählt, statt den Request zu blockieren.
+    """
+
+    def __init__(self, batch_size, flush_interval, max_buffer):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sinks = {}
+        self._queue = queue.Queue(maxsize=max_buffer)
+        self._stats = {"enqueued": 0, "dropped": 0, "flushed": 0, "failed": 0, "batches": 0}
+        self._lock = Lock()
+        self._thread = None
+
+    def register_sink(self, name, flush_func):
+        """flush_func erhält eine Liste von Payloads und versendet sie in möglichst wenigen Requests."""
+        self.sinks[name] = flush_func
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def publish(self, sink, payload):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((sink, payload))
+            self._count("enqueued")
+        except queue.Full:
+            self._count("dropped")
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="analytics-bus", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch):
+        by_sink = {}
+        for sink, payload in batch:
+            by_sink.setdefault(sink, []).append(payload)
+        for sink, payloads in by_sink.items():
+            self._count("batches")
+            try:
+                self.sinks[sink](payloads)
+                self._count("flushed", len(payloads))
+            except Exception as e:
+                self._count("failed", len(payloads))
+                logging.error(f"Analytics-Batch ({sink}, {len(payloads)} Events) fehlgeschlagen: {e}")
+
+    def flush_pending(self):
+        """Versendet alles, was noch im Puffer liegt (z.B. beim Herunterfahren)."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._flush(batch)
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+        s["buffered"] = self._queue.qsize()
+        return s
+
+analytics_bus = AnalyticsEventBus(ANALYTICS_BATCH_SIZE, ANALYTICS_FLUSH_INTERVAL, ANALYTICS_MAX_BUFFER)
+atexit.register(analytics_bus.flush_pending)
+
+##############################################################################
+# Transaktionale Outbox: dauerhafte, idempotente ausgehende Sends
+##############################################################################
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 100))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 5))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 8))
+OUTBOX_CLAIM_TIMEOUT = 600
+# Gesendete Zeilen halten den Idempotency-Key; die Aufbewahrung muss länger sein als jedes Dedup-Fenster
+# (FCM_DEDUP_WINDOW, Wiederaufnahme von Kampagnen). Tote Zeilen bleiben zur Analyse länger erhalten.
+OUTBOX_SENT_RETENTION = int(os.getenv("OUTBOX_SENT_RETENTION", 7 * 86400))
+OUTBOX_DEAD_RETENTION = int(os.getenv("OUTBOX_DEAD_RETENTION", 30 * 86400))
+OUTBOX_PURGE_INTERVAL = float(os.getenv("OUTBOX_PURGE_INTERVAL", 3600))
+OUTBOX_PURGE_CHUNK = 1000
+OUTBOX_RELAY_ENABLED = env_flag("OUTBOX_RELAY_ENABLED", feature_enabled("marketing"))
+
+class TransactionalOutbox:
+    """Dauerhafte Warteschlange für ausgehende Sends (SQLite) mit Idempotency-Keys.
+
+    Handler schreiben nur einen Outbox-Eintrag; ein Relay-Thread liefert stapelweise mit Retry und
+    Backoff aus (at-least-once). Ein bereits bekannter Idempotency-Key wird beim Einfügen verworfen.
+    Der Relay löscht regelmäßig gesendete und tote Zeilen nach Ablauf ihrer Aufbewahrungsfrist.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        idempotency_key TEXT NOT NULL UNIQUE,
+        channel TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at REAL NOT NULL,
+        claimed_at REAL,
+        last_error TEXT,
+        created_at TEXT NOT NULL,
+        sent_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(status, next_attempt_at);
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.handlers = {}
+        self._schema_ready = False
+        self._lock = Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._purged = {"sent": 0, "dead": 0}
+
+    def _conn(self):
+        conn = get_sqlite_connection(self.path)
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    conn.executescript(self.SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def register_handler(self, channel, func, batch=False):
+        """func(payload) wirft bei Fehlern; mit batch=True erhält func eine Payload-Liste und
+        liefert pro Payload None (ok) oder eine Fehlermeldung."""
+        self.handlers[channel] = {"func": func, "batch": batch}
+
+    def enqueue(self, channel, payload, idempotency_key=None):
+        """Speichert einen Send dauerhaft; liefert False, wenn der Idempotency-Key schon bekannt ist."""
+        key = idempotency_key or uuid.uuid4().hex
+        conn = self._conn()
+        with conn:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, channel, payload, next_attempt_at, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, channel, json.dumps(payload), time.time(), datetime.now().isoformat())
+            )
+        self._wakeup.set()
+        if cur.rowcount == 0:
+            logging.info(f"Outbox: doppelter Idempotency-Key {key} ({channel}) verworfen.")
+            return False
+        return True
+
+    def enqueue_many(self, channel, keyed_payloads):
+        """Wie enqueue für viele (Idempotency-Key, Payload)-Paare in einer Transaktion; liefert die Anzahl neuer Einträge."""
+        now, created_at = time.time(), datetime.now().isoformat()
+        conn = self._conn()
+        with conn:
+            cur = conn.executemany(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, channel, payload, next_attempt_at, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(key, channel, json.dumps(payload), now, created_at) for key, payload in keyed_payloads]
+            )
+        self._wakeup.set()
+        return cur.rowcount
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="outbox-relay", daemon=True)
+                self._thread.start()
+
+    def _claim_due(self):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, channel, payload, attempts FROM outbox"
+                " WHERE (status = 'pending' AND next_attempt_at <= ?) OR (status = 'sending' AND claimed_at < ?)"
+                " ORDER BY next_attempt_at LIMIT ?",
+                (now, now - OUTBOX_CLAIM_TIMEOUT, OUTBOX_BATCH_SIZE)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE outbox SET status = 'sending', claimed_at = ? WHERE id = ?",
+                [(now, r["id"]) for r in rows]
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        return rows
+
+    def _deliver(self, channel, rows):
+        handler = self.handlers.get(channel)
+        if handler is None:
+            return [f"Kein Handler für Kanal {channel}"] * len(rows)
+        payloads = [json.loads(r["payload"]) for r in rows]
+        if handler["batch"]:
+            try:
+                return handler["func"](payloads)
+            except Exception as e:
+                return [str(e)] * len(rows)
+        errors = []
+        for payload in payloads:
+            try:
+                handler["func"](payload)
+                errors.append(None)
+            except Exception as e:
+                errors.append(str(e))
+        return errors
+
+    def _relay_batch(self, rows):
+        by_channel = {}
+        for row in rows:
+            by_channel.setdefault(row["channel"], []).append(row)
+        now = time.time()
+        sent, retry, dead = [], [], []
+        for channel, channel_rows in by_channel.items():
+            for row, error in zip(channel_rows, self._deliver(channel, channel_rows)):
+                if error is None:
+                    sent.append((datetime.now().isoformat(), row["id"]))
+                    continue
+                attempts = row["attempts"] + 1
+                logging.warning(f"Outbox: {channel}-Send {row['id']} fehlgeschlagen (Versuch {attempts}): {error}")
+                if attempts >= OUTBOX_MAX_ATTEMPTS:
+                    dead.append((attempts, error, row["id"]))
+                else:
+                    retry.append((attempts, now + min(3600, 30 * 2 ** attempts), error, row["id"]))
+        conn = self._conn()
+        with conn:
+            conn.executemany("UPDATE outbox SET status = 'sent', sent_at = ? WHERE id = ?", sent)
+            conn.executemany(
+                "UPDATE outbox SET status = 'pending', attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?", retry
+            )
+            conn.executemany("UPDATE outbox SET status = 'dead', attempts = ?, last_error = ? WHERE id = ?", dead)
+
+    def purge(self, now=None):
+        """Löscht gesendete Zeilen nach OUTBOX_SENT_RETENTION und tote nach OUTBOX_DEAD_RETENTION.
+
+        Maßgeblich ist next_attempt_at (letzter Versuch, nie vor dem Einfügen), damit der Index
+        idx_outbox_due genutzt wird; gelöscht wird in Stücken, um die Schreibsperre kurz zu halten.
+        """
+        now = time.time() if now is None else now
+        conn = self._conn()
+        purged = {}
+        for status, retention in (("sent", OUTBOX_SENT_RETENTION), ("dead", OUTBOX_DEAD_RETENTION)):
+            total = 0
+            while True:
+                with conn:
+                    cur = conn.execute(
+                        "DELETE FROM outbox WHERE id IN (SELECT id FROM outbox WHERE status = ? AND next_attempt_at < ? LIMIT ?)",
+                        (status, now - retention, OUTBOX_PURGE_CHUNK)
+                    )
+                total += cur.rowcount
+                if cur.rowcount < OUTBOX_PURGE_CHUNK:
+                    break
+            purged[status] = total
+        with self._lock:
+            for status, n in purged.items():
+                self._purged[status] += n
+        if purged["dead"]:
+            logging.warning(f"Outbox: {purged['dead']} tote Einträge nach Ablauf der Aufbewahrung gelöscht.")
+        return purged
+
+    def _run(self):
+        last_purge = 0.0
+        while True:
+            try:
+                if time.monotonic() - last_purge >= OUTBOX_PURGE_INTERVAL:
+                    last_purge = time.monotonic()
+                    self.purge()
+                rows = self._claim_due()
+                if rows:
+                    self._relay_batch(rows)
+                    if len(rows) == OUTBOX_BATCH_SIZE:
+                        continue
+            except sqlite3.Error as e:
+                logging.error(f"Outbox-Relay: DB-Fehler: {e}")
+            self._wakeup.wait(OUTBOX_POLL_INTERVAL)
+            self._wakeup.clear()
+
+    def stats(self):
+        """Zeilen je Status (inkl. dead) und die seit dem Start gelöschten Zeilen."""
+        try:
+            rows = self._conn().execute("SELECT status, COUNT(*) AS c FROM outbox GROUP BY status").fetchall()
+        except sqlite3.Error as e:
+            return {"error": str(e)}
+        stats = {r["status"]: r["c"] for r in rows}
+        with self._lock:
+            stats.update({f"purged_{status}": n for status, n in self._purged.items()})
+        return stats
+
+outbox = TransactionalOutbox(APP_DB_PATH)
+if OUTBOX_RELAY_ENABLED:
+    outbox.start()
+
+##############################################################################
+# Admin-Authentifizierung für ändernde Routen
+##############################################################################
+def require_admin(view):
+    """Lässt den Request nur mit korrektem X-Admin-Token (ADMIN_API_TOKEN) durch; ohne Token-Konfiguration 403."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        supplied = request.headers.get("X-Admin-Token", "")
+        if not ADMIN_API_TOKEN or not hmac.compare_digest(supplied.encode("utf-8"), ADMIN_API_TOKEN.encode("utf-8")):
+            logging.warning(f"Admin-Zugriff verweigert: {request.method} {request.path} von {request.remote_addr}")
+            return jsonify({"error": "Nicht autorisiert"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+##############################################################################
+# HTTP-Response-Caching mit ETag/304
+##############################################################################
+def cached_response(ttl, vary_args=(), vary_headers=()):
+    """Cacht die Antwort einer GET-Route im zweistufigen Cache inkl. starkem ETag, 304 und Cache-Control.
+
+    vary_args sind Query-Parameter, vary_headers Request-Header, die in den Cache-Key eingehen;
+    Letztere werden zusätzlich im Vary-Header gemeldet, damit auch das CDN korrekt unterscheidet.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            parts = [request.endpoint]
+            parts += [f"{k}={v}" for k, v in sorted(kwargs.items())]
+            parts += [f"{a}={request.args.get(a, '')}" for a in vary_args]
+            parts += [f"{h}={request.headers.get(h, '')}" for h in vary_headers]
+            key = "resp:" + hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+            entry = tiered_cache.get(key)
+            if entry is None:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200 or resp.is_streamed:
+                    return resp
+                entry = {
+                    "body": resp.get_data(as_text=True),
+                    "mimetype": resp.mimetype,
+                    "etag": hashlib.sha256(resp.get_data()).hexdigest()[:32]
+                }
+                tiered_cache.set(key, entry, ttl)
+            if request.if_none_match.contains_weak(entry["etag"]):
+                resp = app.response_class(status=304)
+            else:
+                resp = app.response_class(entry["body"], mimetype=entry["mimetype"])
+            resp.set_etag(entry["etag"])
+            resp.cache_control.public = True
+            resp.cache_control.max_age = ttl
+            if vary_headers:
+                resp.vary.update(vary_headers)
+            return resp
+        return wrapper
+    return decorator
+
+##############################################################################
+# Template-Registry: einmal kompilierte Jinja-Templates
+##############################################################################
+class TemplateRegistry:
+    """Seiten-Templates, die einmal (beim ersten Rendern) über die Jinja-Umgebung der App kompiliert
+    und danach nur noch mit Kontextvariablen gerendert werden. Autoescaping ist aktiv."""
+
+    def __init__(self, env):
+        self.env = env
+        self._sources = {}
+        self._compiled = {}
+        self._lock = Lock()
+
+    def register(self, name, source):
+        with self._lock:
+            self._sources[name] = source
+            self._compiled.pop(name, None)
+
+    def get(self, name):
+        template = self._compiled.get(name)
+        if template is None:
+            with self._lock:
+                template = self._compiled.get(name)
+                if template is None:
+                    template = self._compiled[name] = self.env.from_string(self._sources[name])
+        return template
+
+    def render(self, name, **context):
+        return self.get(name).render(**context)
+
+page_templates = TemplateRegistry(app.jinja_env)
+
+##############################################################################
+# Antwortkomprimierung (WSGI-Middleware) mit Cache für komprimierte Bodies
+##############################################################################
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+COMPRESSION_CACHE_ITEMS = int(os.getenv("COMPRESSION_CACHE_ITEMS", 512))
+COMPRESSION_CACHE_TTL = 3600
+COMPRESSIBLE_MIMETYPES = (
+    "text/", "application/json", "application/javascript", "application/xml",
+    "application/rss+xml", "application/atom+xml", "application/x-ndjson", "image/svg+xml"
+)
+# Wie bei Apache mod_deflate bekommt die ETag einer komprimierten Antwort das Kodierungssuffix
+COMPRESSION_ETAG_SUFFIXES = ("-br", "-gzip")
+
+class CompressionMiddleware:
+    """Komprimiert Antworten per gzip/Brotli (Accept-Encoding), sofern sie groß genug und von einem
+    komprimierbaren Typ sind. Unverändert bleiben Bilder/Binärdaten, Antworten mit Content-Encoding,
+    HEAD-Anfragen und Streams ohne Content-Length. Bodies mit ETag werden komprimiert im LRU gehalten.
+    """
+
+    def __init__(self, wsgi_app, min_size=COMPRESSION_MIN_SIZE, cache_items=COMPRESSION_CACHE_ITEMS):
+        self.wsgi_app = wsgi_app
+        self.min_size = min_size
+        self._cache = LRUCache(cache_items, COMPRESSION_CACHE_TTL)
+        self.encodings = ["br", "gzip"] if brotli else ["gzip"]
+
+    @staticmethod
+    def _compress(body, encoding):
+        if encoding == "br":
+            return brotli.compress(body, quality=5)
+        return gzip.compress(body, compresslevel=6)
+
+    @staticmethod
+    def _strip_etag_suffixes(value):
+        for suffix in COMPRESSION_ETAG_SUFFIXES:
+            value = value.replace(suffix + '"', '"')
+        return value
+
+    def _should_compress(self, environ, status, headers):
+        if environ.get("REQUEST_METHOD") == "HEAD" or not status.startswith("200"):
+            return False
+        if "content-encoding" in headers or "content-length" not in headers:
+            return False
+        mimetype = headers.get("content-type", "").split(";")[0].strip().lower()
+        return mimetype.startswith(COMPRESSIBLE_MIMETYPES) and int(headers["content-length"]) >= self.min_size
+
+    def __call__(self, environ, start_response):
+        encoding = parse_accept_header(environ.get("HTTP_ACCEPT_ENCODING", "")).best_match(self.encodings)
+        if encoding is None:
+            return self.wsgi_app(environ, start_response)
+        if_none_match = environ.get("HTTP_IF_NONE_MATCH")
+        stripped = False
+        if if_none_match:
+            # Die App kennt nur die ETag der unkomprimierten Antwort
+            environ["HTTP_IF_NONE_MATCH"] = self._strip_etag_suffixes(if_none_match)
+            stripped = environ["HTTP_IF_NONE_MATCH"] != if_none_match
+
+        captured = {}
+
+        def capture_start_response(status, headers, exc_info=None):
+            captured.update(status=status, headers=headers, exc_info=exc_info)
+            # Flask nutzt das write()-Callable nicht; Bodies kommen immer über den Iterator
+            return None
+
+        app_iter = self.wsgi_app(environ, capture_start_response)
+        status, headers = captured["status"], captured["headers"]
+        header_map = {k.lower(): v for k, v in headers}
+        etag = header_map.get("etag")
+
+        if not self._should_compress(environ, status, header_map):
+            if stripped and status.startswith("304") and etag and self._strip_etag_suffixes(etag) == etag:
+                headers = [(k, v) for k, v in headers if k.lower() != "etag"]
+                headers.append(("ETag", etag[:-1] + f'-{encoding}"'))
+            start_response(status, headers, captured["exc_info"])
+            return app_iter
+
+        cache_key = f"{etag}|{encoding}" if etag else None
+        body = self._cache.get(cache_key) if cache_key else None
+        if body is None:
+            try:
+                body = self._compress(b"".join(app_iter), encoding)
+            finally:
+                if hasattr(app_iter, "close"):
+                    app_iter.close()
+            if cache_key:
+                self._cache.set(cache_key, body)
+        elif hasattr(app_iter, "close"):
+            app_iter.close()
+
+        headers = [(k, v) for k, v in headers if k.lower() not in ("content-length", "etag", "vary")]
+        vary = [v.strip() for v in header_map.get("vary", "").split(",") if v.strip()]
+        if "accept-encoding" not in (v.lower() for v in vary):
+            vary.append("Accept-Encoding")
+        headers += [("Content-Encoding", encoding), ("Content-Length", str(len(body))), ("Vary", ", ".join(vary))]
+        if etag:
+            headers.append(("ETag", etag[:-1] + f'-{encoding}"'))
+        start_response(status, headers, captured["exc_info"])
+        return [body]
+
+if COMPRESSION_ENABLED:
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app)
+
 ##############################################################################
 # 1. A/B-Testing: Headlines & CTAs
 ##############################################################################
@@ -108,8 +1083,39 @@ def get_random_cta():
     """Gibt einen zufälligen Call-to-Action zurück."""
     return random.choice(CTA_VARIANTS)
 
+GA_BATCH_LIMIT = 20   # Maximale Hits pro Request an den GA-Batch-Endpoint
+
+def post_ga_batch(payloads):
+    """Sendet bis zu GA_BATCH_LIMIT Hits über den Measurement-Protocol-Batch-Endpoint; wirft bei HTTP-Fehlern."""
+    body = "\n".join(urlencode(p) for p in payloads)
+    response = http_client.post("ga", "https://www.google-analytics.com/batch", data=body)
+    response.raise_for_status()
+    logging.info(f"GA-Batch ({len(payloads)} Events) gesendet: {response.status_code}")
+
+def send_ga_chunks(payloads):
+    """Sendet Hits in Chunks zu GA_BATCH_LIMIT; liefert pro Payload None (ok) oder die Fehlermeldung."""
+    errors = []
+    for i in range(0, len(payloads), GA_BATCH_LIMIT):
+        chunk = payloads[i:i + GA_BATCH_LIMIT]
+        try:
+            post_ga_batch(chunk)
+            errors.extend([None] * len(chunk))
+        except Exception as e:
+            errors.extend([str(e)] * len(chunk))
+    return errors
+
+def flush_ga_events(payloads):
+    """Bus-Sink: sendet direkt; Hits aus fehlgeschlagenen Chunks gehen mit Retry über die Outbox."""
+    failed = [(p, error) for p, error in zip(payloads, send_ga_chunks(payloads)) if error is not None]
+    if failed:
+        logging.warning(f"GA-Batch fehlgeschlagen, {len(failed)} Events gehen an die Outbox: {failed[0][1]}")
+        outbox.enqueue_many("ga", [(f"ga:{p['z']}", p) for p, _ in failed])
+
+analytics_bus.register_sink("ga", flush_ga_events)
+outbox.register_handler("ga", send_ga_chunks, batch=True)
+
 def track_ab_test_event(variant_type, variant_value):
-    """Sendet (oder simuliert) ein GA-Event für A/B-Tests."""
+    """Reiht ein GA-Event für A/B-Tests zum gebündelten Versand ein (oder simuliert es)."""
     event_name = f"ABTest_{variant_type}"
     event_category = "A/B Testing"
     event_label = variant_value
@@ -128,43 +1134,171 @@ def track_ab_test_event(variant_type, variant_value):
             "ec": event_category,
             "ea": event_name,
             "el": event_label,
+            "z": uuid.uuid4().hex,  # Cache-Buster, dient zugleich als Idempotency-Key in der Outbox
         }
-        try:
-            response = requests.post("https://www.google-analytics.com/collect", data=payload)
-            logging.info(f"GA A/B Event gesendet: {response.status_code}")
-        except Exception as e:
-            logging.error(f"GA A/B Event Fehler: {e}")
+        analytics_bus.publish("ga", payload)
 
 ##############################################################################
 # 2. E-Mail & Push-Funktionen (SMTP, FCM)
 ##############################################################################
-def send_email_smtp(recipient, subject, body):
-    """Sendet eine E-Mail via SMTP oder simuliert den Versand."""
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 2))
+SMTP_MAX_MESSAGES_PER_SESSION = int(os.getenv("SMTP_MAX_MESSAGES_PER_SESSION", 100))
+SMTP_IDLE_TIMEOUT = int(os.getenv("SMTP_IDLE_TIMEOUT", 60))
+SMTP_USE_STARTTLS = os.getenv("SMTP_USE_STARTTLS", "true").lower() == "true"
+SMTP_TIMEOUT = 30
+
+class SmtpSessionPool:
+    """Kleiner Pool authentifizierter SMTP-Sitzungen, die für viele Nachrichten wiederverwendet werden.
+
+    Abgebrochene Sitzungen werden transparent neu aufgebaut; nach SMTP_MAX_MESSAGES_PER_SESSION
+    Nachrichten bzw. SMTP_IDLE_TIMEOUT Sekunden Leerlauf wird die Sitzung erneuert.
+    """
+
+    def __init__(self, size):
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @staticmethod
+    def _connect():
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        if SMTP_USE_STARTTLS:
+            server.starttls()
+        if EMAIL_PASSWORD:
+            server.login(EMAIL_SENDER, EMAIL_PASSWORD)
+        return {"server": server, "sent": 0, "last_used": time.monotonic(), "healthy": True}
+
+    @staticmethod
+    def _close(session):
+        try:
+            session["server"].quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+    @staticmethod
+    def _is_connection_error(exc):
+        if isinstance(exc, smtplib.SMTPResponseException):
+            return exc.smtp_code == 421
+        return isinstance(exc, (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError))
+
+    def _acquire(self):
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    session = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if time.monotonic() - session["last_used"] <= SMTP_IDLE_TIMEOUT:
+                    return session
+                self._close(session)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, session):
+        if session["healthy"] and session["sent"] < SMTP_MAX_MESSAGES_PER_SESSION:
+            session["last_used"] = time.monotonic()
+            self._idle.put(session)
+        else:
+            self._close(session)
+        self._slots.release()
+
+    def _reconnect(self, session):
+        self._close(session)
+        session["healthy"] = False
+        session.update(self._connect())
+
+    def _send(self, session, msg):
+        if session["sent"] >= SMTP_MAX_MESSAGES_PER_SESSION:
+            self._reconnect(session)
+        try:
+            session["server"].send_message(msg)
+        except (smtplib.SMTPException, OSError) as e:
+            if not self._is_connection_error(e):
+                raise
+            logging.info(f"SMTP-Sitzung abgebrochen ({e}) – verbinde neu.")
+            self._reconnect(session)
+            session["server"].send_message(msg)
+        session["sent"] += 1
+
+    def send_many(self, messages):
+        """Sendet Nachrichten über eine Pool-Sitzung; liefert pro Nachricht None (ok) oder die Fehlermeldung."""
+        results = []
+        session = None
+        try:
+            session = self._acquire()
+            for msg in messages:
+                try:
+                    self._send(session, msg)
+                    results.append(None)
+                except smtplib.SMTPException as e:
+                    if self._is_connection_error(e):
+                        raise
+                    results.append(str(e))
+        except (smtplib.SMTPException, OSError) as e:
+            logging.error(f"SMTP-Pool: Verbindung fehlgeschlagen: {e}")
+            results.extend([str(e)] * (len(messages) - len(results)))
+            if session is not None:
+                session["healthy"] = False
+        finally:
+            if session is not None:
+                self._release(session)
+        return results
+
+smtp_pool = SmtpSessionPool(SMTP_POOL_SIZE)
+_smtp_executor = ThreadPoolExecutor(max_workers=SMTP_POOL_SIZE, thread_name_prefix="smtp")
+
+def build_email_message(recipient, subject, body):
+    msg = MIMEText(body, _charset="utf-8")
+    msg['Subject'] = subject
+    msg['From'] = EMAIL_SENDER
+    msg['To'] = recipient
+    return msg
+
+def deliver_email_smtp(recipient, subject, body):
+    """Sendet eine E-Mail über den SMTP-Pool oder simuliert den Versand; wirft bei Fehlern."""
     if USE_SIMULATION:
         logging.info(f"(Simuliert) E-Mail an {recipient} | Subject: {subject} | Body: {body}")
         return
+    error = smtp_pool.send_many([build_email_message(recipient, subject, body)])[0]
+    if error is not None:
+        raise RuntimeError(f"SMTP-Fehler an {recipient}: {error}")
+    logging.info(f"E-Mail erfolgreich an {recipient} gesendet.")
+
+def send_email_smtp(recipient, subject, body):
+    """Wie deliver_email_smtp, Fehler werden nur geloggt (für Admin-Alarme ohne Retry)."""
     try:
-        msg = MIMEText(body, _charset="utf-8")
-        msg['Subject'] = subject
-        msg['From'] = EMAIL_SENDER
-        msg['To'] = recipient
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(EMAIL_SENDER, EMAIL_PASSWORD)
-            server.send_message(msg)
-        logging.info(f"E-Mail erfolgreich an {recipient} gesendet.")
+        deliver_email_smtp(recipient, subject, body)
     except Exception as e:
         logging.error(f"Fehler beim E-Mail-Senden an {recipient}: {e}")
 
-def send_fcm_notification(message, title="Benachrichtigung"):
-    """Sendet eine FCM-Benachrichtigung oder simuliert diese."""
+def send_many_emails(emails):
+    """Sendet viele (Empfänger, Betreff, Text)-Tupel gebündelt über alle Pool-Sitzungen.
+
+    Liefert eine Liste in Eingabereihenfolge mit None (ok) oder der Fehlermeldung je Nachricht.
+    """
+    if USE_SIMULATION:
+        for recipient, subject, body in emails:
+            logging.info(f"(Simuliert) E-Mail an {recipient} | Subject: {subject} | Body: {body}")
+        return [None] * len(emails)
+    messages = [build_email_message(*e) for e in emails]
+    chunks = [messages[i:i + SMTP_MAX_MESSAGES_PER_SESSION] for i in range(0, len(messages), SMTP_MAX_MESSAGES_PER_SESSION)]
+    results = []
+    for chunk_results in _smtp_executor.map(smtp_pool.send_many, chunks):
+        results.extend(chunk_results)
+    failed = sum(1 for r in results if r is not None)
+    logging.info(f"SMTP-Batch: {len(results) - failed} gesendet, {failed} fehlgeschlagen.")
+    return results
+
+def deliver_fcm_notification(message, title="Benachrichtigung"):
+    """Sendet eine FCM-Benachrichtigung synchron oder simuliert diese; wirft bei Fehlern (Retry über die Outbox)."""
     if USE_SIMULATION:
         logging.info(f"(Simuliert FCM) {title}: {message}")
         return
     if not FCM_SERVER_KEY:
         logging.info("FCM_SERVER_KEY fehlt – Überspringe FCM-Benachrichtigung.")
         return
-    url = "https://fcm.googleapis.com/fcm/send"
+    url = FCM_API_URL
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"key={FCM_SERVER_KEY}"
@@ -173,14 +1307,169 @@ def send_fcm_notification(message, title="Benachrichtigung"):
         "to": "/topics/all",
         "notification": {"title": title, "body": message}
     }
+    response = http_client.post("fcm", url, headers=headers, json=payload)
+    if response.status_code != 200:
+        raise RuntimeError(f"FCM-Benachrichtigung fehlgeschlagen ({response.status_code}): {response.text}")
+    logging.info("FCM-Benachrichtigung erfolgreich gesendet.")
+
+FCM_RATE_LIMIT = float(os.getenv("FCM_RATE_LIMIT", 50))
+FCM_DEDUP_WINDOW = float(os.getenv("FCM_DEDUP_WINDOW", 300))
+FCM_FLUSH_INTERVAL = float(os.getenv("FCM_FLUSH_INTERVAL", 2))
+FCM_MAX_QUEUE = 10000
+FCM_DIGEST_MAX_LINES = 5
+
+fcm_limiter = RateLimiter(FCM_RATE_LIMIT)
+
+class NotificationDispatcher:
+    """Asynchroner FCM-Versand mit Deduplizierung, Bündelung und Prioritätsspur.
+
+    Identische Titel+Nachricht innerhalb von `dedup_window` Sekunden werden verworfen. Normale
+    Meldungen werden `flush_interval` Sekunden gesammelt; nur als coalesce=True markierte Meldungen
+    (gleiches Topic, kein nutzerbezogener Inhalt) werden pro Titel zu einer Sammelmeldung zusammengefasst.
+    Meldungen mit priority="high" gehen über eine eigene Spur sofort an `deliver_high` (direkter
+    Versand, damit sie nicht hinter dem Outbox-Rückstau warten). Normale Meldungen übergibt `deliver`
+    an die Outbox, die Rate-Limit und Retry übernimmt.
+    """
+
+    def __init__(self, deliver, dedup_window, flush_interval, deliver_high=None):
+        self.deliver = deliver
+        self.deliver_high = deliver_high or deliver
+        self.dedup_window = dedup_window
+        self.flush_interval = flush_interval
+        self._high = queue.Queue()
+        self._normal = queue.Queue(maxsize=FCM_MAX_QUEUE)
+        self._recent = OrderedDict()   # (Titel, Nachricht) -> Zeitpunkt, älteste zuerst
+        self._stats = {"enqueued": 0, "deduplicated": 0, "dropped": 0, "coalesced": 0, "sent": 0, "failed": 0}
+        self._lock = Lock()
+        self._threads = None
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def _expire_recent(self, now):
+        """Entfernt abgelaufene Dedup-Einträge von vorne; Kosten nur proportional zu den abgelaufenen."""
+        while self._recent:
+            oldest_at = next(iter(self._recent.values()))
+            if now - oldest_at < self.dedup_window and len(self._recent) <= FCM_MAX_QUEUE:
+                break
+            self._recent.popitem(last=False)
+
+    def notify(self, message, title, priority="normal", block=False, coalesce=False):
+        """Reiht eine Meldung ein; liefert False, wenn sie verworfen wurde (Duplikat oder Puffer voll).
+
+        block=True wartet bei vollem Puffer (für Massenläufe, die nichts verlieren sollen).
+        coalesce=True erlaubt das Zusammenfassen mit anderen Meldungen desselben Titels.
+        """
+        now = time.monotonic()
+        key = (title, message)
+        with self._lock:
+            self._expire_recent(now)
+            if key in self._recent:
+                self._stats["deduplicated"] += 1
+                return False
+            self._recent[key] = now
+        self._ensure_started()
+        try:
+            (self._high if priority == "high" else self._normal).put((title, message, coalesce), block=block)
+            self._count("enqueued")
+        except queue.Full:
+            self._count("dropped")
+            return False
+        return True
+
+    def _ensure_started(self):
+        if self._threads is not None:
+            return
+        with self._lock:
+            if self._threads is None:
+                self._threads = [
+                    Thread(target=self._run_high, name="fcm-high", daemon=True),
+                    Thread(target=self._run_normal, name="fcm-normal", daemon=True)
+                ]
+                for t in self._threads:
+                    t.start()
+
+    def _send(self, title, message, deliver=None):
+        try:
+            (deliver or self.deliver)(message, title)
+            self._count("sent")
+        except Exception as e:
+            self._count("failed")
+            logging.error(f"FCM-Versand fehlgeschlagen ({title}): {e}")
+
+    def _run_high(self):
+        while True:
+            title, message, _ = self._high.get()
+            self._send(title, message, self.deliver_high)
+
+    def _run_normal(self):
+        while True:
+            batch = [self._normal.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._normal.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+
+    def _flush(self, batch):
+        """Sendet einzelne Meldungen direkt und fasst coalescible Meldungen pro Titel zusammen."""
+        by_title = OrderedDict()
+        for title, message, coalesce in batch:
+            if coalesce:
+                by_title.setdefault(title, []).append(message)
+            else:
+                self._send(title, message)
+        for title, messages in by_title.items():
+            if len(messages) == 1:
+                self._send(title, messages[0])
+                continue
+            self._count("coalesced", len(messages) - 1)
+            lines = messages[:FCM_DIGEST_MAX_LINES]
+            more = len(messages) - len(lines)
+            digest = f"{len(messages)} Meldungen: " + " | ".join(lines) + (f" | (+{more} weitere)" if more else "")
+            self._send(title, digest)
+
+    def stats(self):
+        with self._lock:
+            s = dict(self._stats)
+        s["queued_high"] = self._high.qsize()
+        s["queued_normal"] = self._normal.qsize()
+        return s
+
+def enqueue_fcm_notification(message, title):
+    """Übergibt eine Meldung an die Outbox; gleicher Titel+Text im selben Dedup-Fenster ergibt denselben Key."""
+    digest = hashlib.sha1(f"{title}\n{message}".encode("utf-8")).hexdigest()
+    window = int(time.time() // FCM_DEDUP_WINDOW)
+    outbox.enqueue("fcm", {"message": message, "title": title}, idempotency_key=f"fcm:{digest}:{window}")
+
+def _outbox_send_fcm(payload):
+    fcm_limiter.acquire()
+    deliver_fcm_notification(payload["message"], payload["title"])
+
+def deliver_fcm_priority(message, title):
+    """Kritische Meldungen: sofort direkt senden, die Outbox dient nur als dauerhafter Fallback."""
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        if response.status_code == 200:
-            logging.info("FCM-Benachrichtigung erfolgreich gesendet.")
-        else:
-            logging.warning(f"FCM-Benachrichtigung fehlgeschlagen: {response.text}")
+        fcm_limiter.acquire()
+        deliver_fcm_notification(message, title)
     except Exception as e:
-        logging.error(f"FCM-Fehler: {e}")
+        logging.warning(f"Direkter FCM-Versand fehlgeschlagen ({title}), übergebe an Outbox: {e}")
+        enqueue_fcm_notification(message, title)
+
+notification_dispatcher = NotificationDispatcher(enqueue_fcm_notification, FCM_DEDUP_WINDOW, FCM_FLUSH_INTERVAL,
+                                                 deliver_high=deliver_fcm_priority)
+
+def send_fcm_notification(message, title="Benachrichtigung", priority="normal", coalesce=False):
+    """Reiht eine FCM-Benachrichtigung ein und kehrt sofort zurück (priority="high" für kritische Alarme).
+
+    coalesce=True nur für Betriebsmeldungen ohne nutzerbezogenen Inhalt.
+    """
+    notification_dispatcher.notify(message, title, priority, coalesce=coalesce)
 
 ##############################################################################
 # 3. Sendinblue E-Mail Versand
@@ -198,19 +1487,17 @@ def optimize_email_subject(possible_subjects):
     return chosen
 
 def send_sendinblue_email(user_email, base_content, possible_subjects, user_behavior):
-    """Sendet eine E-Mail über Sendinblue oder per SMTP-Fallback."""
+    """Sendet eine E-Mail über Sendinblue oder per SMTP-Fallback; wirft, wenn auch der Fallback scheitert."""
+    subject = optimize_email_subject(possible_subjects)
+    content_html = personalize_email_content(user_behavior, base_content)
     if not SENDINBLUE_API_KEY:
         logging.info("Sendinblue nicht konfiguriert – nutze SMTP-Fallback.")
-        sbj = optimize_email_subject(possible_subjects)
-        cnt = personalize_email_content(user_behavior, base_content)
-        send_email_smtp(user_email, sbj, cnt)
+        deliver_email_smtp(user_email, subject, content_html)
         return
-    subject = optimize_email_subject(possible_subjects)
-    content_html = personalize_email_content(user_behavior, base_content)
     if USE_SIMULATION:
         logging.info(f"(Simuliert Sendinblue) E-Mail an {user_email}: {subject} | {content_html}")
         return
-    url = "https://api.sendinblue.com/v3/smtp/email"
+    url = SENDINBLUE_API_URL
     headers = {"api-key": SENDINBLUE_API_KEY, "Content-Type": "application/json"}
     data = {
         "sender": {"name": "Dein Unternehmen", "email": EMAIL_SENDER},
@@ -219,68 +1506,266 @@ def send_sendinblue_email(user_email, base_content, possible_subjects, user_beha
         "htmlContent": f"<p>{content_html}</p>"
     }
     try:
-        r = requests.post(url, headers=headers, json=data)
+        r = http_client.post("sendinblue", url, headers=headers, json=data)
         if r.status_code in (200, 201):
             logging.info(f"Sendinblue-E-Mail erfolgreich an {user_email} gesendet.")
-        else:
-            logging.warning(f"Fehler beim Senden über Sendinblue: {r.text}")
-            send_email_smtp(user_email, subject, content_html)
+            return
+        logging.warning(f"Fehler beim Senden über Sendinblue: {r.text}")
     except Exception as e:
         logging.error(f"Sendinblue-Fehler: {e}")
-        send_email_smtp(user_email, subject, content_html)
+    deliver_email_smtp(user_email, subject, content_html)
+
+SENDINBLUE_BATCH_SIZE = int(os.getenv("SENDINBLUE_BATCH_SIZE", 100))
+
+def send_sendinblue_batch(user_emails, base_content, possible_subjects, user_behavior):
+    """Sendet denselben Inhalt an viele Empfänger in einem Sendinblue-Request (messageVersions).
+
+    Ohne Sendinblue-Konfiguration oder bei API-Fehlern wird gebündelt über den SMTP-Pool versendet.
+    Liefert wie send_many_emails pro Empfänger None (ok) oder die Fehlermeldung.
+    """
+    subject = optimize_email_subject(possible_subjects)
+    content_html = personalize_email_content(user_behavior, base_content)
+    if not SENDINBLUE_API_KEY:
+        return send_many_emails([(e, subject, content_html) for e in user_emails])
+    if USE_SIMULATION:
+        logging.info(f"(Simuliert Sendinblue) Batch an {len(user_emails)} Empfänger: {subject}")
+        return [None] * len(user_emails)
+    url = SENDINBLUE_API_URL
+    headers = {"api-key": SENDINBLUE_API_KEY, "Content-Type": "application/json"}
+    data = {
+        "sender": {"name": "Dein Unternehmen", "email": EMAIL_SENDER},
+        "subject": subject,
+        "htmlContent": f"<p>{content_html}</p>",
+        "messageVersions": [{"to": [{"email": e}]} for e in user_emails]
+    }
+    try:
+        r = http_client.post("sendinblue", url, headers=headers, json=data)
+        if r.status_code in (200, 201):
+            logging.info(f"Sendinblue-Batch an {len(user_emails)} Empfänger gesendet.")
+            return [None] * len(user_emails)
+        logging.warning(f"Fehler beim Sendinblue-Batch: {r.text}")
+    except Exception as e:
+        logging.error(f"Sendinblue-Batch-Fehler: {e}")
+    return send_many_emails([(e, subject, content_html) for e in user_emails])
+
+def _outbox_send_emails(payloads):
+    return send_many_emails([(p["recipient"], p["subject"], p["body"]) for p in payloads])
+
+def _outbox_send_sendinblue(payload):
+    send_sendinblue_email(payload["user_email"], payload["base_content"], payload["possible_subjects"], payload["user_behavior"])
+
+outbox.register_handler("email", _outbox_send_emails, batch=True)
+outbox.register_handler("sendinblue", _outbox_send_sendinblue)
+outbox.register_handler("fcm", _outbox_send_fcm)
 
 ##############################################################################
 # 4. Willkommens-Serie & Retargeting
 ##############################################################################
+DRIP_POLL_INTERVAL = float(os.getenv("DRIP_POLL_INTERVAL", 30))
+DRIP_BATCH_SIZE = int(os.getenv("DRIP_BATCH_SIZE", 100))
+DRIP_MAX_ATTEMPTS = 5
+DRIP_CLAIM_TIMEOUT = 600
+DRIP_DISPATCHER_ENABLED = env_flag("DRIP_DISPATCHER_ENABLED", feature_enabled("marketing"))
+
+class DripScheduler:
+    """Persistente, zeitgesteuerte Sends (SQLite) mit Dispatcher-Thread.
+
+    Der Index auf (status, due_at) dient als Prioritätswarteschlange: der Dispatcher holt fällige
+    Nachrichten stapelweise, schläft bis zur nächsten Fälligkeit und wird bei neuen Einträgen geweckt.
+    (user_email, series, step) ist eindeutig, mehrfache Anmeldungen planen also nichts doppelt.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS drip_sends (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_email TEXT NOT NULL,
+        series TEXT NOT NULL,
+        step INTEGER NOT NULL,
+        subject TEXT NOT NULL,
+        content TEXT NOT NULL,
+        due_at REAL NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        claimed_at REAL,
+        last_error TEXT,
+        UNIQUE (user_email, series, step)
+    );
+    CREATE INDEX IF NOT EXISTS idx_drip_sends_due ON drip_sends(status, due_at);
+    """
+
+    def __init__(self, path, deliver):
+        self.path = path
+        self.deliver = deliver
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._lock = Lock()
+        self._schema_ready = False
+
+    def _conn(self):
+        conn = get_sqlite_connection(self.path)
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    conn.executescript(self.SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def schedule(self, user_email, series, steps, start=None):
+        """Plant (Tagesversatz, Betreff, Inhalt)-Schritte ein und liefert die Anzahl neu geplanter Sends."""
+        start = time.time() if start is None else start
+        rows = [
+            (user_email, series, step, subject, content, start + offset_days * 86400)
+            for step, (offset_days, subject, content) in enumerate(steps)
+        ]
+        conn = self._conn()
+        with conn:
+            cur = conn.executemany(
+                "INSERT OR IGNORE INTO drip_sends (user_email, series, step, subject, content, due_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        self._wakeup.set()
+        return cur.rowcount
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="drip-dispatcher", daemon=True)
+                self._thread.start()
+
+    def _claim_due(self):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT * FROM drip_sends WHERE (status = 'pending' AND due_at <= ?)"
+                " OR (status = 'sending' AND claimed_at < ?) ORDER BY due_at LIMIT ?",
+                (now, now - DRIP_CLAIM_TIMEOUT, DRIP_BATCH_SIZE)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE drip_sends SET status = 'sending', claimed_at = ? WHERE id = ?",
+                [(now, r["id"]) for r in rows]
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        return rows
+
+    def _seconds_until_next_due(self):
+        row = self._conn().execute("SELECT MIN(due_at) FROM drip_sends WHERE status = 'pending'").fetchone()
+        if row[0] is None:
+            return DRIP_POLL_INTERVAL
+        return max(0.0, row[0] - time.time())
+
+    def _dispatch(self, row):
+        conn = self._conn()
+        try:
+            self.deliver(row)
+        except Exception as e:
+            attempts = row["attempts"] + 1
+            status = "failed" if attempts >= DRIP_MAX_ATTEMPTS else "pending"
+            logging.error(f"Drip-Send {row['series']}/{row['step']} an {row['user_email']} fehlgeschlagen: {e}")
+            with conn:
+                conn.execute(
+                    "UPDATE drip_sends SET status = ?, attempts = ?, due_at = ?, last_error = ? WHERE id = ?",
+                    (status, attempts, time.time() + 60 * 2 ** attempts, str(e), row["id"])
+                )
+            return
+        with conn:
+            conn.execute("UPDATE drip_sends SET status = 'sent' WHERE id = ?", (row["id"],))
+
+    def _run(self):
+        while True:
+            try:
+                batch = self._claim_due()
+                for row in batch:
+                    self._dispatch(row)
+                if len(batch) == DRIP_BATCH_SIZE:
+                    continue
+                delay = self._seconds_until_next_due()
+            except sqlite3.Error as e:
+                logging.error(f"Drip-Dispatcher: DB-Fehler: {e}")
+                delay = DRIP_POLL_INTERVAL
+            self._wakeup.wait(min(delay, DRIP_POLL_INTERVAL))
+            self._wakeup.clear()
+
+def deliver_drip_message(row):
+    """Übergibt eine fällige Drip-Mail an die Outbox; der Key verhindert doppelte Sends bei erneutem Claim.
+
+    Fehler beim Einreihen werden nicht abgefangen, damit der Scheduler mit Backoff neu plant;
+    Transportfehler (Sendinblue und SMTP-Fallback) wiederholt der Outbox-Relay.
+    """
+    outbox.enqueue(
+        "sendinblue",
+        {"user_email": row["user_email"], "base_content": row["content"],
+         "possible_subjects": [row["subject"]], "user_behavior": row["series"]},
+        idempotency_key=f"drip:{row['user_email']}:{row['series']}:{row['step']}"
+    )
+    logging.info(f"Drip-E-Mail {row['series']} Schritt {row['step'] + 1} an {row['user_email']} eingereiht.")
+
+drip_scheduler = DripScheduler(APP_DB_PATH, deliver_drip_message)
+if DRIP_DISPATCHER_ENABLED:
+    drip_scheduler.start()
+
+WELCOME_SERIES = [
+    ("Willkommen – Tag 1", "Hallo und willkommen! Exklusive Einblicke..."),
+    ("Tag 2: Entdecke Vorteile", "Schön, dass du dabei bist! Heute das Beste herausholen..."),
+    ("Tag 3: Exklusive Tipps", "Tag 3: Noch mehr spannende Tricks..."),
+    ("Tag 4: Sonderangebote!", "Fast geschafft – besondere Sonderangebote..."),
+    ("Tag 5: Letzte Chance!", "Vielen Dank – Abschiedsgruß + Rabattcode!")
+]
+
 def send_welcome_series(user_email):
-    """Sendet eine Serie von Willkommens-E-Mails an den Nutzer."""
-    subs = [
-        "Willkommen – Tag 1",
-        "Tag 2: Entdecke Vorteile",
-        "Tag 3: Exklusive Tipps",
-        "Tag 4: Sonderangebote!",
-        "Tag 5: Letzte Chance!"
-    ]
-    cnts = [
-        "Hallo und willkommen! Exklusive Einblicke...",
-        "Schön, dass du dabei bist! Heute das Beste herausholen...",
-        "Tag 3: Noch mehr spannende Tricks...",
-        "Fast geschafft – besondere Sonderangebote...",
-        "Vielen Dank – Abschiedsgruß + Rabattcode!"
-    ]
-    for i in range(5):
-        send_sendinblue_email(user_email, cnts[i], [subs[i]], "welcome_series")
-        logging.info(f"Willkommens-E-Mail Tag {i+1} an {user_email} gesendet.")
-    return True
+    """Plant die Willkommens-Serie ein (Tag 1 sofort, danach eine E-Mail pro Tag)."""
+    steps = [(day, subject, content) for day, (subject, content) in enumerate(WELCOME_SERIES)]
+    scheduled = drip_scheduler.schedule(user_email, "welcome_series", steps)
+    logging.info(f"Willkommens-Serie für {user_email} geplant ({scheduled} neue E-Mails).")
+    return scheduled
 
-@app.route("/send_welcome_series", methods=["POST"])
+@marketing_bp.route("/send_welcome_series", methods=["POST"])
 def send_welcome_series_endpoint():
     data = request.get_json()
     user_email = data.get("email")
     if not user_email:
         return jsonify({"error": "Keine E-Mail-Adresse übermittelt"}), 400
-    if send_welcome_series(user_email):
-        return jsonify({"status": "Willkommensserie gesendet"}), 200
-    return jsonify({"error": "Fehler beim Versenden"}), 500
+    try:
+        scheduled = send_welcome_series(user_email)
+    except sqlite3.Error as e:
+        logging.error(f"Willkommens-Serie konnte nicht geplant werden: {e}")
+        return jsonify({"error": "Fehler beim Versenden"}), 500
+    return jsonify({"status": "Willkommensserie geplant", "scheduled": scheduled}), 200
+
+def retarget_fast_buyers(user_email, product_clicked, idempotency_key=None):
+    """Reiht eine Retargeting-E-Mail an Nutzer ein, die ein Produkt angesehen haben.
 
-def retarget_fast_buyers(user_email, product_clicked):
-    """Sendet eine Retargeting-E-Mail an Nutzer, die ein Produkt angesehen haben."""
+    Ohne expliziten Key gilt ein Retargeting pro Nutzer, Produkt und Tag; liefert False bei Duplikaten.
+    """
     sbj = "Hast du dein exklusives Angebot verpasst?"
     cnt = f"Hallo, wir sahen, dass du {product_clicked} interessant fandest, aber nicht gekauft hast!"
-    send_sendinblue_email(user_email, cnt, [sbj], "retargeting")
-    logging.info(f"Retargeting-E-Mail an {user_email} für {product_clicked} gesendet.")
-    return True
+    key = idempotency_key or f"retarget:{user_email}:{product_clicked}:{datetime.now().strftime('%Y-%m-%d')}"
+    created = outbox.enqueue(
+        "sendinblue",
+        {"user_email": user_email, "base_content": cnt, "possible_subjects": [sbj], "user_behavior": "retargeting"},
+        idempotency_key=key
+    )
+    logging.info(f"Retargeting-E-Mail an {user_email} für {product_clicked} eingereiht (neu={created}).")
+    return created
 
-@app.route("/retarget_fast_buyers", methods=["POST"])
+@marketing_bp.route("/retarget_fast_buyers", methods=["POST"])
 def retarget_fast_buyers_endpoint():
     data = request.get_json()
     user_email = data.get("email")
     product = data.get("product")
     if not user_email or not product:
         return jsonify({"error": "E-Mail & Produkt sind nötig"}), 400
-    if retarget_fast_buyers(user_email, product):
-        return jsonify({"status": "Retargeting E-Mail gesendet"}), 200
-    return jsonify({"error": "Fehler beim Retargeting"}), 500
+    try:
+        created = retarget_fast_buyers(user_email, product, request.headers.get("Idempotency-Key"))
+    except sqlite3.Error as e:
+        logging.error(f"Retargeting konnte nicht eingereiht werden: {e}")
+        return jsonify({"error": "Fehler beim Retargeting"}), 500
+    return jsonify({"status": "Retargeting E-Mail gesendet", "duplicate": not created}), 200
 
 ##############################################################################
 # 5. Dynamische Preisstrategie & Scarcity
@@ -298,16 +1783,16 @@ def dynamic_pricing():
         CURRENT_PRICES[pid] = round(new_price, 2)
         logging.info(f"Produkt {pid}: Neuer Preis = {CURRENT_PRICES[pid]}")
 
-@app.route("/update_prices", methods=["POST"])
+@shop_bp.route("/update_prices", methods=["POST"])
 def update_prices_endpoint():
     dynamic_pricing()
     return jsonify({"updated_prices": CURRENT_PRICES})
 
-@app.route("/get_prices", methods=["GET"])
+@shop_bp.route("/get_prices", methods=["GET"])
 def get_prices_endpoint():
     return jsonify({"current_prices": CURRENT_PRICES})
 
-@app.route("/apply_scarcity", methods=["POST"])
+@shop_bp.route("/apply_scarcity", methods=["POST"])
 def apply_scarcity():
     data = request.get_json()
     product_id = data.get("product_id", 1)
@@ -325,7 +1810,7 @@ def generate_discount_offer(user_behavior_metric):
     code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
     return discount_percent, code
 
-@app.route("/chatbot", methods=["POST"])
+@ai_bp.route("/chatbot", methods=["POST"])
 def chatbot_endpoint():
     data = request.get_json()
     user_message = data.get("message", "")
@@ -333,11 +1818,11 @@ def chatbot_endpoint():
         return jsonify({"error": "Keine Nachricht"}), 400
 
     prompt = f"User: {user_message}\nBot:"
-    gen = generator(prompt, max_length=50, num_return_sequences=1)
+    gen = get_generator()(prompt, max_length=50, num_return_sequences=1)
     bot_resp = gen[0]['generated_text'].split("Bot:")[-1].strip()
 
     upsell_prompt = f"Basierend auf '{user_message}', schlage ein High-Ticket-Produkt (1.000-5.000€) vor..."
-    upsell_gen = generator(upsell_prompt, max_length=60, num_return_sequences=1)
+    upsell_gen = get_generator()(upsell_prompt, max_length=60, num_return_sequences=1)
     upsell_offer = upsell_gen[0]['generated_text'].strip()
 
     metric = random.uniform(0, 5)
@@ -348,7 +1833,7 @@ def chatbot_endpoint():
     logging.info(f"Chatbot -> {combined}")
     return jsonify({"response": combined})
 
-@app.route("/chatbot_gpt4", methods=["POST"])
+@ai_bp.route("/chatbot_gpt4", methods=["POST"])
 def chatbot_gpt4():
     return jsonify({"error": "GPT-4 API wurde entfernt – bitte benutze /chatbot mit der lokalen GPT-2 Integration."}), 501
 
@@ -379,7 +1864,7 @@ def dynamic_affiliate_recommendation(user_behavior):
     logging.info("Empfehlung: " + rec)
     return rec
 
-@app.route("/affiliate_conversion", methods=["POST"])
+@affiliate_bp.route("/affiliate_conversion", methods=["POST"])
 def affiliate_conversion_endpoint():
     data = request.get_json()
     user_behavior = data.get("user_behavior", "")
@@ -397,7 +1882,7 @@ def auto_generate_webinar(topic, schedule_time):
     logging.info(f"Webinar '{topic}' geplant für {schedule_time}, URL={url}")
     return {"topic": topic, "schedule_time": schedule_time, "webinar_url": url, "ai_moderation": ai_msg}
 
-@app.route("/webinar", methods=["POST"])
+@marketing_bp.route("/webinar", methods=["POST"])
 def webinar_endpoint():
     data = request.get_json()
     topic = data.get("topic", "Allgemeines Thema")
@@ -411,7 +1896,7 @@ def auto_generate_live_stream(topic, schedule_time):
     logging.info(f"Live-Stream '{topic}' am {schedule_time}, URL={url}")
     return {"topic": topic, "schedule_time": schedule_time, "live_stream_url": url, "ai_moderation": ai_msg}
 
-@app.route("/livestream", methods=["POST"])
+@marketing_bp.route("/livestream", methods=["POST"])
 def livestream_endpoint():
     data = request.get_json()
     topic = data.get("topic", "Allgemeines Thema")
@@ -425,7 +1910,7 @@ def distribute_podcast(podcast_url):
         return {"Spotify": "Veröffentlicht", "Apple Podcasts": "Veröffentlicht"}
     return {"Spotify": "In Bearbeitung", "Apple Podcasts": "In Bearbeitung"}
 
-@app.route("/distribute_podcast", methods=["POST"])
+@marketing_bp.route("/distribute_podcast", methods=["POST"])
 def distribute_podcast_endpoint():
     data = request.get_json()
     p_url = data.get("podcast_url", "")
@@ -439,7 +1924,7 @@ def generate_podcast_from_article(article_text):
     logging.info(f"Podcast generiert: {p_url}")
     return p_url
 
-@app.route("/generate_podcast", methods=["POST"])
+@marketing_bp.route("/generate_podcast", methods=["POST"])
 def generate_podcast_endpoint():
     data = request.get_json()
     art_txt = data.get("article_text", "")
@@ -456,12 +1941,12 @@ def generate_podcast_transcript(podcast_audio_url):
 def generate_ai_article_from_podcast(podcast_audio_url):
     transcript = generate_podcast_transcript(podcast_audio_url)
     prompt = f"Erstelle einen Artikel aus diesem Podcast-Transkript:\n{transcript}"
-    gen = generator(prompt, max_length=300, num_return_sequences=1)
+    gen = get_generator()(prompt, max_length=300, num_return_sequences=1)
     article = gen[0]['generated_text']
     logging.info("KI-Artikel aus Podcast-Transkript generiert.")
     return article
 
-@app.route("/podcast_article", methods=["POST"])
+@ai_bp.route("/podcast_article", methods=["POST"])
 def podcast_article_endpoint():
     data = request.get_json()
     audio_url = data.get("audio_url")
@@ -474,7 +1959,7 @@ def auto_share_webinar_on_social(webinar_info):
     if USE_SIMULATION:
         logging.info(f"(Simuliert) Teile Webinar-Info auf Social Media: {webinar_info}")
 
-@app.route("/webinar_advanced", methods=["POST"])
+@marketing_bp.route("/webinar_advanced", methods=["POST"])
 def webinar_advanced():
     data = request.get_json()
     topic = data.get("topic", "Allgemeines Thema")
@@ -494,7 +1979,7 @@ def extended_podcast_distribution(podcast_url):
     }
     return dist_result
 
-@app.route("/distribute_podcast_extended", methods=["POST"])
+@marketing_bp.route("/distribute_podcast_extended", methods=["POST"])
 def distribute_podcast_extended():
     data = request.get_json()
     p_url = data.get("podcast_url", "")
@@ -506,99 +1991,107 @@ def distribute_podcast_extended():
 ##############################################################################
 # 9. Social Proof, Gamification, Countdown, FOMO
 ##############################################################################
-def get_social_proof_html():
-    reviews = [
-        {"name": "Anna", "review": "Das Produkt hat mein Leben verändert!", "rating": 5},
-        {"name": "Max", "review": "Top Qualität und super Service!", "rating": 4},
-        {"name": "Lisa", "review": "Ich bin begeistert – Geld-zurück-Garantie!", "rating": 5}
-    ]
-    trust_symbols = """
-    <div class="trust-symbols">
-      <img src="/static/geld-zurueck-garantie.png" alt="Geld-zurück-Garantie" style="height:50px;">
-      <img src="/static/sicherheitslogo.png" alt="Sicherheitszertifikat" style="height:50px;">
-    </div>
-    """
-    rev_html = "<ul>"
-    for r in reviews:
-        rev_html += f"<li><strong>{r['name']}</strong> ({r['rating']} Sterne): {r['review']}</li>"
-    rev_html += "</ul>"
-    return f"""
+SOCIAL_PROOF_REVIEWS = [
+    {"name": "Anna", "review": "Das Produkt hat mein Leben verändert!", "rating": 5},
+    {"name": "Max", "review": "Top Qualität und super Service!", "rating": 4},
+    {"name": "Lisa", "review": "Ich bin begeistert – Geld-zurück-Garantie!", "rating": 5}
+]
+
+page_templates.register("social_proof_widget", """
     <div class="social-proof">
       <h2>Kundenbewertungen</h2>
-      {rev_html}
-      {trust_symbols}
+      <ul>
+      {%- for r in reviews %}<li><strong>{{ r.name }}</strong> ({{ r.rating }} Sterne): {{ r.review }}</li>{% endfor -%}
+      </ul>
+      <div class="trust-symbols">
+        <img src="/static/geld-zurueck-garantie.png" alt="Geld-zurück-Garantie" style="height:50px;">
+        <img src="/static/sicherheitslogo.png" alt="Sicherheitszertifikat" style="height:50px;">
+      </div>
     </div>
-    """
+""")
 
-@app.route("/social_proof", methods=["GET"])
-def social_proof_endpoint():
-    html = get_social_proof_html()
-    return render_template_string(f"""
+page_templates.register("social_proof", """
     <html>
       <head><title>Social Proof & Vertrauen</title></head>
-      <body>{html}</body>
+      <body>{{ widget }}</body>
     </html>
-    """)
+""")
 
-def get_progress_bar_html(progress=80):
-    return f"""
+page_templates.register("progress_bar_widget", """
     <div style="width:100%;background-color:#e0e0e0;border-radius:25px;overflow:hidden;">
-      <div style="width:{progress}%;height:30px;background-color:#76c7c0;text-align:center;line-height:30px;color:white;">
-        {progress}%
+      <div style="width:{{ progress|int }}%;height:30px;background-color:#76c7c0;text-align:center;line-height:30px;color:white;">
+        {{ progress|int }}%
       </div>
     </div>
-    <p>Noch {100 - progress}% bis zu deinem VIP-Bonus!</p>
-    """
+    <p>Noch {{ 100 - progress|int }}% bis zu deinem VIP-Bonus!</p>
+""")
 
-@app.route("/progress_bar", methods=["GET"])
-def progress_bar_endpoint():
-    html = get_progress_bar_html(progress=80)
-    return render_template_string(f"""
+page_templates.register("progress_bar", """
     <html>
       <head><title>Dein Fortschritt</title></head>
       <body>
         <h2>Exklusive Belohnungen</h2>
-        {html}
+        {{ widget }}
       </body>
     </html>
-    """)
+""")
 
-def get_offer_countdown_html(duration_seconds=300):
-    return f"""
+page_templates.register("offer_countdown_widget", """
     <div id="countdown" style="font-size:24px;font-weight:bold;"></div>
     <script>
-      var timeLeft = {duration_seconds};
+      var timeLeft = {{ duration_seconds|int }};
       var countdownElem = document.getElementById("countdown");
-      var timer = setInterval(function(){{
-         if(timeLeft <= 0){{
+      var timer = setInterval(function(){
+         if(timeLeft <= 0){
             clearInterval(timer);
             countdownElem.innerHTML = "Angebot abgelaufen!";
-         }} else {{
+         } else {
             countdownElem.innerHTML = "Nur noch " + timeLeft + " Sekunden bis zum Deal!";
-         }}
+         }
          timeLeft -= 1;
-      }}, 1000);
+      }, 1000);
     </script>
-    """
+""")
 
-@app.route("/offer_countdown", methods=["GET"])
-def offer_countdown_endpoint():
-    html = get_offer_countdown_html(duration_seconds=300)
-    return render_template_string(f"""
+page_templates.register("offer_countdown", """
     <html>
       <head><title>Exklusiver Deal</title></head>
       <body>
         <h2>Nur für kurze Zeit: Exklusiver Deal!</h2>
-        {html}
+        {{ widget }}
       </body>
     </html>
-    """)
+""")
+
+def get_social_proof_html():
+    return Markup(page_templates.render("social_proof_widget", reviews=SOCIAL_PROOF_REVIEWS))
+
+@shop_bp.route("/social_proof", methods=["GET"])
+@cached_response(ttl=600)
+def social_proof_endpoint():
+    return page_templates.render("social_proof", widget=get_social_proof_html())
+
+def get_progress_bar_html(progress=80):
+    return Markup(page_templates.render("progress_bar_widget", progress=progress))
+
+@shop_bp.route("/progress_bar", methods=["GET"])
+@cached_response(ttl=300)
+def progress_bar_endpoint():
+    return page_templates.render("progress_bar", widget=get_progress_bar_html(progress=80))
+
+def get_offer_countdown_html(duration_seconds=300):
+    return Markup(page_templates.render("offer_countdown_widget", duration_seconds=duration_seconds))
+
+@shop_bp.route("/offer_countdown", methods=["GET"])
+@cached_response(ttl=300)
+def offer_countdown_endpoint():
+    return page_templates.render("offer_countdown", widget=get_offer_countdown_html(duration_seconds=300))
 
 def add_fomo_element(message):
     live_purchases = random.randint(1, 10)
     return f"{message}\n🔥 {live_purchases} Leute haben gerade gekauft!"
 
-@app.route("/spin_wheel", methods=["GET"])
+@shop_bp.route("/spin_wheel", methods=["GET"])
 def spin_wheel_endpoint():
     disc = random.randint(0, 20)
     logging.info(f"Glücksrad gedreht: {disc}% Rabatt!")
@@ -618,7 +2111,7 @@ def auto_publish_linkedin_article(article_text):
             return "LinkedIn-API nicht konfiguriert."
         return "https://www.linkedin.com/feed/update/..."
 
-@app.route("/publish_linkedin", methods=["POST"])
+@marketing_bp.route("/publish_linkedin", methods=["POST"])
 def publish_linkedin_endpoint():
     data = request.get_json()
     art_txt = data.get("article_text", "")
@@ -635,7 +2128,7 @@ def auto_publish_medium_post(article_text):
     else:
         return "https://medium.com/@user/..."
 
-@app.route("/publish_medium", methods=["POST"])
+@marketing_bp.route("/publish_medium", methods=["POST"])
 def publish_medium_endpoint():
     data = request.get_json()
     art_txt = data.get("article_text", "")
@@ -644,24 +2137,44 @@ def publish_medium_endpoint():
     url = auto_publish_medium_post(art_txt)
     return jsonify({"status": "Medium-Post veröffentlicht", "url": url})
 
-def send_twitter_ifttt(message):
+def deliver_twitter_ifttt(payload):
+    """Sendet einen Twitter-Beitrag über den IFTTT-Webhook; wirft bei Fehlern (Retry über die Outbox)."""
+    message = payload["message"]
     if USE_SIMULATION:
         logging.info(f"(Simuliert IFTTT) Twitter-Beitrag: {message}")
         return
-    ifttt_url = IFTTT_WEBHOOK_URL
-    try:
-        response = requests.post(ifttt_url, json={"value1": message})
-        if response.status_code == 200:
-            logging.info("Twitter-Beitrag über IFTTT erfolgreich gesendet.")
-        else:
-            logging.warning(f"IFTTT Fehler: {response.text}")
-    except Exception as e:
-        logging.error(f"IFTTT-Fehler: {e}")
+    response = http_client.post("ifttt", IFTTT_WEBHOOK_URL, json={"value1": message})
+    if response.status_code != 200:
+        raise RuntimeError(f"IFTTT Fehler: {response.text}")
+    logging.info("Twitter-Beitrag über IFTTT erfolgreich gesendet.")
+
+outbox.register_handler("ifttt", deliver_twitter_ifttt)
+
+def send_twitter_ifttt(message, idempotency_key=None):
+    """Reiht einen Twitter-Beitrag über IFTTT in die Outbox ein."""
+    return outbox.enqueue("ifttt", {"message": message}, idempotency_key)
 
 ##############################################################################
 # 11. Bildkomprimierung, CDN-Upload
 ##############################################################################
-def compress_image(input_path, output_path, quality=85):
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", 85))
+MAX_IMAGE_BYTES = int(os.getenv("MAX_IMAGE_BYTES", 20 * 1024 * 1024))
+MAX_IMAGE_PIXELS = int(os.getenv("MAX_IMAGE_PIXELS", 40_000_000))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", os.cpu_count() or 1))
+IMAGE_ENCODE_TIMEOUT = float(os.getenv("IMAGE_ENCODE_TIMEOUT", 60))
+MAX_BATCH_BYTES = int(os.getenv("MAX_BATCH_BYTES", 256 * 1024 * 1024))
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", 300))
+BATCH_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tif", ".tiff")
+# Obergrenze je Request-Body (Multipart-Overhead eingerechnet); darüber antwortet Werkzeug mit 413
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", MAX_BATCH_BYTES + 1024 * 1024))
+MAX_IMAGE_REQUEST_BYTES = MAX_IMAGE_BYTES + 1024 * 1024
+app.config["MAX_CONTENT_LENGTH"] = MAX_REQUEST_BYTES
+
+class ImageTooLargeError(ValueError):
+    """Das Bild überschreitet MAX_IMAGE_BYTES oder MAX_IMAGE_PIXELS."""
+
+def compress_image(input_path, output_path, quality=IMAGE_QUALITY):
+    Image = configure_pil(MAX_IMAGE_PIXELS)
     try:
         with Image.open(input_path) as img:
             img.convert("RGB").save(output_path, "webp", quality=quality)
@@ -671,34 +2184,483 @@ def compress_image(input_path, output_path, quality=85):
         logging.error(f"Fehler beim Bildkomprimieren: {e}")
         return False
 
-def upload_to_cdn(file_path):
+def check_image_limits(data):
+    """Prüft Byte- und Pixelgrenzen anhand des Bild-Headers, bevor Pixeldaten dekodiert werden."""
+    if len(data) > MAX_IMAGE_BYTES:
+        raise ImageTooLargeError(f"Bild größer als {MAX_IMAGE_BYTES} Bytes")
+    Image = configure_pil(MAX_IMAGE_PIXELS)
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            width, height = img.size
+    except (Image.DecompressionBombError, Image.DecompressionBombWarning) as e:
+        raise ImageTooLargeError(f"Bild hat mehr als {MAX_IMAGE_PIXELS} Pixel: {e}")
+    if width * height > MAX_IMAGE_PIXELS:
+        raise ImageTooLargeError(f"Bild hat mehr als {MAX_IMAGE_PIXELS} Pixel ({width}x{height})")
+    return width, height
+
+_image_pool = None
+_image_pool_lock = Lock()
+
+def get_image_pool():
+    """Prozesspool für CPU-lastige Bildkodierung (eine Instanz pro Worker, Größe = IMAGE_WORKERS).
+
+    Forkserver statt fork: der App-Prozess hat bereits Threads (Relay, Dispatcher), ein fork würde
+    deren Locks im Zustand des Moments kopieren. Die Worker importieren nur image_worker.
+    """
+    global _image_pool
+    with _image_pool_lock:
+        if _image_pool is None:
+            _image_pool = ProcessPoolExecutor(
+                max_workers=IMAGE_WORKERS,
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=configure_pil,
+                initargs=(MAX_IMAGE_PIXELS,)
+            )
+        return _image_pool
+
+def upload_to_cdn(file_path, data=None):
     cdn_url = "https://cdn.deinedomain.de/" + os.path.basename(file_path)
-    logging.info(f"Bild in CDN hochgeladen (simuliert): {cdn_url}")
+    size = f" ({len(data)} Bytes)" if data is not None else ""
+    logging.info(f"Bild in CDN hochgeladen (simuliert): {cdn_url}{size}")
     return cdn_url
 
-@app.route("/compress_image", methods=["POST"])
+@images_bp.route("/compress_image", methods=["POST"])
 def compress_image_endpoint():
+    request.max_content_length = MAX_IMAGE_REQUEST_BYTES
+    if "file" not in request.files:
+        return jsonify({"error": "Keine Datei übermittelt"}), 400
+    file = request.files["file"]
+    data = file.read(MAX_IMAGE_BYTES + 1)
+    try:
+        width, height = check_image_limits(data)
+    except ImageTooLargeError as e:
+        return jsonify({"error": str(e)}), 413
+    except OSError:
+        return jsonify({"error": "Ungültige Bilddatei"}), 400
+    started = time.perf_counter()
+    try:
+        webp, timings = get_image_pool().submit(compress_image_bytes, data, IMAGE_QUALITY).result(timeout=IMAGE_ENCODE_TIMEOUT)
+    except Exception as e:
+        logging.error(f"Fehler beim Bildkomprimieren: {e}")
+        return jsonify({"error": "Fehler bei Bildkomprimierung"}), 500
+    timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    timings["queue_ms"] = round(max(0.0, timings["total_ms"] - timings["decode_ms"] - timings["encode_ms"]), 1)
+    out_name = "compressed_" + os.path.basename(file.filename).rsplit(".", 1)[0] + ".webp"
+    cdn_url = upload_to_cdn(out_name, webp)
+    return jsonify({
+        "status": "Bild komprimiert & hochgeladen",
+        "cdn_url": cdn_url,
+        "width": width,
+        "height": height,
+        "bytes_in": len(data),
+        "bytes_out": len(webp),
+        "timings_ms": timings
+    }), 200
+
+class BatchTooLargeError(ValueError):
+    """Batch überschreitet MAX_BATCH_BYTES oder MAX_BATCH_FILES."""
+
+def collect_batch_images():
+    """Liest alle Bilder eines Batch-Uploads (mehrere `files` und/oder ZIP-Archive) in den Speicher.
+
+    Die Gesamtgröße wird gegen MAX_BATCH_BYTES geprüft, bei ZIPs schon anhand der Größenangaben
+    im Verzeichnis, bevor etwas entpackt wird.
+    """
+    images, total = [], 0
+
+    def add(name, data):
+        nonlocal total
+        total += len(data)
+        if total > MAX_BATCH_BYTES:
+            raise BatchTooLargeError(f"Batch größer als {MAX_BATCH_BYTES} Bytes")
+        if len(images) >= MAX_BATCH_FILES:
+            raise BatchTooLargeError(f"Mehr als {MAX_BATCH_FILES} Dateien im Batch")
+        images.append((name, data))
+
+    for file in request.files.getlist("files") + request.files.getlist("file"):
+        if file.filename.lower().endswith(".zip"):
+            try:
+                with zipfile.ZipFile(file.stream) as archive:
+                    members = [
+                        info for info in archive.infolist()
+                        if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+                        and info.filename.lower().endswith(BATCH_IMAGE_EXTENSIONS)
+                    ]
+                    if total + sum(info.file_size for info in members) > MAX_BATCH_BYTES:
+                        raise BatchTooLargeError(f"Entpacktes Archiv größer als {MAX_BATCH_BYTES} Bytes")
+                    for info in members:
+                        with archive.open(info) as member:
+                            add(info.filename, member.read(MAX_IMAGE_BYTES + 1))
+            except zipfile.BadZipFile:
+                raise ValueError(f"Ungültiges ZIP-Archiv: {file.filename}")
+        else:
+            add(file.filename, file.read(MAX_IMAGE_BYTES + 1))
+    return images
+
+@images_bp.route("/compress_images_batch", methods=["POST"])
+def compress_images_batch_endpoint():
+    """Komprimiert viele Bilder parallel im Prozesspool und streamt pro Datei ein NDJSON-Ergebnis,
+    sobald es fertig ist; die letzte Zeile ist eine Zusammenfassung."""
+    if request.content_length and request.content_length > MAX_BATCH_BYTES:
+        return jsonify({"error": f"Batch größer als {MAX_BATCH_BYTES} Bytes"}), 413
+    try:
+        images = collect_batch_images()
+    except BatchTooLargeError as e:
+        return jsonify({"error": str(e)}), 413
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not images:
+        return jsonify({"error": "Keine Dateien übermittelt"}), 400
+
+    pool = get_image_pool()
+    rejected, futures = [], {}
+    for name, data in images:
+        try:
+            check_image_limits(data)
+        except ImageTooLargeError as e:
+            rejected.append({"file": name, "status": "error", "error": str(e)})
+            continue
+        except OSError:
+            rejected.append({"file": name, "status": "error", "error": "Ungültige Bilddatei"})
+            continue
+        futures[pool.submit(compress_image_bytes, data, IMAGE_QUALITY)] = (name, len(data))
+    del images
+
+    def results():
+        summary = {"done": True, "total": len(rejected) + len(futures), "ok": 0, "failed": len(rejected), "bytes_in": 0, "bytes_out": 0}
+        for item in rejected:
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+        try:
+            for future in as_completed(futures, timeout=IMAGE_ENCODE_TIMEOUT * max(1, len(futures) / IMAGE_WORKERS)):
+                name, bytes_in = futures.pop(future)
+                try:
+                    webp, timings = future.result()
+                    out_name = "compressed_" + os.path.basename(name).rsplit(".", 1)[0] + ".webp"
+                    item = {
+                        "file": name, "status": "ok", "cdn_url": upload_to_cdn(out_name, webp),
+                        "bytes_in": bytes_in, "bytes_out": len(webp), "timings_ms": timings
+                    }
+                    summary["ok"] += 1
+                    summary["bytes_in"] += bytes_in
+                    summary["bytes_out"] += len(webp)
+                except Exception as e:
+                    logging.error(f"Fehler beim Bildkomprimieren ({name}): {e}")
+                    item = {"file": name, "status": "error", "error": "Fehler bei Bildkomprimierung"}
+                    summary["failed"] += 1
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+        except FutureTimeoutError:
+            for future, (name, _) in futures.items():
+                future.cancel()
+                summary["failed"] += 1
+                yield json.dumps({"file": name, "status": "error", "error": "Zeitüberschreitung"}, ensure_ascii=False) + "\n"
+        yield json.dumps(summary) + "\n"
+
+    return Response(results(), mimetype="application/x-ndjson")
+
+IMAGE_DIR = os.getenv("IMAGE_DIR", "images")
+IMAGE_ORIGINALS_DIR = os.path.join(IMAGE_DIR, "originals")
+IMAGE_MANIFEST_PATH = os.path.join(IMAGE_DIR, "manifest.json")
+# Format: name:breite:qualität, kommagetrennt
+IMAGE_VARIANTS = [
+    {"name": n, "width": int(w), "quality": int(q)}
+    for n, w, q in (v.split(":") for v in os.getenv("IMAGE_VARIANTS", "small:480:75,medium:960:80,large:1600:85").split(","))
+]
+# Reihenfolge = Präferenz bei der Accept-Aushandlung; JPEG ist der Fallback für alle Clients
+IMAGE_MIMETYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+IMAGE_FORMATS = [
+    f for f in (f.strip().lower() for f in os.getenv("IMAGE_FORMATS", "avif,webp,jpeg").split(","))
+    if f in IMAGE_MIMETYPES
+]
+IMAGE_NAME_RE = re.compile(r"^[A-Za-z0-9_-]{1,100}$")
+MOBILE_IMAGE_WIDTH = 480
+IMAGE_MAX_AGE = int(os.getenv("IMAGE_MAX_AGE", 86400))
+IMAGE_INDEX_INTERVAL = float(os.getenv("IMAGE_INDEX_INTERVAL", 5))
+# Nur für /serve_image: "" = Flask liefert aus, "x-accel" = nginx (X-Accel-Redirect), "x-sendfile" = Apache/lighttpd (X-Sendfile)
+IMAGE_SENDFILE_MODE = os.getenv("IMAGE_SENDFILE_MODE", "").lower()
+IMAGE_ACCEL_PREFIX = os.getenv("IMAGE_ACCEL_PREFIX", "/protected-images/")
+
+# Wirkt app-weit auf jedes send_file mit Dateipfad; nur einschalten, wenn der Webserver X-Sendfile für alle Pfade auflöst
+app.config["USE_X_SENDFILE"] = env_flag("USE_X_SENDFILE", False)
+
+def write_file_atomic(path, data):
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class ImageManifest:
+    """Manifest logischer Bildnamen -> Varianten als JSON-Datei.
+
+    Geschrieben wird atomar unter einem Dateilock. Gelesen wird aus dem Speicher; neu geladen wird
+    durch den Index-Watcher oder wenn ein Name fehlt (evtl. von einem anderen Worker angelegt).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._data = {}
+        self._mtime = None
+        self._lock = Lock()
+
+    def _reload_if_changed(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._mtime:
+            with open(self.path, encoding="utf-8") as f:
+                self._data = json.load(f)
+            self._mtime = mtime
+
+    def refresh(self):
+        with self._lock:
+            self._reload_if_changed()
+
+    def get(self, name):
+        with self._lock:
+            if name not in self._data:
+                self._reload_if_changed()
+            return self._data.get(name)
+
+    def put(self, name, entry):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock, open(self.path + ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._reload_if_changed()
+            self._data[name] = entry
+            write_file_atomic(self.path, json.dumps(self._data, indent=1).encode("utf-8"))
+            self._mtime = os.stat(self.path).st_mtime_ns
+
+image_manifest = ImageManifest(IMAGE_MANIFEST_PATH)
+
+class ImageFileIndex:
+    """In-Memory-Index der Bilddateien (Größe, mtime, Hash/ETag).
+
+    Ein Watcher-Thread gleicht den Index periodisch mit dem Verzeichnis ab und hasht nur geänderte
+    Dateien neu; Requests lesen ausschließlich aus dem Speicher.
+    """
+
+    def __init__(self, directory, interval=IMAGE_INDEX_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self._entries = {}
+        self._lock = Lock()
+        self._thread = None
+
+    @staticmethod
+    def _hash_file(path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()[:32]
+
+    def _stat_entry(self, path, st, previous=None):
+        if previous and previous["size"] == st.st_size and previous["mtime_ns"] == st.st_mtime_ns:
+            return previous
+        return {
+            "path": path, "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+            "mtime": st.st_mtime, "etag": self._hash_file(path)
+        }
+
+    def scan(self):
+        entries = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for e in it:
+                    if e.is_file() and not e.name.endswith((".tmp", ".lock", ".json")):
+                        entries[e.name] = self._stat_entry(e.path, e.stat(), self._entries.get(e.name))
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._entries = entries
+
+    def get(self, file_name):
+        entry = self._entries.get(file_name)
+        if entry is None:
+            # Gerade erst (z.B. von diesem Worker) erzeugt und noch nicht vom Watcher erfasst
+            path = os.path.join(self.directory, file_name)
+            try:
+                entry = self._stat_entry(path, os.stat(path))
+            except FileNotFoundError:
+                return None
+            with self._lock:
+                self._entries[file_name] = entry
+        return entry
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="image-index", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.scan()
+                image_manifest.refresh()
+            except Exception as e:
+                logging.error(f"Fehler beim Aktualisieren des Bildindex: {e}")
+            time.sleep(self.interval)
+
+image_index = ImageFileIndex(IMAGE_DIR)
+if env_flag("IMAGE_INDEX_ENABLED", feature_enabled("images")):
+    image_index.start()
+
+def generate_image_variants(name, data):
+    """Erzeugt alle IMAGE_VARIANTS in allen IMAGE_FORMATS parallel im Prozesspool, speichert sie unter
+    Content-Hash-Namen und trägt sie ins Manifest ein. Vom Pillow-Build nicht unterstützte Formate
+    (z.B. AVIF ohne Plugin) werden ausgelassen. Überschreitet ein Worker IMAGE_ENCODE_TIMEOUT, wird
+    kein unvollständiges Manifest gespeichert, sondern TimeoutError geworfen (nächster Abruf erzeugt neu)."""
+    check_image_limits(data)
+    pool = get_image_pool()
+    futures = {
+        (v["name"], fmt): pool.submit(derive_image_variant, data, v["width"], v["quality"], fmt)
+        for v in IMAGE_VARIANTS for fmt in IMAGE_FORMATS
+    }
+    os.makedirs(IMAGE_DIR, exist_ok=True)
+    entry = {"variants": {}, "created_at": datetime.now().isoformat()}
+    timed_out = []
+    for (vname, fmt), future in futures.items():
+        try:
+            encoded, width, height = future.result(timeout=IMAGE_ENCODE_TIMEOUT)
+        except FutureTimeoutError:
+            # Vor OSError abfangen: TimeoutError ist eine OSError-Unterklasse
+            future.cancel()
+            logging.error(f"Bild-Worker-Timeout nach {IMAGE_ENCODE_TIMEOUT}s: '{name}' {vname}/{fmt}")
+            timed_out.append(f"{vname}/{fmt}")
+            continue
+        except (KeyError, OSError) as e:
+            logging.warning(f"Bildformat {fmt} nicht verfügbar: {e}")
+            continue
+        digest = hashlib.sha256(encoded).hexdigest()[:16]
+        file_name = f"{name}.{vname}.{digest}.{fmt}"
+        file_path = os.path.join(IMAGE_DIR, file_name)
+        if not os.path.exists(file_path):
+            write_file_atomic(file_path, encoded)
+        variant = entry["variants"].setdefault(vname, {"width": width, "height": height, "formats": {}})
+        variant["formats"][fmt] = {
+            "file": file_name, "bytes": len(encoded), "hash": digest, "mimetype": IMAGE_MIMETYPES[fmt]
+        }
+    if timed_out:
+        raise FutureTimeoutError(f"Bild-Worker-Timeout für '{name}': {', '.join(timed_out)}")
+    if not entry["variants"]:
+        raise OSError("Keine Bildvariante konnte erzeugt werden")
+    image_manifest.put(name, entry)
+    logging.info(f"Bildvarianten für '{name}' erzeugt: {', '.join(entry['variants'])}")
+    return entry
+
+def load_or_derive_image_entry(name):
+    """Manifest-Eintrag eines Bildes; fehlt er, werden die Varianten einmalig aus dem Original erzeugt."""
+    entry = image_manifest.get(name)
+    if entry is not None:
+        return entry
+    originals = glob.glob(os.path.join(IMAGE_ORIGINALS_DIR, glob.escape(name) + ".*"))
+    if not originals:
+        return None
+    with open(originals[0], "rb") as f:
+        return generate_image_variants(name, f.read())
+
+def pick_image_variant(entry):
+    """Wählt die kleinste Variante, die mindestens die gewünschte Breite hat (sonst die größte).
+
+    Zielbreite: Query-Parameter w, Client Hint Sec-CH-Width/Width, sonst der Client Hint
+    Sec-CH-UA-Mobile (nur zwei Werte, anders als User-Agent für CDN-Caches unschädlich im Vary).
+    Liefert zusätzlich die Header, nach denen die Auswahl variiert.
+    """
+    vary = ["Sec-CH-Width", "Width"]
+    hint = request.args.get("w") or request.headers.get("Sec-CH-Width") or request.headers.get("Width")
+    try:
+        target = int(float(hint)) if hint else None
+    except ValueError:
+        target = None
+    if target is None:
+        vary.append("Sec-CH-UA-Mobile")
+        if request.headers.get("Sec-CH-UA-Mobile") == "?1":
+            target = MOBILE_IMAGE_WIDTH
+    variants = sorted(entry["variants"].values(), key=lambda v: v["width"])
+    if target is not None:
+        for variant in variants:
+            if variant["width"] >= target:
+                return variant, vary
+    return variants[-1], vary
+
+def pick_image_format(variant):
+    """Bestes Format in der Präferenzreihenfolge von IMAGE_FORMATS, das der Client explizit im
+    Accept-Header nennt (image/* reicht nicht, ältere Browser senden es ohne WebP/AVIF zu können)."""
+    accepted = {mimetype: q for mimetype, q in request.accept_mimetypes}
+    # Manifeste aus der Zeit vor der Formataushandlung haben je Variante genau eine Datei ohne "formats"
+    formats = variant.get("formats") or {variant["file"].rsplit(".", 1)[-1]: variant}
+    for fmt in IMAGE_FORMATS:
+        if fmt in formats and (fmt == "jpeg" or accepted.get(IMAGE_MIMETYPES[fmt], 0) > 0):
+            return formats[fmt]
+    return formats.get("jpeg") or next(iter(formats.values()))
+
+def send_image_file(image_file, vary):
+    """Liefert eine Bilddatei mit starkem ETag, 304/Range-Unterstützung und Cache-Control aus –
+    je nach IMAGE_SENDFILE_MODE selbst oder per Übergabe an den Frontend-Proxy."""
+    meta = image_index.get(image_file["file"])
+    if meta is None:
+        return jsonify({"error": "Bild nicht gefunden"}), 404
+    if IMAGE_SENDFILE_MODE in ("x-accel", "x-sendfile"):
+        if request.if_none_match.contains(meta["etag"]):
+            response = Response(status=304)
+        else:
+            # Body und Range-Anfragen liefert der Webserver aus (nginx: interne Location, Apache/lighttpd: Dateipfad)
+            response = Response(mimetype=image_file["mimetype"])
+            if IMAGE_SENDFILE_MODE == "x-accel":
+                response.headers["X-Accel-Redirect"] = IMAGE_ACCEL_PREFIX + image_file["file"]
+            else:
+                response.headers["X-Sendfile"] = os.path.abspath(meta["path"])
+        response.set_etag(meta["etag"])
+        response.last_modified = meta["mtime"]
+        response.cache_control.public = True
+        response.cache_control.max_age = IMAGE_MAX_AGE
+    else:
+        response = send_file(
+            meta["path"], mimetype=image_file["mimetype"], conditional=True,
+            etag=meta["etag"], last_modified=meta["mtime"], max_age=IMAGE_MAX_AGE
+        )
+        response.cache_control.public = True
+    response.vary.update(vary)
+    response.headers["Accept-CH"] = "Sec-CH-Width, Width, Sec-CH-UA-Mobile"
+    return response
+
+@images_bp.route("/upload_image", methods=["POST"])
+def upload_image_endpoint():
+    request.max_content_length = MAX_IMAGE_REQUEST_BYTES
     if "file" not in request.files:
         return jsonify({"error": "Keine Datei übermittelt"}), 400
     file = request.files["file"]
-    in_path = "temp_" + file.filename
-    out_path = "compressed_" + file.filename.rsplit(".", 1)[0] + ".webp"
-    file.save(in_path)
-    if compress_image(in_path, out_path):
-        cdn_url = upload_to_cdn(out_path)
-        os.remove(in_path)
-        os.remove(out_path)
-        return jsonify({"status": "Bild komprimiert & hochgeladen", "cdn_url": cdn_url}), 200
-    return jsonify({"error": "Fehler bei Bildkomprimierung"}), 500
-
-@app.route("/serve_image/<filename>", methods=["GET"])
+    name = request.form.get("name") or os.path.basename(file.filename).rsplit(".", 1)[0]
+    if not IMAGE_NAME_RE.match(name):
+        return jsonify({"error": "Ungültiger Bildname"}), 400
+    data = file.read(MAX_IMAGE_BYTES + 1)
+    try:
+        check_image_limits(data)
+        ext = os.path.basename(file.filename).rsplit(".", 1)[-1].lower() if "." in file.filename else "bin"
+        os.makedirs(IMAGE_ORIGINALS_DIR, exist_ok=True)
+        write_file_atomic(os.path.join(IMAGE_ORIGINALS_DIR, f"{name}.{ext}"), data)
+        entry = generate_image_variants(name, data)
+    except ImageTooLargeError as e:
+        return jsonify({"error": str(e)}), 413
+    except FutureTimeoutError:
+        return jsonify({"error": "Bildverarbeitung überlastet, bitte später erneut versuchen"}), 503
+    except OSError:
+        return jsonify({"error": "Ungültige Bilddatei"}), 400
+    return jsonify({"status": "Bildvarianten erzeugt", "name": name, "manifest": entry}), 201
+
+@images_bp.route("/serve_image/<filename>", methods=["GET"])
 def serve_image(filename):
-    ua = request.headers.get("User-Agent", "").lower()
-    version = "small_" if "mobile" in ua else "large_"
-    f_path = f"images/{version}{filename}.webp"
-    if os.path.exists(f_path):
-        return send_file(f_path, mimetype="image/webp")
-    return jsonify({"error": "Bild nicht gefunden"}), 404
+    if not IMAGE_NAME_RE.match(filename):
+        return jsonify({"error": "Bild nicht gefunden"}), 404
+    try:
+        entry = load_or_derive_image_entry(filename)
+    except FutureTimeoutError:
+        return jsonify({"error": "Bildverarbeitung überlastet, bitte später erneut versuchen"}), 503
+    if entry is None:
+        return jsonify({"error": "Bild nicht gefunden"}), 404
+    variant, vary = pick_image_variant(entry)
+    return send_image_file(pick_image_format(variant), vary + ["Accept"])
 
 ##############################################################################
 # 12. KI/ML: SALES-STRATEGIE & SEO-Automation
@@ -706,6 +2668,8 @@ def serve_image(filename):
 MODEL_FILE = "sales_strategy_model.pkl"
 
 def train_sales_strategy_model():
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
     data = {
         "traffic": [100, 200, 150, 300, 250, 400],
         "ads_spend": [10, 20, 15, 25, 22, 35],
@@ -718,6 +2682,7 @@ def train_sales_strategy_model():
     y = df["success"]
     model = RandomForestClassifier(n_estimators=10, random_state=42)
     model.fit(X, y)
+    import joblib
     joblib.dump(model, MODEL_FILE)
     logging.info("Sales-Strategie-Modell trainiert & gespeichert.")
 
@@ -725,6 +2690,8 @@ def predict_best_strategy(traffic, ads_spend, seo_score, conversion_rate):
     if not os.path.exists(MODEL_FILE):
         logging.info("Kein Modell vorhanden, starte Training.")
         train_sales_strategy_model()
+    import joblib
+    import numpy as np
     model = joblib.load(MODEL_FILE)
     sample = np.array([[traffic, ads_spend, seo_score, conversion_rate]])
     return model.predict(sample)[0]
@@ -748,19 +2715,19 @@ def monitor_performance_and_optimize():
     else:
         logging.info("Performance stabil, kein Eingreifen nötig.")
 
-@app.route("/monitor_and_optimize", methods=["GET"])
+@ai_bp.route("/monitor_and_optimize", methods=["GET"])
 def monitor_and_optimize_endpoint():
     monitor_performance_and_optimize()
     return jsonify({"status": "Performance-Monitoring durchgeführt"}), 200
 
 def automate_seo_and_backlink_building():
     prompt = "Schreibe einen SEO-optimierten Gastartikel über Laptops..."
-    gen = generator(prompt, max_length=200, num_return_sequences=1)
+    gen = get_generator()(prompt, max_length=200, num_return_sequences=1)
     seo_article = gen[0]['generated_text']
     logging.info(f"SEO-Artikel: {seo_article}")
     logging.info("Backlink-Platzierung initiiert (Simuliert).")
 
-@app.route("/seo_backlink_automation", methods=["GET"])
+@ai_bp.route("/seo_backlink_automation", methods=["GET"])
 def seo_backlink_automation_endpoint():
     automate_seo_and_backlink_building()
     return jsonify({"status": "SEO & Backlink-Building ausgeführt"}), 200
@@ -768,25 +2735,109 @@ def seo_backlink_automation_endpoint():
 ##############################################################################
 # 13. Multi-Channel Distribution & Influencer-Bot
 ##############################################################################
-def distribute_content_multichannel(article_text):
-    logging.info("Starte Multi-Channel-Distribution.")
-    linked = auto_publish_linkedin_article(article_text)
-    medium = auto_publish_medium_post(article_text)
+PUBLISH_CHANNEL_TIMEOUT = float(os.getenv("PUBLISH_CHANNEL_TIMEOUT", 5))
+PUBLISH_WORKERS = int(os.getenv("PUBLISH_WORKERS", 16))
+# Wie lange ein Kanal auf einen freien Worker warten darf; die Kanal-Deadline zählt erst ab Ausführungsbeginn
+PUBLISH_QUEUE_TIMEOUT = float(os.getenv("PUBLISH_QUEUE_TIMEOUT", 2))
+# Gleichzeitige Aufrufe je Kanal, damit ein hängender Provider nicht den ganzen Pool belegt
+PUBLISH_MAX_INFLIGHT = int(os.getenv("PUBLISH_MAX_INFLIGHT", 4))
+
+PUBLISHING_CHANNELS = OrderedDict()
+_publish_executor = ThreadPoolExecutor(max_workers=PUBLISH_WORKERS, thread_name_prefix="publish")
+
+def register_channel(name, timeout=PUBLISH_CHANNEL_TIMEOUT):
+    """Registriert einen Publishing-Adapter (callable(article_text) -> Ergebnis) mit eigener Deadline.
+
+    Die Deadline begrenzt auch die HTTP-Timeouts des Adapters (http_client.deadline), damit der Worker
+    nach Ablauf tatsächlich frei wird.
+    """
+    def decorator(func):
+        PUBLISHING_CHANNELS[name] = {
+            "publish": func, "timeout": timeout, "slots": threading.BoundedSemaphore(PUBLISH_MAX_INFLIGHT)
+        }
+        return func
+    return decorator
+
+register_channel("LinkedIn")(auto_publish_linkedin_article)
+register_channel("Medium")(auto_publish_medium_post)
+
+@register_channel("Twitter")
+def publish_twitter_post(article_text):
     send_twitter_ifttt("Neuer Beitrag: " + article_text[:50])
-    logging.info("(Simuliert) Posting auf Twitter, Facebook, Instagram etc.")
-    return {
-        "LinkedIn": linked,
-        "Medium": medium,
-        "Twitter": "Über IFTTT gesendet",
-        "Facebook": "Simuliert gepostet",
-        "InstagramDM": "Simuliert gesendet"
-    }
+    return "Über IFTTT eingereiht"
+
+@register_channel("Facebook")
+def publish_facebook_post(article_text):
+    if USE_SIMULATION or not (FACEBOOK_ACCESS_TOKEN and FACEBOOK_PAGE_ID):
+        logging.info("(Simuliert) Facebook-Post.")
+        return "Simuliert gepostet"
+    r = http_client.post(
+        "facebook",
+        f"https://graph.facebook.com/v19.0/{FACEBOOK_PAGE_ID}/feed",
+        data={"message": article_text, "access_token": FACEBOOK_ACCESS_TOKEN}
+    )
+    r.raise_for_status()
+    return f"https://www.facebook.com/{r.json()['id']}"
+
+@register_channel("InstagramDM")
+def publish_instagram_dm(article_text):
+    logging.info("(Simuliert) Instagram-DM.")
+    return "Simuliert gesendet"
+
+def _timed_publish(func, article_text, timeout, started):
+    started["at"] = time.monotonic()
+    started["event"].set()
+    with http_client.deadline(timeout):
+        result = func(article_text)
+    return result, (time.monotonic() - started["at"]) * 1000
+
+def distribute_content_multichannel(article_text, channels=None):
+    """Veröffentlicht parallel auf allen (oder den gewählten) Kanälen, jeder Kanal mit eigener Deadline.
+
+    Die Deadline läuft ab Ausführungsbeginn; wer nicht binnen PUBLISH_QUEUE_TIMEOUT einen Worker bekommt,
+    wird abgebrochen. Liefert pro Kanal status ok/error/timeout/busy/unknown; ein langsamer Kanal
+    verzögert die anderen nicht.
+    """
+    logging.info("Starte Multi-Channel-Distribution.")
+    names = list(channels or PUBLISHING_CHANNELS)
+    results, submitted = {}, {}
+    for name in names:
+        channel = PUBLISHING_CHANNELS.get(name)
+        if channel is None:
+            results[name] = {"status": "unknown", "error": "Kanal nicht registriert"}
+            continue
+        if not channel["slots"].acquire(blocking=False):
+            logging.warning(f"Multi-Channel: {name} hat bereits {PUBLISH_MAX_INFLIGHT} laufende Aufrufe.")
+            results[name] = {"status": "busy", "error": "Zu viele laufende Aufrufe für diesen Kanal"}
+            continue
+        started = {"event": threading.Event(), "at": None}
+        future = _publish_executor.submit(_timed_publish, channel["publish"], article_text, channel["timeout"], started)
+        future.add_done_callback(lambda f, slots=channel["slots"]: slots.release())
+        submitted[name] = (future, started)
+    queue_deadline = time.monotonic() + PUBLISH_QUEUE_TIMEOUT
+    for name, (future, started) in submitted.items():
+        timeout = PUBLISHING_CHANNELS[name]["timeout"]
+        if not started["event"].wait(max(0.0, queue_deadline - time.monotonic())) and future.cancel():
+            logging.warning(f"Multi-Channel: {name} hat binnen {PUBLISH_QUEUE_TIMEOUT}s keinen Worker bekommen.")
+            results[name] = {"status": "timeout", "timeout_s": timeout, "error": "Nicht gestartet (Pool ausgelastet)"}
+            continue
+        started["event"].wait()
+        try:
+            result, duration_ms = future.result(timeout=max(0.0, started["at"] + timeout - time.monotonic()))
+            results[name] = {"status": "ok", "result": result, "duration_ms": round(duration_ms, 1)}
+        except FutureTimeoutError:
+            logging.warning(f"Multi-Channel: {name} hat die Deadline von {timeout}s überschritten.")
+            results[name] = {"status": "timeout", "timeout_s": timeout}
+        except Exception as e:
+            logging.error(f"Multi-Channel: {name} fehlgeschlagen: {e}")
+            results[name] = {"status": "error", "error": str(e)}
+    return {name: results[name] for name in names}
 
-@app.route("/multi_channel_distribution", methods=["POST"])
+@marketing_bp.route("/multi_channel_distribution", methods=["POST"])
 def multi_channel_distribution_endpoint():
     data = request.get_json()
     article_text = data.get("article_text", "Standard-Text")
-    res = distribute_content_multichannel(article_text)
+    res = distribute_content_multichannel(article_text, data.get("channels"))
     return jsonify({"status": "Multi-Channel-Distribution", "details": res})
 
 def influencer_marketing_bot(niche="fitness"):
@@ -801,27 +2852,294 @@ def influencer_marketing_bot(niche="fitness"):
         else:
             logging.info(f"{i['name']} übersprungen.")
 
-@app.route("/influencer_marketing", methods=["GET"])
+@marketing_bp.route("/influencer_marketing", methods=["GET"])
 def influencer_marketing_endpoint():
     niche = request.args.get("niche", "fitness")
     influencer_marketing_bot(niche)
     return jsonify({"status": f"Influencer-Bot für '{niche}' ausgeführt"})
 
-@app.route("/influencer_dm_campaign", methods=["POST"])
+DM_CHUNK_SIZE = int(os.getenv("DM_CHUNK_SIZE", 500))
+DM_RATE_LIMIT = float(os.getenv("DM_RATE_LIMIT", 10))   # DMs pro Sekunde und Plattform
+DM_JOB_LEASE_SECONDS = 300
+DM_WORKER_ENABLED = env_flag("DM_WORKER_ENABLED", feature_enabled("marketing"))
+
+def compile_dm_template(template):
+    """Zerlegt das DM-Template einmalig; die Rückgabe rendert eine DM nur noch per str.join.
+
+    Unterstützt wird (wie bisher) nur der Platzhalter {name}; andere Platzhalter lösen ValueError aus.
+    """
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        parts.append(literal)
+        if field is None:
+            continue
+        if field != "name" or spec or conversion:
+            raise ValueError(f"Nicht unterstützter Platzhalter: {{{field}}}")
+        parts.append(None)
+    slots = [i for i, part in enumerate(parts) if part is None]
+
+    def render(name):
+        out = list(parts)
+        for i in slots:
+            out[i] = str(name)
+        return "".join(out)
+    return render
+
+def send_influencer_dm(platform, name, message):
+    if USE_SIMULATION:
+        logging.info(f"(Simuliert) DM an {name} auf {platform} via IFTTT: {message}")
+        return
+    if not IFTTT_WEBHOOK_URL:
+        raise RuntimeError("IFTTT_WEBHOOK_URL fehlt")
+    r = http_client.post("ifttt", IFTTT_WEBHOOK_URL, json={"value1": platform, "value2": name, "value3": message})
+    r.raise_for_status()
+
+class DmCampaignExecutor:
+    """Führt Influencer-DM-Kampagnen als persistente Jobs aus (SQLite).
+
+    Einträge werden chunkweise verarbeitet; pro Plattform gilt ein eigenes Rate-Limit. Der Fortschritt
+    wird nach jedem Chunk gespeichert, ein Job wird per Lease geclaimt und nach einem Absturz fortgesetzt.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS dm_jobs (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        template TEXT NOT NULL,
+        status TEXT NOT NULL,
+        total INTEGER NOT NULL DEFAULT 0,
+        sent INTEGER NOT NULL DEFAULT 0,
+        failed INTEGER NOT NULL DEFAULT 0,
+        lease_until REAL NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS dm_job_items (
+        job_id TEXT NOT NULL REFERENCES dm_jobs(id) ON DELETE CASCADE,
+        seq INTEGER NOT NULL,
+        name TEXT,
+        platform TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        message TEXT,
+        error TEXT,
+        PRIMARY KEY (job_id, seq)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._schema_ready = False
+        self._lock = Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._limiters = {}
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="dm")
+
+    def _conn(self):
+        conn = get_sqlite_connection(self.path)
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    conn.executescript(self.SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def _limiter(self, platform):
+        with self._lock:
+            if platform not in self._limiters:
+                self._limiters[platform] = RateLimiter(DM_RATE_LIMIT)
+            return self._limiters[platform]
+
+    def create_job(self, title, template, influencers):
+        """Legt einen Job an und speichert die (ggf. gestreamten) Influencer chunkweise; liefert (job_id, total)."""
+        compile_dm_template(template)
+        job_id = uuid.uuid4().hex
+        conn = self._conn()
+        now = datetime.now().isoformat()
+        with conn:
+            conn.execute(
+                "INSERT INTO dm_jobs (id, title, template, status, created_at, updated_at) VALUES (?, ?, ?, 'uploading', ?, ?)",
+                (job_id, title, template, now, now)
+            )
+        total = 0
+        chunk = []
+        try:
+            for infl in influencers:
+                if not isinstance(infl, dict):
+                    raise ValueError(f"Eintrag {total + 1} ist kein Objekt")
+                chunk.append((job_id, total, infl.get("name"), (infl.get("platform") or "").lower()))
+                total += 1
+                if len(chunk) >= DM_CHUNK_SIZE:
+                    with conn:
+                        conn.executemany("INSERT INTO dm_job_items (job_id, seq, name, platform) VALUES (?, ?, ?, ?)", chunk)
+                    chunk = []
+        except ValueError:
+            with conn:
+                conn.execute("DELETE FROM dm_jobs WHERE id = ?", (job_id,))
+            raise
+        with conn:
+            if chunk:
+                conn.executemany("INSERT INTO dm_job_items (job_id, seq, name, platform) VALUES (?, ?, ?, ?)", chunk)
+            conn.execute("UPDATE dm_jobs SET status = 'queued', total = ? WHERE id = ?", (total, job_id))
+        self._wakeup.set()
+        return job_id, total
+
+    def get_job(self, job_id):
+        row = self._conn().execute(
+            "SELECT id, title, status, total, sent, failed, created_at, updated_at FROM dm_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def iter_results(self, job_id):
+        """Liefert verarbeitete Einträge in seq-Reihenfolge (Keyset-Pagination, konstanter Speicher)."""
+        conn = self._conn()
+        last_seq = -1
+        while True:
+            rows = conn.execute(
+                "SELECT seq, name, platform, status, message, error FROM dm_job_items"
+                " WHERE job_id = ? AND seq > ? AND status != 'pending' ORDER BY seq LIMIT ?",
+                (job_id, last_seq, DM_CHUNK_SIZE)
+            ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+            last_seq = rows[-1]["seq"]
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="dm-campaigns", daemon=True)
+                self._thread.start()
+
+    def _claim_job(self):
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id, template FROM dm_jobs WHERE status = 'queued' OR (status = 'running' AND lease_until < ?)"
+                " ORDER BY created_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE dm_jobs SET status = 'running', lease_until = ? WHERE id = ?",
+                    (now + DM_JOB_LEASE_SECONDS, row["id"])
+                )
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        return row
+
+    def _send_platform_batch(self, render, items):
+        results = []
+        limiter = self._limiter(items[0]["platform"])
+        for item in items:
+            message = render(item["name"])
+            try:
+                limiter.acquire()
+                send_influencer_dm(item["platform"], item["name"], message)
+                results.append(("sent", message, None, item["seq"]))
+            except Exception as e:
+                results.append(("failed", message, str(e), item["seq"]))
+        return results
+
+    def _process_job(self, job_id, template):
+        render = compile_dm_template(template)
+        conn = self._conn()
+        while True:
+            items = conn.execute(
+                "SELECT seq, name, platform FROM dm_job_items WHERE job_id = ? AND status = 'pending' ORDER BY seq LIMIT ?",
+                (job_id, DM_CHUNK_SIZE)
+            ).fetchall()
+            if not items:
+                break
+            by_platform = {}
+            for item in items:
+                by_platform.setdefault(item["platform"], []).append(item)
+            results = []
+            for batch_results in self._pool.map(lambda batch: self._send_platform_batch(render, batch), by_platform.values()):
+                results.extend(batch_results)
+            sent = sum(1 for r in results if r[0] == "sent")
+            with conn:
+                conn.executemany(
+                    "UPDATE dm_job_items SET status = ?, message = ?, error = ? WHERE job_id = ? AND seq = ?",
+                    [(status, message, error, job_id, seq) for status, message, error, seq in results]
+                )
+                conn.execute(
+                    "UPDATE dm_jobs SET sent = sent + ?, failed = failed + ?, lease_until = ?, updated_at = ? WHERE id = ?",
+                    (sent, len(results) - sent, time.time() + DM_JOB_LEASE_SECONDS, datetime.now().isoformat(), job_id)
+                )
+        with conn:
+            conn.execute("UPDATE dm_jobs SET status = 'done', updated_at = ? WHERE id = ?", (datetime.now().isoformat(), job_id))
+        logging.info(f"DM-Kampagne {job_id} abgeschlossen.")
+
+    def _run(self):
+        while True:
+            try:
+                job = self._claim_job()
+                if job:
+                    self._process_job(job["id"], job["template"])
+                    continue
+            except sqlite3.Error as e:
+                logging.error(f"DM-Kampagnen-Worker: DB-Fehler: {e}")
+            self._wakeup.wait(30)
+            self._wakeup.clear()
+
+dm_campaigns = DmCampaignExecutor(APP_DB_PATH)
+if DM_WORKER_ENABLED:
+    dm_campaigns.start()
+
+def iter_ndjson(stream):
+    """Liest JSON-Objekte zeilenweise aus einem Request-Stream (leere Zeilen werden übersprungen)."""
+    for raw in stream:
+        line = raw.strip()
+        if line:
+            yield json.loads(line)
+
+@marketing_bp.route("/influencer_dm_campaign", methods=["POST"])
 def influencer_dm_campaign():
-    data = request.get_json()
-    camp_title = data.get("campaign_title", "Influencer-Kampagne")
-    infl_list = data.get("influencers", [])
-    msg_tpl = data.get("message_template", "Hey {name}, schau dir unser Angebot an!")
-    results = []
-    for infl in infl_list:
-        name = infl.get("name")
-        platform = infl.get("platform", "").lower()
-        msg = msg_tpl.format(name=name)
-        if USE_SIMULATION:
-            logging.info(f"(Simuliert) DM an {name} auf {platform} via IFTTT: {msg}")
-            results.append(f"DM to {name} on {platform}: {msg}")
-    return jsonify({"status": f"Kampagne '{camp_title}' ausgeführt", "results": results})
+    """Legt eine DM-Kampagne als Job an.
+
+    Große Listen werden als NDJSON-Stream hochgeladen (ein Influencer je Zeile, Titel/Template als
+    Query-Parameter); kleine Listen können wie bisher als JSON mit "influencers" gesendet werden.
+    """
+    if request.mimetype == "application/x-ndjson":
+        camp_title = request.args.get("campaign_title", "Influencer-Kampagne")
+        msg_tpl = request.args.get("message_template", "Hey {name}, schau dir unser Angebot an!")
+        infl_iter = iter_ndjson(request.stream)
+    else:
+        data = request.get_json()
+        camp_title = data.get("campaign_title", "Influencer-Kampagne")
+        msg_tpl = data.get("message_template", "Hey {name}, schau dir unser Angebot an!")
+        infl_iter = data.get("influencers", [])
+    try:
+        job_id, total = dm_campaigns.create_job(camp_title, msg_tpl, infl_iter)
+    except ValueError as e:
+        return jsonify({"error": f"Ungültige Eingabe: {e}"}), 400
+    return jsonify({
+        "status": f"Kampagne '{camp_title}' eingeplant",
+        "job_id": job_id,
+        "total": total,
+        "status_url": f"/influencer_dm_campaign/{job_id}",
+        "results_url": f"/influencer_dm_campaign/{job_id}/results"
+    }), 202
+
+@marketing_bp.route("/influencer_dm_campaign/<job_id>", methods=["GET"])
+def influencer_dm_campaign_status(job_id):
+    job = dm_campaigns.get_job(job_id)
+    if not job:
+        return jsonify({"error": "Kampagne nicht gefunden"}), 404
+    return jsonify(job)
+
+@marketing_bp.route("/influencer_dm_campaign/<job_id>/results", methods=["GET"])
+def influencer_dm_campaign_results(job_id):
+    if not dm_campaigns.get_job(job_id):
+        return jsonify({"error": "Kampagne nicht gefunden"}), 404
+    lines = (json.dumps(item, ensure_ascii=False) + "\n" for item in dm_campaigns.iter_results(job_id))
+    return Response(stream_with_context(lines), mimetype="application/x-ndjson")
 
 ##############################################################################
 # 14. Erweiterter Cyber-Schutz
@@ -832,11 +3150,11 @@ def analyze_cyberattack(attack_vector, severity_score):
     logging.info(f"KI-Analyse Cyberangriff: {attack_vector}, Severity={severity_score}")
     if severity_score > 7.0:
         logging.warning("Kritischer Angriff - starte Gegenmaßnahmen!")
-        send_fcm_notification(f"Kritischer Angriff: {attack_vector}", "Cyber-Angriff")
+        send_fcm_notification(f"Kritischer Angriff: {attack_vector}", "Cyber-Angriff", priority="high")
     else:
         logging.info("Angriff erkannt, aber nicht kritisch genug für Autoverteidigung.")
 
-@app.route("/cyber_attack_analysis", methods=["POST"])
+@admin_bp.route("/cyber_attack_analysis", methods=["POST"])
 def cyber_attack_analysis_endpoint():
     data = request.get_json()
     atk_vec = data.get("attack_vector", "unspecified")
@@ -849,11 +3167,11 @@ def dark_web_monitoring():
     found = random.choice([True, False])
     if found:
         logging.warning("Dark-Web: Marken-/Domainmissbrauch entdeckt!")
-        send_fcm_notification("Dark-Web-Alarm: Missbrauch entdeckt!", "Dark-Web Alert")
+        send_fcm_notification("Dark-Web-Alarm: Missbrauch entdeckt!", "Dark-Web Alert", priority="high")
     else:
         logging.info("Kein Missbrauch im Dark Web gefunden.")
 
-@app.route("/dark_web_check", methods=["GET"])
+@admin_bp.route("/dark_web_check", methods=["GET"])
 def dark_web_check_endpoint():
     dark_web_monitoring()
     return jsonify({"status": "Dark-Web-Überwachung abgeschlossen"}), 200
@@ -879,7 +3197,7 @@ def log_error_to_db(message):
     except Exception as e:
         logging.error(f"Fehler beim Speichern in der Datenbank: {e}")
 
-@app.route("/admin/error_log", methods=["GET"])
+@admin_bp.route("/admin/error_log", methods=["GET"])
 def error_log():
     try:
         conn = psycopg2.connect(
@@ -900,7 +3218,7 @@ def error_log():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route("/admin/error_statistics", methods=["GET"])
+@admin_bp.route("/admin/error_statistics", methods=["GET"])
 def error_statistics():
     try:
         conn = psycopg2.connect(
@@ -970,7 +3288,7 @@ def detect_affiliate_fraud(partner_id):
         logging.warning(f"Affiliate-Betrug (Basis) von IP {ip} bei {partner_id}!")
         SUSPICIOUS_IPS.add(ip)
 
-@app.route("/affiliate/<partner_id>", methods=["GET"])
+@affiliate_bp.route("/affiliate/<partner_id>", methods=["GET"])
 def affiliate_link(partner_id):
     detect_affiliate_fraud(partner_id)
     return jsonify({"message": f"Affiliate-Link für {partner_id} geklickt."})
@@ -995,14 +3313,13 @@ def advanced_affiliate_fraud_check(partner_id):
         logging.warning(f"Affiliate-Betrug (Threshold) IP {ip}, Partner {partner_id}")
         SUSPICIOUS_IPS.add(ip)
         return
-    x = np.array([[click_count, random.uniform(0, 1)]])
-    fraud_prob = (click_count / 20.0) + x[0][1] * 0.3
+    fraud_prob = (click_count / 20.0) + random.uniform(0, 1) * 0.3
     fraud_prob = min(fraud_prob, 1.0)
     if fraud_prob > 0.8:
         logging.warning(f"(ML) Betrug p={fraud_prob:.2f} für IP {ip}")
         SUSPICIOUS_IPS.add(ip)
 
-@app.route("/affiliate2/<partner_id>", methods=["GET"])
+@affiliate_bp.route("/affiliate2/<partner_id>", methods=["GET"])
 def affiliate_link_hijack(partner_id):
     advanced_affiliate_fraud_check(partner_id)
     return jsonify({"message": f"Affiliate-Link (2.0) für {partner_id} geklickt."})
@@ -1049,7 +3366,7 @@ def backup_database():
     except Exception as e:
         logging.error(f"Fehler beim Backup: {e}")
         send_email_smtp("admin@example.com", "DB-Backup Fehler", f"Fehler: {e}")
-        send_fcm_notification(f"DB-Backup Fehler: {e}", "DB-Backup Error")
+        send_fcm_notification(f"DB-Backup Fehler: {e}", "DB-Backup Error", coalesce=True)
 
 def cleanup_old_backups(backup_folder, days=7):
     now = datetime.now()
@@ -1063,7 +3380,7 @@ def cleanup_old_backups(backup_folder, days=7):
         except Exception as e:
             logging.error(f"Fehler beim Löschen {fpath}: {e}")
             send_email_smtp("admin@example.com", "Backup Cleanup Fehler", f"Fehler: {e}")
-            send_fcm_notification(f"Cleanup Fehler: {e}", "DB-Backup Cleanup")
+            send_fcm_notification(f"Cleanup Fehler: {e}", "DB-Backup Cleanup", coalesce=True)
 
 def upload_backup_to_cloud(backup_path):
     if USE_SIMULATION:
@@ -1085,7 +3402,8 @@ def auto_restore_database():
         send_fcm_notification(f"Restore Fehler: {e}", "DB-Restore")
         return False
 
-@app.route("/admin/restore_database", methods=["POST"])
+@admin_bp.route("/admin/restore_database", methods=["POST"])
+@require_admin
 def restore_database():
     if auto_restore_database():
         return jsonify({"status": "Datenbank wiederhergestellt"}), 200
@@ -1118,28 +3436,197 @@ def integrity_check():
         else:
             logging.error("DB-Integritätsprüfung: Fehler")
             send_email_smtp("admin@example.com", "DB Integritätsfehler", "Integritätsprüfung fehlgeschlagen")
-            send_fcm_notification("DB-Integritätsfehler", "DB-Fehler")
+            send_fcm_notification("DB-Integritätsfehler", "DB-Fehler", priority="high")
             auto_restore_database()
     except Exception as e:
         logging.error(f"Fehler bei Integritätsprüfung: {e}")
         send_email_smtp("admin@example.com", "Integritätsprüfung Fehler", str(e))
-        send_fcm_notification(f"Integritätsprüfung Fehler: {e}", "DB-Fehler")
+        send_fcm_notification(f"Integritätsprüfung Fehler: {e}", "DB-Fehler", priority="high")
 
 ##############################################################################
 # 17. Re-Engagement-Kampagne
 ##############################################################################
+REENGAGEMENT_PAGE_SIZE = int(os.getenv("REENGAGEMENT_PAGE_SIZE", 500))
+SENDINBLUE_RATE_LIMIT = float(os.getenv("SENDINBLUE_RATE_LIMIT", 5))   # Requests pro Sekunde
+# Ein laufender Checkpoint, der so lange nicht fortgeschrieben wurde, gilt als verwaist (Worker abgestürzt)
+CAMPAIGN_CLAIM_TIMEOUT = int(os.getenv("CAMPAIGN_CLAIM_TIMEOUT", 900))
+
+sendinblue_limiter = RateLimiter(SENDINBLUE_RATE_LIMIT)
+
 def get_inactive_users():
     return ["user1@example.com", "user2@example.com"]
 
-def reengagement_campaign():
-    inactive = get_inactive_users()
+def get_inactive_users_page(offset, limit):
+    """Liefert eine Seite inaktiver Nutzer (Platzhalter für eine Query mit ORDER BY/LIMIT/OFFSET)."""
+    return get_inactive_users()[offset:offset + limit]
+
+class CampaignCheckpoints:
+    """Persistiert den Fortschritt (nächster Offset) von Kampagnenläufen, damit Abbrüche fortgesetzt werden.
+
+    Status: running (beansprucht), interrupted (abgebrochen, sofort fortsetzbar), done.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS campaign_checkpoints (
+        campaign_id TEXT PRIMARY KEY,
+        next_offset INTEGER NOT NULL DEFAULT 0,
+        status TEXT NOT NULL DEFAULT 'running',
+        updated_at TEXT NOT NULL
+    );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._schema_ready = False
+        self._lock = Lock()
+
+    def _conn(self):
+        conn = get_sqlite_connection(self.path)
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    conn.executescript(self.SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    def claim(self, campaign_id):
+        """Beansprucht einen Lauf atomar in der DB, damit ihn über alle Worker hinweg nur einer ausführt.
+
+        Gelingt für neue und abgebrochene Kampagnen sowie für verwaiste Läufe (CAMPAIGN_CLAIM_TIMEOUT);
+        bei laufenden oder abgeschlossenen Kampagnen liefert es False.
+        """
+        now = datetime.now()
+        stale_before = (now - timedelta(seconds=CAMPAIGN_CLAIM_TIMEOUT)).isoformat()
+        conn = self._conn()
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO campaign_checkpoints (campaign_id, next_offset, status, updated_at) VALUES (?, 0, 'running', ?)"
+                " ON CONFLICT(campaign_id) DO UPDATE SET status = 'running', updated_at = excluded.updated_at"
+                " WHERE campaign_checkpoints.status = 'interrupted'"
+                " OR (campaign_checkpoints.status = 'running' AND campaign_checkpoints.updated_at < ?)",
+                (campaign_id, now.isoformat(), stale_before)
+            )
+        return cur.rowcount == 1
+
+    def get(self, campaign_id):
+        row = self._conn().execute(
+            "SELECT next_offset, status, updated_at FROM campaign_checkpoints WHERE campaign_id = ?", (campaign_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def save(self, campaign_id, next_offset, status="running"):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO campaign_checkpoints (campaign_id, next_offset, status, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(campaign_id) DO UPDATE SET next_offset = excluded.next_offset,"
+                " status = excluded.status, updated_at = excluded.updated_at",
+                (campaign_id, next_offset, status, datetime.now().isoformat())
+            )
+
+campaign_checkpoints = CampaignCheckpoints(APP_DB_PATH)
+
+def _outbox_send_reengagement_emails(payloads):
+    """Outbox-Batch-Handler: gleiche Inhalte gehen als Sendinblue-Batches raus; liefert Fehler pro Payload."""
+    groups = OrderedDict()
+    for i, p in enumerate(payloads):
+        key = (p["base_content"], tuple(p["possible_subjects"]), p["user_behavior"])
+        groups.setdefault(key, []).append(i)
+    errors = [None] * len(payloads)
+    for (base_content, possible_subjects, user_behavior), indices in groups.items():
+        for start in range(0, len(indices), SENDINBLUE_BATCH_SIZE):
+            chunk = indices[start:start + SENDINBLUE_BATCH_SIZE]
+            sendinblue_limiter.acquire()
+            results = send_sendinblue_batch([payloads[i]["user_email"] for i in chunk],
+                                            base_content, list(possible_subjects), user_behavior)
+            for i, error in zip(chunk, results):
+                errors[i] = error
+    return errors
+
+outbox.register_handler("reengagement_email", _outbox_send_reengagement_emails, batch=True)
+
+def _enqueue_reengagement_page(campaign_id, users, base_content, possible_subjects, user_behavior):
+    """Schreibt E-Mails und Pushes einer Seite dauerhaft in die Outbox, bevor der Checkpoint weiterläuft.
+
+    Die Idempotency-Keys hängen an campaign_id und Empfänger; ein fortgesetzter Lauf erzeugt keine Duplikate.
+    """
+    outbox.enqueue_many("reengagement_email", [
+        (f"reengagement:{campaign_id}:email:{usr}",
+         {"user_email": usr, "base_content": base_content,
+          "possible_subjects": possible_subjects, "user_behavior": user_behavior})
+        for usr in users
+    ])
+    outbox.enqueue_many("fcm", [
+        (f"reengagement:{campaign_id}:push:{usr}",
+         {"message": f"Hey {usr}, neue Angebote warten!", "title": "Re-Engagement"})
+        for usr in users
+    ])
+
+def default_campaign_id():
+    return f"reengagement-{datetime.now().strftime('%Y-%m-%d')}"
+
+def run_reengagement_campaign(campaign_id):
+    """Re-Engagement in Seiten: E-Mails und Pushes gehen pro Seite in die Outbox, danach der Checkpoint.
+
+    Der Versand (Sendinblue-Batches, FCM) läuft mit Retry über den Outbox-Relay. Setzt einen per
+    campaign_checkpoints.claim beanspruchten Lauf voraus; ein abgebrochener Lauf mit derselben
+    campaign_id setzt an der letzten vollständig eingereihten Seite fort.
+    """
+    checkpoint = campaign_checkpoints.get(campaign_id)
+    offset = checkpoint["next_offset"] if checkpoint else 0
+    if offset:
+        logging.info(f"Re-Engagement-Kampagne {campaign_id} wird ab Offset {offset} fortgesetzt.")
     base_content = "Hallo, es gibt tolle Neuigkeiten und Angebote!"
     possible_subjects = ["Exklusive Angebote warten!", "Verpasse nicht diese News!", "Top-Angebote für dich!"]
-    for usr in inactive:
-        user_behavior = "Interessiert sich für Marketing"
-        send_sendinblue_email(usr, base_content, possible_subjects, user_behavior)
-        send_fcm_notification(f"Hey {usr}, neue Angebote warten!", "Re-Engagement")
-    logging.info("Re-Engagement-Kampagne abgeschlossen.")
+    user_behavior = "Interessiert sich für Marketing"
+    try:
+        while True:
+            users = get_inactive_users_page(offset, REENGAGEMENT_PAGE_SIZE)
+            if not users:
+                break
+            _enqueue_reengagement_page(campaign_id, users, base_content, possible_subjects, user_behavior)
+            offset += len(users)
+            campaign_checkpoints.save(campaign_id, offset)
+    except Exception:
+        campaign_checkpoints.save(campaign_id, offset, status="interrupted")
+        raise
+    campaign_checkpoints.save(campaign_id, offset, status="done")
+    logging.info(f"Re-Engagement-Kampagne {campaign_id} abgeschlossen ({offset} Nutzer).")
+    return campaign_id
+
+def reengagement_campaign(campaign_id=None):
+    """Beansprucht und führt eine Kampagne synchron aus; liefert None, wenn sie läuft oder abgeschlossen ist."""
+    campaign_id = campaign_id or default_campaign_id()
+    if not campaign_checkpoints.claim(campaign_id):
+        logging.info(f"Re-Engagement-Kampagne {campaign_id} läuft bereits oder ist abgeschlossen.")
+        return None
+    return run_reengagement_campaign(campaign_id)
+
+@marketing_bp.route("/admin/reengagement_campaign", methods=["POST"])
+@require_admin
+def reengagement_campaign_endpoint():
+    data = request.get_json(silent=True) or {}
+    campaign_id = data.get("campaign_id") or default_campaign_id()
+    if not campaign_checkpoints.claim(campaign_id):
+        status = (campaign_checkpoints.get(campaign_id) or {}).get("status")
+        error = "Kampagne bereits abgeschlossen" if status == "done" else "Kampagne läuft bereits"
+        return jsonify({"error": error, "campaign_id": campaign_id}), 409
+
+    def run():
+        try:
+            run_reengagement_campaign(campaign_id)
+        except Exception as e:
+            logging.error(f"Re-Engagement-Kampagne {campaign_id} abgebrochen: {e}")
+
+    Thread(target=run, daemon=True).start()
+    return jsonify({"status": "Re-Engagement-Kampagne gestartet", "campaign_id": campaign_id}), 202
+
+@marketing_bp.route("/admin/reengagement_campaign/<campaign_id>", methods=["GET"])
+def reengagement_campaign_status(campaign_id):
+    checkpoint = campaign_checkpoints.get(campaign_id)
+    if not checkpoint:
+        return jsonify({"error": "Kampagne nicht gefunden"}), 404
+    return jsonify({"campaign_id": campaign_id, **checkpoint})
 
 ##############################################################################
 # 18. Conversion-Optimierung (Heatmap, CTA, FOMO)
@@ -1153,7 +3640,7 @@ def generate_dynamic_cta(user_behavior):
         return "Jetzt informieren und profitieren!"
     return "Klicken Sie hier für mehr Details!"
 
-@app.route("/conversion_optimize", methods=["GET"])
+@marketing_bp.route("/conversion_optimize", methods=["GET"])
 def conversion_optimize():
     behavior = request.args.get("behavior", "allgemeines Interesse")
     heatmap = simulate_heatmap_analysis()
@@ -1184,25 +3671,359 @@ def get_bestseller_products():
 ##############################################################################
 # 19. Personalisierte Landingpage-Demo
 ##############################################################################
-@app.route("/landing_page", methods=["GET"])
-def landing_page_demo_endpoint():
-    user_interest = request.args.get("interest", "Technologie")
-    html = f"""
+page_templates.register("landing_page", """
     <html>
-      <head><title>Exklusive Angebote für {user_interest}</title></head>
+      <head><title>Exklusive Angebote für {{ interest }}</title></head>
       <body>
-        <h1>Willkommen, {user_interest}-Enthusiast!</h1>
-        <p>Individuelle Angebote für dein Interesse an {user_interest}!</p>
+        <h1>Willkommen, {{ interest }}-Enthusiast!</h1>
+        <p>Individuelle Angebote für dein Interesse an {{ interest }}!</p>
       </body>
     </html>
-    """
+""")
+
+@shop_bp.route("/landing_page", methods=["GET"])
+def landing_page_demo_endpoint():
+    user_interest = request.args.get("interest", "Technologie")
     logging.info(f"Landingpage für '{user_interest}' generiert.")
-    return render_template_string(html)
+    return page_templates.render("landing_page", interest=user_interest)
 
 ##############################################################################
 # 20. Ultimative SEO-Strategie (Google Discover, Trends, etc.)
 ##############################################################################
-SEO_ARTICLES_DB = {}
+SEO_DB_PATH = os.getenv("SEO_DB_PATH", APP_DB_PATH)
+SEO_ARTICLE_CACHE_TTL = 600
+SEO_MAX_PER_PAGE = 100
+SEO_PAGE_CACHE_ITEMS = int(os.getenv("SEO_PAGE_CACHE_ITEMS", 256))
+SEO_PAGE_MAX_AGE = int(os.getenv("SEO_PAGE_MAX_AGE", 3600))
+SITE_BASE_URL = os.getenv("SITE_BASE_URL", "https://deinedomain.de").rstrip("/")
+SITEMAP_MAX_URLS = 50000   # Obergrenze je Sitemap-Datei laut sitemaps.org
+NEWS_FEED_ITEMS = int(os.getenv("NEWS_FEED_ITEMS", 50))
+SEO_STATS_CACHE_KEY = "seo_articles:stats"
+
+page_templates.register("seo_article", """
+    <html>
+      <head>
+        <title>{{ article.title }}</title>
+        {% for schema in article.schema_markup %}
+        <script type="application/ld+json">{{ schema|tojson }}</script>
+        {% endfor %}
+      </head>
+      <body>
+        <h1>{{ article.title }}</h1>
+        <p>{{ article.content }}</p>
+        <p style="color:green">Keywords: {{ article.keywords|join(", ") }}</p>
+      </body>
+    </html>
+""")
+
+def seo_people_also_ask(keyword):
+    return [
+        f"Was ist {keyword} genau?",
+        f"Wie nutzt man {keyword} optimal?",
+        f"Was kostet {keyword}? Warum lohnt sich ein Vergleich?"
+    ]
+
+def build_seo_schema(article):
+    """JSON-LD-Objekte (Article, FAQPage) aus den Artikelfeldern; nie vom Client übernommen.
+
+    Das Template bettet sie per |tojson ein, das <, > und & maskiert.
+    """
+    keyword = article["keywords"][0] if article["keywords"] else article["title"]
+    return [
+        {
+            "@context": "https://schema.org",
+            "@type": "Article",
+            "headline": f"Dein Artikel zu {keyword}",
+            "mainEntityOfPage": {"@type": "WebPage", "@id": f"{SITE_BASE_URL}/blog/{keyword.replace(' ', '-').lower()}"},
+            "author": "Deine Website",
+            "datePublished": article["created_at"],
+            "articleBody": article["content"][:150] + "..."
+        },
+        {
+            "@context": "https://schema.org",
+            "@type": "FAQPage",
+            "mainEntity": [
+                {"@type": "Question", "name": q, "acceptedAnswer": {"@type": "Answer", "text": "Antwort im Artikel"}}
+                for q in seo_people_also_ask(keyword)[:2]
+            ]
+        }
+    ]
+
+def render_seo_page(article):
+    """Rendert die Artikelseite und komprimiert sie vorab (gzip, Brotli falls installiert)."""
+    html = page_templates.render("seo_article", article=article).encode("utf-8")
+    return {
+        "etag": hashlib.sha256(html).hexdigest()[:32],
+        "html": html,
+        "gzip": gzip.compress(html, compresslevel=9, mtime=0),
+        "br": brotli.compress(html, quality=11) if brotli else None
+    }
+
+class SeoArticleRepository:
+    """SEO-Artikel in SQLite: Primärschlüssel-Lookup, invertierter Keyword-Index und FTS5-Volltextsuche."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS seo_articles (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        keywords TEXT NOT NULL,
+        schema_markup TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_seo_articles_created ON seo_articles(created_at);
+    CREATE TABLE IF NOT EXISTS seo_article_keywords (
+        keyword TEXT NOT NULL,
+        article_id TEXT NOT NULL REFERENCES seo_articles(id) ON DELETE CASCADE,
+        PRIMARY KEY (keyword, article_id)
+    ) WITHOUT ROWID;
+    CREATE VIRTUAL TABLE IF NOT EXISTS seo_articles_fts USING fts5(article_id UNINDEXED, title, content);
+    CREATE TABLE IF NOT EXISTS seo_article_pages (
+        article_id TEXT PRIMARY KEY REFERENCES seo_articles(id) ON DELETE CASCADE,
+        etag TEXT NOT NULL,
+        html BLOB NOT NULL,
+        gzip BLOB NOT NULL,
+        br BLOB,
+        rendered_at TEXT NOT NULL
+    );
+    """
+
+    UPDATABLE_FIELDS = {"title": str, "content": str, "keywords": list}
+
+    def __init__(self, path):
+        self.path = path
+        self._schema_ready = False
+        self._schema_lock = Lock()
+        self._pages = LRUCache(SEO_PAGE_CACHE_ITEMS, SEO_ARTICLE_CACHE_TTL)
+
+    def _conn(self):
+        conn = get_sqlite_connection(self.path)
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(self.SCHEMA)
+                    self._schema_ready = True
+        return conn
+
+    @staticmethod
+    def _cache_key(article_id):
+        return f"seo_article:{article_id}"
+
+    @staticmethod
+    def _page_etag_key(article_id):
+        return f"seo_page_etag:{article_id}"
+
+    @staticmethod
+    def _store_page(conn, article):
+        page = render_seo_page(article)
+        conn.execute(
+            "INSERT OR REPLACE INTO seo_article_pages (article_id, etag, html, gzip, br, rendered_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (article["id"], page["etag"], page["html"], page["gzip"], page["br"], datetime.now().isoformat())
+        )
+        return page
+
+    @staticmethod
+    def _row_to_article(row):
+        article = dict(row)
+        article["keywords"] = json.loads(article["keywords"])
+        if "schema_markup" not in article:
+            # list()/search() lesen nur die Listenspalten
+            return article
+        try:
+            article["schema_markup"] = json.loads(article["schema_markup"])
+        except ValueError:
+            # Ältere Zeilen enthalten noch fertiges <script>-Markup; wird aus den Feldern neu erzeugt
+            article["schema_markup"] = build_seo_schema(article)
+        return article
+
+    def add(self, title, content, keywords):
+        """Speichert einen Artikel samt Keyword-Index, Volltextindex, JSON-LD und vorgerenderter Seite;
+        liefert die neue Artikel-ID."""
+        conn = self._conn()
+        now = datetime.now().isoformat()
+        schema_markup = build_seo_schema({"title": title, "content": content, "keywords": keywords, "created_at": now})
+        while True:
+            art_id = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO seo_articles (id, title, content, keywords, schema_markup, created_at, updated_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (art_id, title, content, json.dumps(keywords), json.dumps(schema_markup), now, now)
+                    )
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO seo_article_keywords (keyword, article_id) VALUES (?, ?)",
+                        [(kw.strip().lower(), art_id) for kw in keywords]
+                    )
+                    conn.execute(
+                        "INSERT INTO seo_articles_fts (article_id, title, content) VALUES (?, ?, ?)",
+                        (art_id, title, content)
+                    )
+                    self._store_page(conn, {
+                        "id": art_id, "title": title, "content": content, "keywords": keywords,
+                        "schema_markup": schema_markup, "created_at": now, "updated_at": now
+                    })
+                tiered_cache.delete(SEO_STATS_CACHE_KEY)
+                return art_id
+            except sqlite3.IntegrityError:
+                continue
+
+    def get(self, article_id):
+        """Primärschlüssel-Lookup mit Hot-Article-Cache (nur Treffer werden gecacht)."""
+        key = self._cache_key(article_id)
+        article = tiered_cache.get(key)
+        if article is not None:
+            return article
+        row = self._conn().execute("SELECT * FROM seo_articles WHERE id = ?", (article_id,)).fetchone()
+        if row is None:
+            return None
+        article = self._row_to_article(row)
+        tiered_cache.set(key, article, SEO_ARTICLE_CACHE_TTL)
+        return article
+
+    def update(self, article_id, fields):
+        """Ändert Felder eines Artikels (nur UPDATABLE_FIELDS, vom Aufrufer geprüft), pflegt die Indizes
+        nach, erzeugt das JSON-LD neu und rendert die Seite neu."""
+        fields = {k: v for k, v in fields.items() if k in self.UPDATABLE_FIELDS}
+        conn = self._conn()
+        row = conn.execute("SELECT * FROM seo_articles WHERE id = ?", (article_id,)).fetchone()
+        if row is None:
+            return False
+        article = self._row_to_article(row)
+        article.update(fields, updated_at=datetime.now().isoformat())
+        article["schema_markup"] = build_seo_schema(article)
+        with conn:
+            conn.execute(
+                "UPDATE seo_articles SET title = ?, content = ?, keywords = ?, schema_markup = ?, updated_at = ?"
+                " WHERE id = ?",
+                (article["title"], article["content"], json.dumps(article["keywords"]),
+                 json.dumps(article["schema_markup"]), article["updated_at"], article_id)
+            )
+            if "keywords" in fields:
+                conn.execute("DELETE FROM seo_article_keywords WHERE article_id = ?", (article_id,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO seo_article_keywords (keyword, article_id) VALUES (?, ?)",
+                    [(kw.strip().lower(), article_id) for kw in article["keywords"]]
+                )
+            if "title" in fields or "content" in fields:
+                conn.execute("DELETE FROM seo_articles_fts WHERE article_id = ?", (article_id,))
+                conn.execute(
+                    "INSERT INTO seo_articles_fts (article_id, title, content) VALUES (?, ?, ?)",
+                    (article_id, article["title"], article["content"])
+                )
+            self._store_page(conn, article)
+        self._pages.delete(article_id)
+        tiered_cache.delete(self._cache_key(article_id), self._page_etag_key(article_id), SEO_STATS_CACHE_KEY)
+        return True
+
+    def get_page(self, article_id):
+        """Vorgerenderte Seite (html/gzip/br/etag).
+
+        Prozesslokal gecacht; die aktuelle ETag im zweistufigen Cache stellt sicher, dass andere
+        Worker nach einem Update neu laden. Artikel ohne vorgerenderte Seite werden einmalig nachgerendert.
+        """
+        etag = tiered_cache.get(self._page_etag_key(article_id))
+        page = self._pages.get(article_id)
+        if page is not None and page["etag"] == etag:
+            return page
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT etag, html, gzip, br FROM seo_article_pages WHERE article_id = ?", (article_id,)
+        ).fetchone()
+        if row is not None:
+            page = dict(row)
+        else:
+            article = self.get(article_id)
+            if article is None:
+                return None
+            with conn:
+                page = self._store_page(conn, article)
+        self._pages.set(article_id, page)
+        tiered_cache.set(self._page_etag_key(article_id), page["etag"], SEO_ARTICLE_CACHE_TTL)
+        return page
+
+    def stats(self):
+        """Anzahl und letzter Änderungszeitpunkt aller Artikel; gecacht und bei add/update invalidiert."""
+        return tiered_cache.get_or_set(SEO_STATS_CACHE_KEY, self._load_stats, SEO_ARTICLE_CACHE_TTL)
+
+    def _load_stats(self):
+        count, last_modified = self._conn().execute(
+            "SELECT COUNT(*), MAX(updated_at) FROM seo_articles"
+        ).fetchone()
+        return {"count": count, "last_modified": last_modified}
+
+    def iter_sitemap_entries(self, offset=0, limit=SITEMAP_MAX_URLS):
+        """Liefert (id, updated_at) in Anlagereihenfolge, damit bestehende Sitemap-Shards stabil bleiben."""
+        cur = self._conn().execute(
+            "SELECT id, updated_at FROM seo_articles ORDER BY created_at, id LIMIT ? OFFSET ?", (limit, offset)
+        )
+        for row in cur:
+            yield row["id"], row["updated_at"]
+
+    def latest(self, limit=NEWS_FEED_ITEMS):
+        rows = self._conn().execute(
+            "SELECT id, title, substr(content, 1, 300) AS summary, created_at FROM seo_articles"
+            " ORDER BY created_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def exists(self, article_id):
+        return self._conn().execute("SELECT 1 FROM seo_articles WHERE id = ?", (article_id,)).fetchone() is not None
+
+    def list(self, page=1, per_page=20, keyword=None):
+        """Paginierte Artikelliste (neueste zuerst), optional über den Keyword-Index gefiltert."""
+        conn = self._conn()
+        offset = (page - 1) * per_page
+        cols = "a.id, a.title, a.keywords, a.created_at"
+        if keyword:
+            kw = keyword.strip().lower()
+            total = conn.execute(
+                "SELECT COUNT(*) FROM seo_article_keywords WHERE keyword = ?", (kw,)
+            ).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {cols} FROM seo_article_keywords k JOIN seo_articles a ON a.id = k.article_id"
+                " WHERE k.keyword = ? ORDER BY a.created_at DESC LIMIT ? OFFSET ?",
+                (kw, per_page, offset)
+            ).fetchall()
+        else:
+            total = conn.execute("SELECT COUNT(*) FROM seo_articles").fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {cols} FROM seo_articles a ORDER BY a.created_at DESC LIMIT ? OFFSET ?",
+                (per_page, offset)
+            ).fetchall()
+        return [self._row_to_article(r) for r in rows], total
+
+    def search(self, query, page=1, per_page=20):
+        """Volltextsuche über Titel und Inhalt (FTS5, nach bm25 sortiert)."""
+        terms = [t.replace('"', '""') for t in query.split()]
+        if not terms:
+            return [], 0
+        match = " ".join(f'"{t}"' for t in terms)
+        conn = self._conn()
+        total = conn.execute(
+            "SELECT COUNT(*) FROM seo_articles_fts WHERE seo_articles_fts MATCH ?", (match,)
+        ).fetchone()[0]
+        rows = conn.execute(
+            "SELECT a.id, a.title, a.keywords, a.created_at,"
+            " snippet(seo_articles_fts, 2, '', '', ' … ', 16) AS snippet"
+            " FROM seo_articles_fts f JOIN seo_articles a ON a.id = f.article_id"
+            " WHERE seo_articles_fts MATCH ? ORDER BY bm25(seo_articles_fts) LIMIT ? OFFSET ?",
+            (match, per_page, (page - 1) * per_page)
+        ).fetchall()
+        return [self._row_to_article(r) for r in rows], total
+
+seo_articles = SeoArticleRepository(SEO_DB_PATH)
+
+def get_pagination_args():
+    """Liest page/per_page aus der Query und begrenzt sie auf sinnvolle Werte."""
+    try:
+        page = max(1, int(request.args.get("page", 1)))
+        per_page = min(SEO_MAX_PER_PAGE, max(1, int(request.args.get("per_page", 20))))
+    except ValueError:
+        page, per_page = 1, 20
+    return page, per_page
 
 def find_trending_keywords():
     if USE_SIMULATION:
@@ -1213,55 +4034,25 @@ def find_trending_keywords():
 
 def generate_seo_article_for_keyword(keyword):
     logging.info(f"Erstelle SEO-Artikel zu {keyword}")
-    people_ask = [
-        f"Was ist {keyword} genau?",
-        f"Wie nutzt man {keyword} optimal?",
-        f"Was kostet {keyword}? Warum lohnt sich ein Vergleich?"
-    ]
+    people_ask = seo_people_also_ask(keyword)
     prompt = f"Schreibe SEO-optimierten Artikel über '{keyword}' und beantworte folgende Fragen: {people_ask}"
-    genr = generator(prompt, max_length=400, num_return_sequences=1)
+    genr = get_generator()(prompt, max_length=400, num_return_sequences=1)
     content = genr[0]['generated_text']
-    schema_markup = f"""
-    <script type="application/ld+json">
-    {{
-      "@context": "https://schema.org",
-      "@type": "Article",
-      "headline": "Dein Artikel zu {keyword}",
-      "mainEntityOfPage": {{"@type": "WebPage", "@id": "https://deinedomain.de/blog/{keyword.replace(' ', '-').lower()}"}},
-      "author": "Deine Website",
-      "datePublished": "{datetime.now().isoformat()}",
-      "articleBody": "{content[:150]}..."
-    }}
-    </script>
-    <script type="application/ld+json">
-    {{
-      "@context": "https://schema.org",
-      "@type": "FAQPage",
-      "mainEntity": [
-        {{"@type": "Question", "name": "{people_ask[0]}", "acceptedAnswer": {{"@type": "Answer", "text": "Antwort im Artikel"}}}},
-        {{"@type": "Question", "name": "{people_ask[1]}", "acceptedAnswer": {{"@type": "Answer", "text": "Antwort im Artikel"}}}}
-      ]
-    }}
-    </script>
-    """
-    art_id = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
-    SEO_ARTICLES_DB[art_id] = {
-        "title": f"Ultimativer Guide zu {keyword}",
-        "content": content,
-        "keywords": [keyword],
-        "schema_markup": schema_markup
-    }
-    return art_id
+    return seo_articles.add(
+        title=f"Ultimativer Guide zu {keyword}",
+        content=content,
+        keywords=[keyword]
+    )
 
 def submit_article_to_google_news(article_id):
     if USE_SIMULATION:
         logging.info(f"(Simuliert) Artikel {article_id} an Google News gemeldet.")
 
 def optimize_for_featured_snippets(article_id):
-    if article_id in SEO_ARTICLES_DB:
+    if seo_articles.exists(article_id):
         logging.info(f"Artikel {article_id} für Featured Snippets optimiert (Simuliert).")
 
-@app.route("/daily_seo_automation", methods=["GET"])
+@seo_bp.route("/daily_seo_automation", methods=["GET"])
 def daily_seo_automation():
     keys = find_trending_keywords()
     created_articles = []
@@ -1276,68 +4067,385 @@ def daily_seo_automation():
         "created_articles": created_articles
     })
 
-@app.route("/view_seo_article/<article_id>", methods=["GET"])
+@seo_bp.route("/seo_articles", methods=["GET"])
+def list_seo_articles():
+    page, per_page = get_pagination_args()
+    keyword = request.args.get("keyword")
+    items, total = seo_articles.list(page, per_page, keyword=keyword)
+    return jsonify({"articles": items, "page": page, "per_page": per_page, "total": total})
+
+@seo_bp.route("/seo_articles/search", methods=["GET"])
+def search_seo_articles():
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Kein Suchbegriff (q)"}), 400
+    page, per_page = get_pagination_args()
+    items, total = seo_articles.search(query, page, per_page)
+    return jsonify({"query": query, "articles": items, "page": page, "per_page": per_page, "total": total})
+
+SEO_TITLE_MAX_LENGTH = 300
+SEO_CONTENT_MAX_LENGTH = 100000
+SEO_MAX_KEYWORDS = 50
+
+def validate_seo_article_update(data):
+    """Prüft den Body von PUT /seo_articles/<id>; liefert (Felder, None) oder (None, Fehlermeldung)."""
+    if not isinstance(data, dict) or not data:
+        return None, "Body muss ein nicht-leeres JSON-Objekt sein"
+    unknown = sorted(set(data) - set(SeoArticleRepository.UPDATABLE_FIELDS))
+    if unknown:
+        return None, f"Nicht änderbare Felder: {', '.join(unknown)}"
+    for name, expected in SeoArticleRepository.UPDATABLE_FIELDS.items():
+        if name in data and not isinstance(data[name], expected):
+            return None, f"{name} muss vom Typ {'Liste' if expected is list else 'Text'} sein"
+    if "title" in data and not 0 < len(data["title"].strip()) <= SEO_TITLE_MAX_LENGTH:
+        return None, f"title muss 1–{SEO_TITLE_MAX_LENGTH} Zeichen lang sein"
+    if "content" in data and len(data["content"]) > SEO_CONTENT_MAX_LENGTH:
+        return None, f"content darf höchstens {SEO_CONTENT_MAX_LENGTH} Zeichen lang sein"
+    keywords = data.get("keywords")
+    if keywords is not None and (
+        len(keywords) > SEO_MAX_KEYWORDS or not all(isinstance(k, str) and k.strip() for k in keywords)
+    ):
+        return None, f"keywords muss eine Liste von höchstens {SEO_MAX_KEYWORDS} nicht-leeren Texten sein"
+    return data, None
+
+@seo_bp.route("/seo_articles/<article_id>", methods=["PUT"])
+@require_admin
+def update_seo_article(article_id):
+    fields, error = validate_seo_article_update(request.get_json(silent=True))
+    if error:
+        return jsonify({"error": error}), 400
+    if not seo_articles.update(article_id, fields):
+        return jsonify({"error": "Artikel nicht gefunden"}), 404
+    return jsonify({"status": "Artikel aktualisiert", "article_id": article_id})
+
+@seo_bp.route("/view_seo_article/<article_id>", methods=["GET"])
 def view_seo_article(article_id):
-    adata = SEO_ARTICLES_DB.get(article_id)
-    if not adata:
+    """Liefert die vorgerenderte Seite in der besten vom Client akzeptierten Kodierung (br, gzip, identity)."""
+    page = seo_articles.get_page(article_id)
+    if page is None:
         return jsonify({"error": "Artikel nicht gefunden"}), 404
-    html = f"""
-    <html>
-      <head>
-        <title>{adata["title"]}</title>
-        {adata["schema_markup"]}
-      </head>
-      <body>
-        <h1>{adata["title"]}</h1>
-        <p>{adata["content"]}</p>
-        <p style="color:green">Keywords: {", ".join(adata["keywords"])}</p>
-      </body>
-    </html>
-    """
-    return render_template_string(html)
+    encoding = request.accept_encodings.best_match([e for e in ("br", "gzip") if page.get(e)])
+    etag = f"{page['etag']}-{encoding}" if encoding else page["etag"]
+    # Die Kompressions-Middleware entfernt Kodierungssuffixe aus If-None-Match, daher beide Formen prüfen
+    if request.if_none_match.contains(etag) or request.if_none_match.contains(page["etag"]):
+        resp = app.response_class(status=304)
+    else:
+        resp = app.response_class(page[encoding] if encoding else page["html"], mimetype="text/html")
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+    resp.set_etag(etag)
+    resp.vary.add("Accept-Encoding")
+    resp.cache_control.public = True
+    resp.cache_control.max_age = SEO_PAGE_MAX_AGE
+    return resp
+
+def seo_article_url(article_id):
+    return f"{SITE_BASE_URL}/view_seo_article/{article_id}"
+
+def parse_local_timestamp(value):
+    """ISO-Zeitstempel (lokale Zeit, wie in der Datenbank gespeichert) -> zeitzonenbehaftetes datetime."""
+    return datetime.fromisoformat(value).astimezone()
+
+def buffered(lines, size=500):
+    """Fasst viele kleine Zeilen zu größeren Chunks zusammen, damit der Stream nicht pro Zeile schreibt."""
+    buf = []
+    for line in lines:
+        buf.append(line)
+        if len(buf) >= size:
+            yield "".join(buf)
+            buf = []
+    if buf:
+        yield "".join(buf)
+
+def seo_xml_response(variant, mimetype, render):
+    """Streamt ein XML-Dokument; ETag und Last-Modified kommen aus dem günstigen Artikel-Aggregat
+    (Anzahl, MAX(updated_at)), sodass Crawler bei unverändertem Bestand nur ein 304 bekommen."""
+    stats = seo_articles.stats()
+    etag = hashlib.sha1(f"{variant}:{stats['count']}:{stats['last_modified']}".encode("utf-8")).hexdigest()
+    last_modified = parse_local_timestamp(stats["last_modified"]) if stats["last_modified"] else None
+    not_modified = request.if_none_match.contains(etag) or (
+        not request.if_none_match and last_modified is not None and request.if_modified_since is not None
+        and last_modified.replace(microsecond=0) <= request.if_modified_since
+    )
+    if not_modified:
+        resp = app.response_class(status=304)
+    else:
+        resp = app.response_class(stream_with_context(buffered(render(stats))), mimetype=mimetype)
+    resp.set_etag(etag)
+    if last_modified is not None:
+        resp.last_modified = last_modified
+    resp.cache_control.public = True
+    resp.cache_control.max_age = SEO_PAGE_MAX_AGE
+    return resp
+
+def iter_sitemap_urlset(shard):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for article_id, updated_at in seo_articles.iter_sitemap_entries(shard * SITEMAP_MAX_URLS):
+        yield f"<url><loc>{xml_escape(seo_article_url(article_id))}</loc><lastmod>{updated_at[:10]}</lastmod></url>\n"
+    yield "</urlset>\n"
+
+def iter_sitemap_index(stats):
+    shards = -(-stats["count"] // SITEMAP_MAX_URLS)
+    lastmod = stats["last_modified"][:10]
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for shard in range(shards):
+        yield f"<sitemap><loc>{SITE_BASE_URL}/sitemaps/sitemap-{shard}.xml</loc><lastmod>{lastmod}</lastmod></sitemap>\n"
+    yield "</sitemapindex>\n"
+
+@seo_bp.route("/sitemap.xml", methods=["GET"])
+def sitemap_xml():
+    """Bis SITEMAP_MAX_URLS Artikel eine einzelne Sitemap, darüber ein Sitemap-Index über die Shards."""
+    def render(stats):
+        if stats["count"] <= SITEMAP_MAX_URLS:
+            return iter_sitemap_urlset(0)
+        return iter_sitemap_index(stats)
+    return seo_xml_response("sitemap", "application/xml", render)
+
+@seo_bp.route("/sitemaps/sitemap-<int:shard>.xml", methods=["GET"])
+def sitemap_shard_xml(shard):
+    if shard * SITEMAP_MAX_URLS >= max(1, seo_articles.stats()["count"]):
+        return jsonify({"error": "Sitemap nicht gefunden"}), 404
+    return seo_xml_response(f"sitemap-{shard}", "application/xml", lambda stats: iter_sitemap_urlset(shard))
+
+def iter_news_feed(stats):
+    build_date = format_datetime(parse_local_timestamp(stats["last_modified"])) if stats["last_modified"] else ""
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>\n'
+        f"<title>Neueste Artikel</title><link>{SITE_BASE_URL}/</link>"
+        f"<description>Neue SEO-Artikel</description><lastBuildDate>{build_date}</lastBuildDate>\n"
+    )
+    for article in seo_articles.latest(NEWS_FEED_ITEMS):
+        url = xml_escape(seo_article_url(article["id"]))
+        yield (
+            f"<item><title>{xml_escape(article['title'])}</title><link>{url}</link>"
+            f'<guid isPermaLink="true">{url}</guid>'
+            f"<pubDate>{format_datetime(parse_local_timestamp(article['created_at']))}</pubDate>"
+            f"<description>{xml_escape(article['summary'])}</description></item>\n"
+        )
+    yield "</channel></rss>\n"
+
+@seo_bp.route("/news.xml", methods=["GET"])
+def news_feed_xml():
+    return seo_xml_response("news", "application/rss+xml", iter_news_feed)
 
 ##############################################################################
 # 21. VIP-/Level-System
 ##############################################################################
-VIP_DATA = {}
+VIP_POINTS_PER_LEVEL = 100
+VIP_STORE_BACKEND = os.getenv("VIP_STORE_BACKEND", "redis")   # "redis" oder "memory" (nur Entwicklung)
+VIP_LEDGER_KEY = os.getenv("VIP_LEDGER_KEY", "vip:points")
+VIP_DISCOUNT_CACHE_TTL = 300
+
+def vip_discount_cache_key(user_email):
+    return f"vip_discount:{user_email}"
+
+def vip_status_from_total(total):
+    """Leitet Level und Restpunkte arithmetisch aus der Gesamtpunktzahl ab."""
+    level, points = divmod(max(int(total), 0), VIP_POINTS_PER_LEVEL)
+    return {"points": points, "vip_level": level}
+
+class RedisVipLedger:
+    """VIP-Punkte als Redis-Hash (Feld = E-Mail, Wert = Gesamtpunkte).
+
+    Gutschriften laufen per HINCRBY atomar und zusammen mit der Cache-Invalidierung in einem Round Trip.
+    """
+
+    def __init__(self, client, key):
+        self.redis = client
+        self.key = key
+
+    def total(self, user_email):
+        return int(self.redis.hget(self.key, user_email) or 0)
+
+    def add(self, user_email, amount):
+        with self.redis.pipeline() as pipe:
+            pipe.hincrby(self.key, user_email, amount)
+            tiered_cache.queue_delete(pipe, vip_discount_cache_key(user_email))
+            return int(pipe.execute()[0])
+
+    def add_many(self, items):
+        """Bucht viele (E-Mail, Punkte)-Paare in einer MULTI/EXEC-Pipeline und liefert die neuen Gesamtstände."""
+        with self.redis.pipeline() as pipe:
+            for user_email, amount in items:
+                pipe.hincrby(self.key, user_email, amount)
+            tiered_cache.queue_delete(pipe, *{vip_discount_cache_key(e) for e, _ in items})
+            return [int(t) for t in pipe.execute()[:len(items)]]
+
+class MemoryVipLedger:
+    """Prozesslokaler Ledger für Entwicklung/Tests – nicht persistent und nicht zwischen Workern geteilt."""
+
+    def __init__(self):
+        self._totals = {}
+        self._lock = Lock()
+
+    def total(self, user_email):
+        return self._totals.get(user_email, 0)
+
+    def add(self, user_email, amount):
+        with self._lock:
+            self._totals[user_email] = self._totals.get(user_email, 0) + amount
+            total = self._totals[user_email]
+        tiered_cache.delete(vip_discount_cache_key(user_email))
+        return total
+
+    def add_many(self, items):
+        totals = []
+        with self._lock:
+            for user_email, amount in items:
+                self._totals[user_email] = self._totals.get(user_email, 0) + amount
+                totals.append(self._totals[user_email])
+        tiered_cache.delete(*{vip_discount_cache_key(e) for e, _ in items})
+        return totals
+
+vip_ledger = RedisVipLedger(redis_cache, VIP_LEDGER_KEY) if VIP_STORE_BACKEND == "redis" else MemoryVipLedger()
 
 def get_vip_info(user_email):
-    if user_email not in VIP_DATA:
-        VIP_DATA[user_email] = {"points": 0, "vip_level": 0}
-    return VIP_DATA[user_email]
+    return vip_status_from_total(vip_ledger.total(user_email))
 
 def add_vip_points(user_email, amount=10):
-    info = get_vip_info(user_email)
-    info["points"] += amount
-    while info["points"] >= 100:
-        info["vip_level"] += 1
-        info["points"] -= 100
-    return info
+    return vip_status_from_total(vip_ledger.add(user_email, int(amount)))
 
 def get_dynamic_vip_discount(user_email):
-    info = get_vip_info(user_email)
-    return info["vip_level"] * 5
+    return tiered_cache.get_or_set(
+        vip_discount_cache_key(user_email),
+        lambda: get_vip_info(user_email)["vip_level"] * 5,
+        ttl=VIP_DISCOUNT_CACHE_TTL
+    )
 
-@app.route("/vip_status", methods=["GET"])
+@shop_bp.route("/vip_status", methods=["GET"])
 def vip_status():
     user_email = request.args.get("email", "unknown@domain.com")
     info = get_vip_info(user_email)
     return jsonify(info)
 
-@app.route("/add_vip_points", methods=["POST"])
+@shop_bp.route("/add_vip_points", methods=["POST"])
 def add_vip_points_endpoint():
     data = request.get_json()
     user_email = data.get("email")
     pts = data.get("points", 10)
     if not user_email:
         return jsonify({"error": "No email provided"}), 400
+    try:
+        pts = int(pts)
+    except (TypeError, ValueError):
+        return jsonify({"error": "points must be an integer"}), 400
     info = add_vip_points(user_email, pts)
     return jsonify({"new_vip_status": info}), 200
 
+VIP_BULK_CHUNK_SIZE = int(os.getenv("VIP_BULK_CHUNK_SIZE", 1000))
+VIP_BULK_MAX_ERRORS = 1000
+VIP_MAX_POINTS_PER_ROW = int(os.getenv("VIP_MAX_POINTS_PER_ROW", 1_000_000))
+
+class VipBulkFormatError(ValueError):
+    """Upload ist kein lesbares UTF-8/CSV; die Verarbeitung bricht an dieser Zeile ab."""
+
+    def __init__(self, line_no, message):
+        super().__init__(message)
+        self.line_no = line_no
+
+def parse_vip_points(value):
+    """Punkte als Ganzzahl; numerische Eingaben wie "3.0" oder 3.0 werden umgewandelt (Nachkommastellen abgeschnitten)."""
+    if value is None or isinstance(value, bool):
+        raise ValueError(f"points ungültig: {value!r}")
+    number = float(value)
+    if not math.isfinite(number) or abs(number) > VIP_MAX_POINTS_PER_ROW:
+        raise ValueError(f"points außerhalb von ±{VIP_MAX_POINTS_PER_ROW}: {value!r}")
+    return int(number)
+
+def iter_vip_bulk_rows(stream, fmt):
+    """Liest (Zeilennummer, E-Mail, Punkte) zeilenweise aus einem NDJSON- oder CSV-Stream.
+
+    Fehlerhafte Zeilen werden als (Zeilennummer, None, Fehlermeldung) geliefert; nicht dekodierbare
+    oder kaputte CSV-Daten lösen VipBulkFormatError aus.
+    """
+    lines = (raw.decode("utf-8-sig") for raw in stream)
+    rows = csv.reader(lines, strict=True) if fmt == "csv" else lines
+    line_no = 0
+    while True:
+        line_no += 1
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise VipBulkFormatError(line_no, f"Datei nicht lesbar (UTF-8-{fmt.upper()} erwartet): {e}")
+        try:
+            if fmt == "csv":
+                if not row or (line_no == 1 and row[0].strip().lower() == "email"):
+                    continue
+                email, pts = row[0].strip(), row[1]
+            else:
+                if not row.strip():
+                    continue
+                obj = json.loads(row)
+                email, pts = obj.get("email"), obj.get("points")
+            if not email:
+                raise ValueError("email fehlt")
+            yield line_no, email, parse_vip_points(pts)
+        except (ValueError, TypeError, IndexError, AttributeError) as e:
+            yield line_no, None, f"Ungültige Zeile: {e}"
+
+def apply_vip_points_chunk(chunk):
+    """Bucht einen Chunk gebündelt und berechnet Level/Restpunkte vektorisiert."""
+    import numpy as np
+    totals = np.asarray(vip_ledger.add_many(chunk), dtype=np.int64)
+    return np.divmod(np.maximum(totals, 0), VIP_POINTS_PER_LEVEL)
+
+@shop_bp.route("/add_vip_points/bulk", methods=["POST"])
+def add_vip_points_bulk_endpoint():
+    """Massen-Gutschrift: NDJSON ({"email", "points"} je Zeile) oder CSV (email,points) als Stream.
+
+    Ungültige Zeilen landen in `errors`; ist die Datei selbst nicht lesbar (kein UTF-8, kaputtes CSV),
+    wird an dieser Stelle mit 400 abgebrochen – bis dahin gültige Zeilen sind bereits gebucht.
+    """
+    fmt = "csv" if request.mimetype == "text/csv" or request.args.get("format") == "csv" else "ndjson"
+    started = time.perf_counter()
+    summary = {"processed": 0, "applied": 0, "failed": 0, "vip_level_users": 0, "errors": []}
+
+    def record_error(line_no, message):
+        summary["failed"] += 1
+        if len(summary["errors"]) < VIP_BULK_MAX_ERRORS:
+            summary["errors"].append({"line": line_no, "error": message})
+
+    def flush(chunk, line_numbers):
+        try:
+            levels, _ = apply_vip_points_chunk(chunk)
+            summary["applied"] += len(chunk)
+            summary["vip_level_users"] += int((levels > 0).sum())
+        except redis.RedisError as e:
+            logging.error(f"VIP-Bulk: Chunk fehlgeschlagen: {e}")
+            for line_no in line_numbers:
+                record_error(line_no, f"Speicherfehler: {e}")
+
+    status = 200
+    chunk, line_numbers = [], []
+    try:
+        for line_no, email, value in iter_vip_bulk_rows(request.stream, fmt):
+            summary["processed"] += 1
+            if email is None:
+                record_error(line_no, value)
+                continue
+            chunk.append((email, value))
+            line_numbers.append(line_no)
+            if len(chunk) >= VIP_BULK_CHUNK_SIZE:
+                flush(chunk, line_numbers)
+                chunk, line_numbers = [], []
+    except VipBulkFormatError as e:
+        record_error(e.line_no, str(e))
+        summary["error"] = str(e)
+        status = 400
+    if chunk:
+        flush(chunk, line_numbers)
+
+    summary["errors_truncated"] = summary["failed"] > len(summary["errors"])
+    summary["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logging.info(f"VIP-Bulk: {summary['applied']} gebucht, {summary['failed']} fehlerhaft.")
+    return jsonify(summary), status
+
 ##############################################################################
 # 22. Neue Endpoints: Virale Posts, Wikipedia-Backlinks, Reddit, etc.
 ##############################################################################
-@app.route("/viral_posts", methods=["POST"])
+@marketing_bp.route("/viral_posts", methods=["POST"])
 def viral_posts():
     data = request.get_json()
     topic = data.get("topic", "Trending Topic")
@@ -1345,7 +4453,7 @@ def viral_posts():
         logging.info(f"(Simuliert) KI erstellt viralen Post über '{topic}' zur Peak-Zeit.")
     return jsonify({"status": f"Viraler Post zum Thema '{topic}' erstellt."})
 
-@app.route("/community_interaction", methods=["POST"])
+@marketing_bp.route("/community_interaction", methods=["POST"])
 def community_interaction():
     data = request.get_json()
     platform = data.get("platform", "twitter")
@@ -1353,7 +4461,7 @@ def community_interaction():
         logging.info(f"(Simuliert) Bot kommentiert & antwortet auf {platform}")
     return jsonify({"status": f"Community-Interaktion auf {platform} ausgeführt."})
 
-@app.route("/create_thread", methods=["POST"])
+@marketing_bp.route("/create_thread", methods=["POST"])
 def create_thread():
     data = request.get_json()
     platform = data.get("platform", "twitter")
@@ -1362,7 +4470,7 @@ def create_thread():
         logging.info(f"(Simuliert) Thread '{thread_title}' auf {platform} gepostet.")
     return jsonify({"status": f"Thread '{thread_title}' auf {platform} gepostet."})
 
-@app.route("/pinterest_optimization", methods=["POST"])
+@marketing_bp.route("/pinterest_optimization", methods=["POST"])
 def pinterest_optimization():
     data = request.get_json()
     article_url = data.get("article_url", "https://deinedomain.de/blog/artikel")
@@ -1370,7 +4478,7 @@ def pinterest_optimization():
         logging.info(f"(Simuliert) Pinterest SEO & Gruppenboards für {article_url}.")
     return jsonify({"status": f"Pinterest-Optimierung für {article_url}"})
 
-@app.route("/instagram_stories", methods=["POST"])
+@marketing_bp.route("/instagram_stories", methods=["POST"])
 def instagram_stories():
     data = request.get_json()
     article_url = data.get("article_url", "https://deinedomain.de/blog/artikel")
@@ -1378,7 +4486,7 @@ def instagram_stories():
         logging.info(f"(Simuliert) IG Stories & Reels aus {article_url} generiert.")
     return jsonify({"status": f"IG Stories/Reels erstellt zu {article_url}"})
 
-@app.route("/youtube_video_optimization", methods=["POST"])
+@marketing_bp.route("/youtube_video_optimization", methods=["POST"])
 def youtube_video_optimization():
     data = request.get_json()
     video_url = data.get("video_url", "https://youtube.com/watch?v=123")
@@ -1386,7 +4494,7 @@ def youtube_video_optimization():
         logging.info(f"(Simuliert) YouTube SEO (Keywords/Hashtags) für {video_url}.")
     return jsonify({"status": f"YouTube-Optimierung für {video_url} abgeschlossen"})
 
-@app.route("/backlink_outreach", methods=["POST"])
+@marketing_bp.route("/backlink_outreach", methods=["POST"])
 def backlink_outreach():
     data = request.get_json()
     site_url = data.get("site_url", "https://deinedomain.de")
@@ -1394,7 +4502,7 @@ def backlink_outreach():
         logging.info(f"(Simuliert) KI analysiert & sendet Outreach für {site_url}.")
     return jsonify({"status": f"Backlink-Outreach für {site_url} gestartet"})
 
-@app.route("/press_release", methods=["POST"])
+@marketing_bp.route("/press_release", methods=["POST"])
 def press_release():
     data = request.get_json()
     release_title = data.get("title", "Pressemitteilung: Neuer Meilenstein")
@@ -1402,7 +4510,7 @@ def press_release():
         logging.info(f"(Simuliert) Pressemitteilung '{release_title}' verfasst & verteilt.")
     return jsonify({"status": f"Pressemitteilung '{release_title}' verteilt."})
 
-@app.route("/wikipedia_forums", methods=["POST"])
+@marketing_bp.route("/wikipedia_forums", methods=["POST"])
 def wikipedia_forums():
     data = request.get_json()
     page_topic = data.get("topic", "Beispielthema")
@@ -1410,13 +4518,13 @@ def wikipedia_forums():
         logging.info(f"(Simuliert) Wikipedia-Eintrag & Foren-Kommentare zu '{page_topic}'.")
     return jsonify({"status": f"Wikipedia/Foren-Links zu '{page_topic}' generiert."})
 
-@app.route("/auto_newsletter", methods=["GET"])
+@marketing_bp.route("/auto_newsletter", methods=["GET"])
 def auto_newsletter():
     if USE_SIMULATION:
         logging.info("(Simuliert) Wöchentlicher Newsletter mit Top-Artikeln generiert.")
     return jsonify({"status": "Wöchentlicher Newsletter versendet."})
 
-@app.route("/messenger_newsletter", methods=["POST"])
+@marketing_bp.route("/messenger_newsletter", methods=["POST"])
 def messenger_newsletter():
     data = request.get_json()
     messenger_type = data.get("messenger", "whatsapp")
@@ -1424,7 +4532,7 @@ def messenger_newsletter():
         logging.info(f"(Simuliert) {messenger_type}-Newsletter gesendet.")
     return jsonify({"status": f"Messenger-Newsletter via {messenger_type} gesendet"})
 
-@app.route("/email_surveys", methods=["POST"])
+@marketing_bp.route("/email_surveys", methods=["POST"])
 def email_surveys():
     data = request.get_json()
     survey_topic = data.get("topic", "Zufriedenheit")
@@ -1432,7 +4540,7 @@ def email_surveys():
         logging.info(f"(Simuliert) E-Mail-Umfrage '{survey_topic}' versendet.")
     return jsonify({"status": f"E-Mail-Umfrage zu '{survey_topic}' verschickt."})
 
-@app.route("/youtube_community", methods=["POST"])
+@marketing_bp.route("/youtube_community", methods=["POST"])
 def youtube_community():
     data = request.get_json()
     comm_msg = data.get("message", "Hey Community!")
@@ -1440,7 +4548,7 @@ def youtube_community():
         logging.info(f"(Simuliert) YouTube-Community-Post & Shorts: {comm_msg}")
     return jsonify({"status": "YouTube Community & Shorts abgesetzt"})
 
-@app.route("/tiktok_duet_stitch", methods=["POST"])
+@marketing_bp.route("/tiktok_duet_stitch", methods=["POST"])
 def tiktok_duet_stitch():
     data = request.get_json()
     target_video = data.get("video_url", "https://tiktok.com/@user/video/123")
@@ -1456,11 +4564,13 @@ HIGH_TICKET_OFFERS = [
     {"id": "HT2", "title": "VIP-Betreuung (5.000 €)", "price": 5000}
 ]
 
-@app.route("/list_high_ticket", methods=["GET"])
+@shop_bp.route("/list_high_ticket", methods=["GET"])
+@cached_response(ttl=3600)
 def list_high_ticket():
     return jsonify({"offers": HIGH_TICKET_OFFERS})
 
-@app.route("/monthly_subscriptions", methods=["GET"])
+@shop_bp.route("/monthly_subscriptions", methods=["GET"])
+@cached_response(ttl=3600)
 def monthly_subscriptions():
     plans = [
         {"id": "Sub1", "desc": "VIP Light (29 €/Monat)"},
@@ -1469,7 +4579,7 @@ def monthly_subscriptions():
     ]
     return jsonify({"plans": plans})
 
-@app.route("/monetize_youtube_tiktok", methods=["POST"])
+@shop_bp.route("/monetize_youtube_tiktok", methods=["POST"])
 def monetize_youtube_tiktok():
     data = request.get_json()
     platform = data.get("platform", "youtube")
@@ -1480,7 +4590,7 @@ def monetize_youtube_tiktok():
 ##############################################################################
 # 24. KI-gesteuerte Retargeting & Budget-Optimierung
 ##############################################################################
-@app.route("/retargeting_strategies", methods=["POST"])
+@marketing_bp.route("/retargeting_strategies", methods=["POST"])
 def retargeting_strategies():
     data = request.get_json()
     campaign_name = data.get("campaign", "retargeting1")
@@ -1488,7 +4598,7 @@ def retargeting_strategies():
         logging.info(f"(Simuliert) KI-Retargeting '{campaign_name}' gestartet.")
     return jsonify({"status": f"Retargeting '{campaign_name}' aktiv"})
 
-@app.route("/auto_budget_optimization", methods=["POST"])
+@marketing_bp.route("/auto_budget_optimization", methods=["POST"])
 def auto_budget_optimization():
     data = request.get_json()
     campaign_id = data.get("campaign_id", "XYZ123")
@@ -1499,7 +4609,7 @@ def auto_budget_optimization():
 ##############################################################################
 # 25. Automatisierte Influencer-Koop & Multi-Channel Werbung
 ##############################################################################
-@app.route("/auto_influencer_coop", methods=["POST"])
+@marketing_bp.route("/auto_influencer_coop", methods=["POST"])
 def auto_influencer_coop():
     data = request.get_json()
     niche = data.get("niche", "fitness")
@@ -1507,7 +4617,7 @@ def auto_influencer_coop():
         logging.info(f"(Simuliert) Bot findet & kontaktiert Influencer in '{niche}'.")
     return jsonify({"status": f"Influencer-Kooperationen in '{niche}' automatisiert"})
 
-@app.route("/multichannel_ads", methods=["POST"])
+@marketing_bp.route("/multichannel_ads", methods=["POST"])
 def multichannel_ads():
     data = request.get_json()
     channels = data.get("channels", ["youtube", "pinterest", "twitter"])
@@ -1518,7 +4628,7 @@ def multichannel_ads():
 ##############################################################################
 # 26. KI-überwachter Betrugsschutz & Selbstlernende Firewall
 ##############################################################################
-@app.route("/advanced_affiliate_protection", methods=["POST"])
+@admin_bp.route("/advanced_affiliate_protection", methods=["POST"])
 def advanced_affiliate_protection():
     data = request.get_json()
     aff_id = data.get("affiliate_id", "unknown")
@@ -1526,7 +4636,7 @@ def advanced_affiliate_protection():
         logging.info(f"(Simuliert) KI scannt Transaktionen für {aff_id}, blockiert Betrug.")
     return jsonify({"status": f"Fortgeschrittener Betrugsschutz für {aff_id}"})
 
-@app.route("/self_learning_firewall", methods=["POST"])
+@admin_bp.route("/self_learning_firewall", methods=["POST"])
 def self_learning_firewall():
     data = request.get_json()
     threat_level = data.get("threat_level", 5)
@@ -1537,19 +4647,23 @@ def self_learning_firewall():
 ##############################################################################
 # 27. Neue Endpoints gemäß Benutzeranforderungen (zusätzliche Features)
 ##############################################################################
-@app.route("/multi_language_content", methods=["GET"])
+MULTI_LANGUAGE_CONTENT = {
+    "en": {"headline": "Welcome to our site!", "text": "Enjoy international content."},
+    "es": {"headline": "¡Bienvenido a nuestro sitio!", "text": "Disfruta de contenido internacional."},
+    "fr": {"headline": "Bienvenue sur notre site!", "text": "Profitez d'un contenu international."}
+}
+
+page_templates.register("multi_language_content", "<h1>{{ headline }}</h1><p>{{ text }}</p>")
+
+@shop_bp.route("/multi_language_content", methods=["GET"])
+@cached_response(ttl=3600, vary_args=("lang",))
 def multi_language_content():
     lang = request.args.get("lang", "en").lower()
-    content = {
-        "en": "<h1>Welcome to our site!</h1><p>Enjoy international content.</p>",
-        "es": "<h1>¡Bienvenido a nuestro sitio!</h1><p>Disfruta de contenido internacional.</p>",
-        "fr": "<h1>Bienvenue sur notre site!</h1><p>Profitez d'un contenu international.</p>"
-    }
-    result = content.get(lang, content["en"])
+    result = MULTI_LANGUAGE_CONTENT.get(lang, MULTI_LANGUAGE_CONTENT["en"])
     logging.info(f"Multi-language content served for language: {lang}")
-    return render_template_string(result)
+    return page_templates.render("multi_language_content", **result)
 
-@app.route("/auto_backlink", methods=["GET"])
+@seo_bp.route("/auto_backlink", methods=["GET"])
 def auto_backlink():
     backlink_list = [
         "https://example.com/backlink1",
@@ -1559,7 +4673,7 @@ def auto_backlink():
     logging.info("Automatische Backlink-Erstellung getriggert. Backlinks: " + ", ".join(backlink_list))
     return jsonify({"status": "Backlinks erstellt", "backlinks": backlink_list})
 
-@app.route("/generate_social_media_content", methods=["GET"])
+@marketing_bp.route("/generate_social_media_content", methods=["GET"])
 def generate_social_media_content():
     tiktok_url = "https://tiktok.com/@generatedvideo/" + ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
     youtube_short_url = "https://youtube.com/shorts/" + ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
@@ -1570,12 +4684,12 @@ def generate_social_media_content():
         "youtube_short": youtube_short_url
     })
 
-@app.route("/cloudflare_protection", methods=["GET"])
+@admin_bp.route("/cloudflare_protection", methods=["GET"])
 def cloudflare_protection():
     logging.info("Cloudflare-Schutz getriggert. Firewall-Regeln wurden aktualisiert.")
     return jsonify({"status": "Cloudflare-Firewall-Regeln aktualisiert", "message": "Bot-Angriffe erfolgreich gemindert"})
 
-@app.route("/ab_test_variants", methods=["GET"])
+@marketing_bp.route("/ab_test_variants", methods=["GET"])
 def ab_test_variants():
     variant_headline = get_random_headline()
     variant_cta = get_random_cta()
@@ -1593,6 +4707,32 @@ def ab_test_variants():
 # 29. Zusätzliche Features: Logging, Heatmap-Analyse, KI-Optimierung & Performance
 ##############################################################################
 # Matomo-Integration: Sende Tracking-Events an einen Matomo-Server (selbst gehostet)
+def post_matomo_bulk(payloads):
+    """Sendet Matomo-Events über die Bulk-Tracking-API in einem Request; wirft bei HTTP-Fehlern."""
+    data = {
+        "requests": ["?" + urlencode(p) for p in payloads],
+        "token_auth": MATOMO_TOKEN
+    }
+    response = http_client.post("matomo", MATOMO_URL + '/matomo.php', json=data)
+    response.raise_for_status()
+    logging.info(f"Matomo-Bulk ({len(payloads)} Events) gesendet: {response.status_code}")
+
+def flush_matomo_events(payloads):
+    """Bus-Sink: sendet direkt; scheitert der Bulk-Request, gehen die Events mit Retry über die Outbox."""
+    try:
+        post_matomo_bulk(payloads)
+    except Exception as e:
+        logging.warning(f"Matomo-Bulk fehlgeschlagen, {len(payloads)} Events gehen an die Outbox: {e}")
+        outbox.enqueue_many("matomo", [(f"matomo:{p['rand']}", p) for p in payloads])
+
+analytics_bus.register_sink("matomo", flush_matomo_events)
+
+def _outbox_send_matomo(payloads):
+    post_matomo_bulk(payloads)
+    return [None] * len(payloads)
+
+outbox.register_handler("matomo", _outbox_send_matomo, batch=True)
+
 def send_matomo_event(event_category, event_action, event_name, event_value=None):
     if MATOMO_URL and MATOMO_SITE_ID and MATOMO_TOKEN:
         payload = {
@@ -1603,17 +4743,13 @@ def send_matomo_event(event_category, event_action, event_name, event_value=None
             'e_a': event_action,
             'e_n': event_name,
             'e_v': event_value if event_value else '',
-            'token_auth': MATOMO_TOKEN,
+            'rand': uuid.uuid4().hex,  # Cache-Buster, dient zugleich als Idempotency-Key in der Outbox
         }
-        try:
-            response = requests.get(MATOMO_URL + '/matomo.php', params=payload)
-            logging.info(f"Matomo event sent: {response.status_code}")
-        except Exception as e:
-            logging.error(f"Error sending Matomo event: {e}")
+        analytics_bus.publish("matomo", payload)
     else:
         logging.info("Matomo nicht konfiguriert. Tracking wird übersprungen.")
 
-@app.route("/matomo_track", methods=["POST"])
+@marketing_bp.route("/matomo_track", methods=["POST"])
 def matomo_track():
     data = request.get_json()
     event_category = data.get("category", "General")
@@ -1624,9 +4760,7 @@ def matomo_track():
     return jsonify({"status": "Matomo event tracked"})
 
 # Heatmap.js Integration: Liefere ein HTML-Snippet, das Heatmap.js lädt und initialisiert
-@app.route("/heatmap_script", methods=["GET"])
-def heatmap_script():
-    script = """
+page_templates.register("heatmap_script", """
     <script src="https://unpkg.com/heatmap.js@2.0.5/heatmap.min.js"></script>
     <script>
     var heatmapInstance = h337.create({
@@ -1640,11 +4774,14 @@ def heatmap_script():
       heatmapInstance.addData({ x: e.pageX, y: e.pageY, value: 1 });
     });
     </script>
-    """
-    return render_template_string(script)
+""")
+
+@marketing_bp.route("/heatmap_script", methods=["GET"])
+def heatmap_script():
+    return page_templates.render("heatmap_script")
 
 # KI-Modelle optimieren: Beispiel-Endpoint zur Analyse von Nutzerdaten mit einem Dummy-Scikit-Learn-Modell
-@app.route("/optimize_ki", methods=["POST"])
+@ai_bp.route("/optimize_ki", methods=["POST"])
 def optimize_ki():
     data = request.get_json()
     user_text = data.get("user_text", "")
@@ -1656,7 +4793,7 @@ def optimize_ki():
     return jsonify({"analysis": analysis_result})
 
 # Performance-Boost: Liefere einige Leistungsinformationen (z.B. Redis-Cache-Info)
-@app.route("/performance_info", methods=["GET"])
+@core_bp.route("/performance_info", methods=["GET"])
 def performance_info():
     try:
         redis_info = redis_cache.info()
@@ -1664,28 +4801,57 @@ def performance_info():
         redis_info = {"error": str(e)}
     return jsonify({
         "status": "Performance info",
-        "redis_info": redis_info
+        "redis_info": redis_info,
+        "cache_stats": tiered_cache.stats(),
+        "outbound_http": http_client.metrics(),
+        "analytics_bus": analytics_bus.stats(),
+        "notifications": notification_dispatcher.stats(),
+        "outbox": outbox.stats(),
+        "worker_role": WORKER_ROLE,
+        "worker_features": sorted(WORKER_FEATURES)
     })
 
 ##############################################################################
 # 30. Erweiterte Features: Visuelle Analytics, Übersetzung & kombinierte Conversion-Daten
 ##############################################################################
 # Admin-Dashboard: Einbetten des Matomo-Dashboards
-@app.route("/admin/matomo_dashboard", methods=["GET"])
-def matomo_dashboard():
-    html = f"""
+page_templates.register("matomo_dashboard", """
     <html>
       <head><title>Matomo Dashboard</title></head>
       <body>
         <h1>Matomo Dashboard</h1>
-        <iframe src="{MATOMO_DASHBOARD_URL}" width="100%" height="800px" frameborder="0"></iframe>
+        <iframe src="{{ dashboard_url }}" width="100%" height="800px" frameborder="0"></iframe>
       </body>
     </html>
+""")
+
+@admin_bp.route("/admin/matomo_dashboard", methods=["GET"])
+def matomo_dashboard():
+    return page_templates.render("matomo_dashboard", dashboard_url=MATOMO_DASHBOARD_URL)
+
+_translators = {}
+_translator_locks = {}
+_translators_lock = Lock()
+
+def get_translator(model_name):
+    """Übersetzungs-Pipeline je Modell, einmal geladen und danach wiederverwendet.
+
+    Geladen wird unter einem Lock je Modell; der globale Lock schützt nur das Anlegen dieser Locks,
+    sodass ein langsamer Modell-Load andere Modelle und bereits geladene Pipelines nicht blockiert.
     """
-    return render_template_string(html)
+    translator = _translators.get(model_name)
+    if translator is not None:
+        return translator
+    with _translators_lock:
+        model_lock = _translator_locks.setdefault(model_name, Lock())
+    with model_lock:
+        if model_name not in _translators:
+            from transformers import pipeline
+            _translators[model_name] = pipeline("translation", model=model_name)
+        return _translators[model_name]
 
 # Übersetzungs-Endpoint: Automatisierte Übersetzung von Texten mithilfe eines Open-Source-Modells
-@app.route("/translate_text", methods=["POST"])
+@ai_bp.route("/translate_text", methods=["POST"])
 def translate_text():
     data = request.get_json()
     text = data.get("text", "")
@@ -1695,7 +4861,7 @@ def translate_text():
         return jsonify({"error": "No text provided"}), 400
     model_name = f"Helsinki-NLP/opus-mt-{source_lang}-{target_lang}"
     try:
-        translator = pipeline("translation", model=model_name)
+        translator = get_translator(model_name)
         result = translator(text, max_length=512)
         translated_text = result[0]['translation_text']
     except Exception as e:
@@ -1704,7 +4870,7 @@ def translate_text():
     return jsonify({"translated_text": translated_text})
 
 # Erweiterte Conversion Analytics: Kombination von Heatmap-Daten und simulierten Umsatzdaten
-@app.route("/conversion_analytics", methods=["GET"])
+@marketing_bp.route("/conversion_analytics", methods=["GET"])
 def conversion_analytics():
     heatmap = simulate_heatmap_analysis()
     revenue_data = {
@@ -1728,27 +4894,27 @@ def get_postgres_connection():
         port=os.getenv("PG_PORT", "DEIN_PORT")
     )
 
-redis_cache = redis.Redis(
-    host=os.getenv("REDIS_HOST", "localhost"),
-    port=int(os.getenv("REDIS_PORT", 6379)),
-    db=0
-)
-
 def get_data(key):
-    if redis_cache.exists(key):
-        return redis_cache.get(key)
-    data = "DEIN_DATABASE_QUERY"
-    redis_cache.setex(key, 3600, data)
-    return data
+    return tiered_cache.get_or_set(key, lambda: "DEIN_DATABASE_QUERY", ttl=3600)
 
-@app.route("/get_best_keywords", methods=["GET"])
+@seo_bp.route("/get_best_keywords", methods=["GET"])
 def get_best_keywords_endpoint():
     query = request.args.get("query", "beste Affiliate-Produkte 2024")
+    from googleapiclient.discovery import build
     service = build("customsearch", "v1", developerKey=os.getenv("GOOGLE_API_KEY"))
     res = service.cse().list(q=query, cx=os.getenv("GOOGLE_CSE_ID")).execute()
     keywords = [item['title'] for item in res.get('items', [])]
     return jsonify({"best_keywords": keywords})
 
+##############################################################################
+# Registrierung der Feature-Module gemäß WORKER_ROLE
+##############################################################################
+for feature_name in sorted(WORKER_FEATURES):
+    if feature_name not in FEATURE_BLUEPRINTS:
+        raise ValueError(f"Unbekanntes Feature-Modul '{feature_name}' in WORKER_FEATURES")
+    app.register_blueprint(FEATURE_BLUEPRINTS[feature_name])
+logging.info(f"Worker-Rolle '{WORKER_ROLE}': Feature-Module {', '.join(sorted(WORKER_FEATURES))}")
+
 ##############################################################################
 # Main Entry Point: Unterstützt auch den Uvicorn-Server für Performance-Boost
 ##############################################################################
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Benchmarks für die performancekritischen Pfade der App.
+
+Aufruf: python benchmarks.py <benchmark> [Optionen]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import smtplib
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def load_app(vip_backend="memory"):
+    """Importiert die App mit Benchmark-tauglicher Konfiguration (ohne DDoS-Sperre)."""
+    os.environ.setdefault("VIP_STORE_BACKEND", vip_backend)
+    import app as app_module
+    app_module.MAX_REQUESTS_PER_WINDOW = float("inf")
+    return app_module
+
+
+def report(name, count, seconds):
+    print(f"{name:<28} {count:>8} Ops in {seconds:8.3f}s  ->  {count / seconds:10.1f} Ops/s")
+
+
+def bench_vip_bulk(args):
+    """Vergleicht N Einzelaufrufe von /add_vip_points mit einem NDJSON-Upload an /add_vip_points/bulk."""
+    app_module = load_app(args.backend)
+    client = app_module.app.test_client()
+    users = [f"bench{i}@example.com" for i in range(args.users)]
+
+    started = time.perf_counter()
+    for email in users:
+        client.post("/add_vip_points", json={"email": email, "points": 42})
+    report("single /add_vip_points", len(users), time.perf_counter() - started)
+
+    body = "\n".join(json.dumps({"email": email, "points": 42}) for email in users)
+    started = time.perf_counter()
+    resp = client.post("/add_vip_points/bulk", data=body, content_type="application/x-ndjson")
+    report("bulk /add_vip_points/bulk", len(users), time.perf_counter() - started)
+    summary = resp.get_json()
+    print(f"Bulk-Ergebnis: applied={summary['applied']} failed={summary['failed']}")
+
+
+class SmtpSinkHandler(socketserver.StreamRequestHandler):
+    """Minimaler SMTP-Dialog: nimmt alles an und verwirft die Nachrichten."""
+
+    def handle(self):
+        time.sleep(self.server.connect_delay)
+        self.wfile.write(b"220 sink ESMTP\r\n")
+        in_data = False
+        for line in self.rfile:
+            if in_data:
+                if line.rstrip(b"\r\n") == b".":
+                    in_data = False
+                    self.server.record_message()
+                    self.wfile.write(b"250 OK queued\r\n")
+                continue
+            cmd = line[:4].upper()
+            if cmd == b"EHLO":
+                self.wfile.write(b"250-sink\r\n250 8BITMIME\r\n")
+            elif cmd == b"DATA":
+                in_data = True
+                self.wfile.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+            elif cmd == b"QUIT":
+                self.wfile.write(b"221 Bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 OK\r\n")
+
+
+class SmtpSink(socketserver.ThreadingTCPServer):
+    """Lokaler SMTP-Ersatz; connect_delay simuliert die Kosten von Verbindungsaufbau/TLS/Login."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, connect_delay=0.0):
+        super().__init__(("127.0.0.1", 0), SmtpSinkHandler)
+        self.connect_delay = connect_delay
+        self.messages = 0
+        self._lock = threading.Lock()
+
+    def record_message(self):
+        with self._lock:
+            self.messages += 1
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self.server_address
+
+
+def bench_smtp(args):
+    """Vergleicht eine Verbindung pro Nachricht (alter Pfad) mit dem SMTP-Sitzungspool."""
+    app_module = load_app()
+    sink = SmtpSink(connect_delay=args.connect_delay_ms / 1000.0)
+    host, port = sink.start()
+    app_module.USE_SIMULATION = False
+    app_module.SMTP_SERVER, app_module.SMTP_PORT = host, port
+    app_module.SMTP_USE_STARTTLS = False
+    app_module.EMAIL_PASSWORD = None
+    app_module.EMAIL_SENDER = "bench@example.com"
+    emails = [(f"user{i}@example.com", "Benchmark", "Hallo!") for i in range(args.messages)]
+
+    started = time.perf_counter()
+    for recipient, subject, body in emails:
+        with smtplib.SMTP(host, port) as server:
+            server.send_message(app_module.build_email_message(recipient, subject, body))
+    report("Verbindung pro Nachricht", len(emails), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for recipient, subject, body in emails:
+        app_module.send_email_smtp(recipient, subject, body)
+    report("Pool, send_email_smtp", len(emails), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    results = app_module.send_many_emails(emails)
+    report("Pool, send_many_emails", len(emails), time.perf_counter() - started)
+    print(f"Fehler: {sum(1 for r in results if r is not None)}, vom Sink empfangen: {sink.messages}")
+
+
+class ProviderSinkHandler(BaseHTTPRequestHandler):
+    """Beantwortet jede Anfrage wie Sendinblue/FCM/IFTTT/Matomo – mit konfigurierbarer Latenz und Fehlerquote."""
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        time.sleep(max(0.0, random.gauss(self.server.latency, self.server.latency / 4)))
+        failed = random.random() < self.server.error_rate
+        self.server.record(self.path.split("?")[0], failed)
+        body = b'{"error": "injected"}' if failed else b'{"messageId": "sink", "success": 1}'
+        self.send_response(500 if failed else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ProviderSink(ThreadingHTTPServer):
+    """Lokaler HTTP-Ersatz für die Drittanbieter-APIs."""
+
+    daemon_threads = True
+
+    def __init__(self, latency=0.02, error_rate=0.0):
+        super().__init__(("127.0.0.1", 0), ProviderSinkHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, path, failed):
+        with self._lock:
+            ok, errors = self.counts.get(path, (0, 0))
+            self.counts[path] = (ok + (not failed), errors + failed)
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct))]
+
+
+def drive(func, calls, concurrency):
+    """Führt func(i) `calls`-mal mit gegebener Parallelität aus; liefert Dauer und Einzel-Latenzen (ms)."""
+    latencies = []
+
+    def timed(i):
+        started = time.perf_counter()
+        try:
+            func(i)
+        finally:
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, range(calls)))
+    return time.perf_counter() - started, sorted(latencies)
+
+
+def bench_outbound(args):
+    """Lasttest der Versandpfade gegen lokale Stand-ins (SMTP-Sink + HTTP-Sink) mit steigender Parallelität.
+
+    Für FCM und Matomo wird der eigentliche Zustellpfad (deliver_fcm_notification, flush_matomo_events)
+    getrieben, da send_fcm_notification/send_matomo_event nur noch einreihen.
+    """
+    app_module = load_app()
+    logging.getLogger().setLevel(logging.WARNING)
+    smtp_sink = SmtpSink(connect_delay=args.connect_delay_ms / 1000.0)
+    smtp_host, smtp_port = smtp_sink.start()
+    http_sink = ProviderSink(latency=args.latency_ms / 1000.0, error_rate=args.error_rate)
+    base_url = http_sink.start()
+
+    app_module.USE_SIMULATION = False
+    app_module.SMTP_SERVER, app_module.SMTP_PORT = smtp_host, smtp_port
+    app_module.SMTP_USE_STARTTLS = False
+    app_module.EMAIL_PASSWORD = None
+    app_module.EMAIL_SENDER = "load@example.com"
+    app_module.SENDINBLUE_API_KEY = "load-test"
+    app_module.SENDINBLUE_API_URL = base_url + "/v3/smtp/email"
+    app_module.FCM_SERVER_KEY = "load-test"
+    app_module.FCM_API_URL = base_url + "/fcm/send"
+    app_module.MATOMO_URL, app_module.MATOMO_SITE_ID, app_module.MATOMO_TOKEN = base_url, "1", "load-test"
+
+    matomo_payload = {"idsite": "1", "rec": 1, "e_c": "load", "e_a": "test", "e_n": "event"}
+    scenarios = {
+        "send_email_smtp": lambda i: app_module.send_email_smtp(f"user{i}@example.com", "Last", "Test"),
+        "send_sendinblue_email": lambda i: app_module.send_sendinblue_email(
+            f"user{i}@example.com", "Test", ["Last"], "load"),
+        "deliver_fcm_notification": lambda i: app_module.deliver_fcm_notification(f"Test {i}", "Last"),
+        "flush_matomo_events": lambda i: app_module.flush_matomo_events([matomo_payload]),
+    }
+    levels = [int(x) for x in args.levels.split(",")]
+    print(f"{'Szenario':<26} {'Par.':>5} {'Ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, func in scenarios.items():
+        for level in levels:
+            seconds, latencies = drive(func, args.calls, level)
+            print(f"{name:<26} {level:>5} {args.calls / seconds:>10.1f} {percentile(latencies, 0.5):>9.1f}"
+                  f" {percentile(latencies, 0.95):>9.1f} {percentile(latencies, 0.99):>9.1f}")
+    print(f"SMTP-Sink: {smtp_sink.messages} Nachrichten; HTTP-Sink (ok, Fehler): {json.dumps(http_sink.counts)}")
+
+
+def bench_templates(args):
+    """Renderkosten pro Seite: bisheriges f-String + render_template_string gegen die vorkompilierte Registry."""
+    from flask import render_template_string
+
+    app_module = load_app()
+    logging.getLogger().setLevel(logging.WARNING)
+    article = {
+        "title": "Ultimativer Guide zu Benchmarks", "content": "Lorem ipsum " * 200,
+        "keywords": ["Benchmarks", "Jinja"], "created_at": "2025-01-01T00:00:00"
+    }
+    article["schema_markup"] = app_module.build_seo_schema(article)
+
+    def legacy_landing(i):
+        interest = f"Thema {i}"
+        return render_template_string(f"""
+    <html>
+      <head><title>Exklusive Angebote für {interest}</title></head>
+      <body>
+        <h1>Willkommen, {interest}-Enthusiast!</h1>
+        <p>Individuelle Angebote für dein Interesse an {interest}!</p>
+      </body>
+    </html>
+    """)
+
+    def legacy_article(i):
+        return render_template_string(f"""
+    <html>
+      <head>
+        <title>{article["title"]} {i}</title>
+        {"".join(f'<script type="application/ld+json">{json.dumps(s)}</script>' for s in article["schema_markup"])}
+      </head>
+      <body>
+        <h1>{article["title"]}</h1>
+        <p>{article["content"]}</p>
+        <p style="color:green">Keywords: {", ".join(article["keywords"])}</p>
+      </body>
+    </html>
+    """)
+
+    registry = app_module.page_templates
+    scenarios = {
+        "landing_page (f-String)": legacy_landing,
+        "landing_page (Registry)": lambda i: registry.render("landing_page", interest=f"Thema {i}"),
+        "seo_article (f-String)": legacy_article,
+        "seo_article (Registry)": lambda i: registry.render("seo_article", article=dict(article, title=f"{article['title']} {i}")),
+        "social_proof (Registry)": lambda i: registry.render("social_proof", widget=app_module.get_social_proof_html()),
+    }
+    with app_module.app.test_request_context():
+        for name, func in scenarios.items():
+            started = time.perf_counter()
+            for i in range(args.renders):
+                func(i)
+            report(name, args.renders, time.perf_counter() - started)
+
+
+STARTUP_PROBE = """
+import resource, time
+started = time.perf_counter()
+import app
+print(f"STARTUP {time.perf_counter() - started:.3f} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}", flush=True)
+"""
+
+
+def run_startup_probe(role, *python_flags):
+    """Importiert app in einem frischen Interpreter mit temporärem Arbeitsverzeichnis,
+    damit app.log und SQLite-Dateien nicht im Repo landen."""
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    pythonpath = os.pathsep.join(p for p in (repo_dir, os.environ.get("PYTHONPATH")) if p)
+    with tempfile.TemporaryDirectory(prefix="startup-probe-") as workdir:
+        proc = subprocess.run(
+            [sys.executable, *python_flags, "-c", STARTUP_PROBE],
+            cwd=workdir, capture_output=True, text=True,
+            env=dict(os.environ, WORKER_ROLE=role, PYTHONPATH=pythonpath)
+        )
+    if proc.returncode != 0:
+        print(proc.stderr[-4000:], file=sys.stderr)
+        sys.exit(proc.returncode)
+    line = next(l for l in proc.stdout.splitlines() if l.startswith("STARTUP "))
+    _, seconds, rss_kb = line.split()
+    return float(seconds), int(rss_kb) / 1024, proc.stderr
+
+
+def parse_importtime(stderr):
+    """Top-Level-Pakete aus der `-X importtime`-Ausgabe mit kumulierter Importzeit in ms."""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if name.startswith("  "):
+            continue   # eingerückt = von einem anderen Modul nachgeladen, steckt in dessen Summe
+        totals[name.strip()] = int(cumulative) / 1000
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def bench_startup(args):
+    """Kaltstart von `import app` in frischen Interpretern: Import-Aufschlüsselung (-X importtime),
+    Gesamtzeit und maximale RSS für die gewählte Worker-Rolle. Überschreitet ein Wert das Budget, endet der Lauf mit Exit-Code 1."""
+    _, _, importtime = run_startup_probe(args.role, "-X", "importtime")
+    print(f"{'Modul':<40} {'kumuliert ms':>13}")
+    for name, ms in parse_importtime(importtime)[:args.top]:
+        print(f"{name:<40} {ms:>13.1f}")
+
+    seconds, rss_mb = min(run_startup_probe(args.role)[:2] for _ in range(args.runs))
+    print(f"Kaltstart ({args.role}): {seconds:.3f}s (Budget {args.max_startup_s}s), RSS: {rss_mb:.1f} MB (Budget {args.max_rss_mb} MB)")
+    if seconds > args.max_startup_s or rss_mb > args.max_rss_mb:
+        print("Startup-Budget überschritten", file=sys.stderr)
+        sys.exit(1)
+
+
+BENCHMARKS = {
+    "outbound": bench_outbound,
+    "smtp": bench_smtp,
+    "startup": bench_startup,
+    "templates": bench_templates,
+    "vip_bulk": bench_vip_bulk,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--users", type=int, default=10000, help="Anzahl Nutzer für vip_bulk")
+    parser.add_argument("--messages", type=int, default=2000, help="Anzahl Nachrichten für smtp")
+    parser.add_argument("--connect-delay-ms", type=float, default=20.0, help="Simulierte Handshake-Kosten des SMTP-Sinks")
+    parser.add_argument("--calls", type=int, default=500, help="Aufrufe pro Szenario und Stufe für outbound")
+    parser.add_argument("--levels", default="1,4,16,64", help="Parallelitätsstufen für outbound")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mittlere Antwortlatenz des HTTP-Sinks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil der HTTP-Sink-Antworten mit Status 500")
+    parser.add_argument("--renders", type=int, default=2000, help="Renderaufrufe pro Szenario für templates")
+    parser.add_argument("--top", type=int, default=15, help="Anzahl der teuersten Importe für startup")
+    parser.add_argument("--runs", type=int, default=3, help="Kaltstarts für startup (gewertet wird der schnellste)")
+    parser.add_argument("--role", default=os.getenv("WORKER_ROLE", "all"), help="WORKER_ROLE für startup")
+    parser.add_argument("--max-startup-s", type=float, default=float(os.getenv("STARTUP_BUDGET_SECONDS", 3.0)),
+                        help="Budget für die Kaltstartzeit von `import app`")
+    parser.add_argument("--max-rss-mb", type=float, default=float(os.getenv("STARTUP_BUDGET_RSS_MB", 250)),
+                        help="Budget für die maximale RSS nach `import app`")
+    parser.add_argument("--backend", default="memory", choices=["memory", "redis"], help="VIP-Ledger-Backend")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
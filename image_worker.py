@@ -0,0 +1,60 @@
+"""
+Bildkodierung für den Prozesspool der App.
+
+Die Worker laufen per Forkserver und importieren nur dieses Modul, nicht app.py: kein Fork eines
+Prozesses mit laufenden Threads, keine geerbten Sockets/Locks und keine zweite App-Initialisierung.
+"""
+
+import io
+import time
+import warnings
+
+_configured_max_pixels = None
+
+
+def configure_pil(max_pixels):
+    """Setzt Pillows Pixelgrenze und stuft die DecompressionBombWarning zum Fehler hoch (einmal pro Prozess).
+
+    Liefert das Modul PIL.Image. Dient auch als Initializer der Pool-Prozesse.
+    """
+    global _configured_max_pixels
+    from PIL import Image
+    if _configured_max_pixels != max_pixels:
+        Image.MAX_IMAGE_PIXELS = max_pixels
+        warnings.simplefilter("error", Image.DecompressionBombWarning)
+        _configured_max_pixels = max_pixels
+    return Image
+
+
+def compress_image_bytes(data, quality):
+    """Dekodiert und kodiert ein Bild komplett im Speicher als WebP.
+
+    Liefert die WebP-Bytes und die Zeiten für Dekodieren und Kodieren in Millisekunden.
+    """
+    from PIL import Image
+    started = time.perf_counter()
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        decoded = time.perf_counter()
+        out = io.BytesIO()
+        img.convert("RGB").save(out, "webp", quality=quality)
+    encoded = time.perf_counter()
+    return out.getvalue(), {
+        "decode_ms": round((decoded - started) * 1000, 1),
+        "encode_ms": round((encoded - decoded) * 1000, 1)
+    }
+
+
+def derive_image_variant(data, width, quality, fmt="webp"):
+    """Skaliert ein Bild auf höchstens `width` Pixel Breite und kodiert es im Speicher."""
+    from PIL import Image
+    with Image.open(io.BytesIO(data)) as img:
+        img = img.convert("RGB")
+        if img.width > width:
+            img = img.resize((width, max(1, round(img.height * width / img.width))), Image.LANCZOS)
+        out = io.BytesIO()
+        if fmt == "jpeg":
+            img.save(out, fmt, quality=quality, optimize=True, progressive=True)
+        else:
+            img.save(out, fmt, quality=quality)
+        return out.getvalue(), img.width, img.height
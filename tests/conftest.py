@@ -0,0 +1,86 @@
+"""
+Gemeinsame Test-Fixtures.
+
+Die App wird in einem temporären Arbeitsverzeichnis importiert (app.log, SQLite-Dateien und Bilder landen dort),
+ohne Hintergrund-Threads; Tests treiben Outbox, Drip-Scheduler usw. direkt an.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+import redis
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix="app-tests-")
+
+os.environ.update({
+    "APP_DB_PATH": os.path.join(WORKDIR, "app_data.db"),
+    "IMAGE_DIR": os.path.join(WORKDIR, "images"),
+    "VIP_STORE_BACKEND": "memory",
+    "OUTBOX_RELAY_ENABLED": "false",
+    "DRIP_DISPATCHER_ENABLED": "false",
+    "DM_WORKER_ENABLED": "false",
+    "IMAGE_INDEX_ENABLED": "false",
+    "COMPRESSION_ENABLED": "true",
+})
+os.chdir(WORKDIR)
+sys.path.insert(0, ROOT)
+
+
+def fake_response(status_code, text=""):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = text.encode("utf-8")
+    response.url = "https://example.invalid/"
+    return response
+
+
+class InMemoryRedis:
+    """Ersatz für den Redis-Server im Cache-Pfad (nur Strings, TTL wird ignoriert, Publish ist ein No-op)."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode("utf-8") if isinstance(value, str) else value
+
+    def delete(self, *keys):
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+    def publish(self, channel, message):
+        return 0
+
+    def pubsub(self, **kwargs):
+        raise redis.ConnectionError("Pub/Sub im Test nicht verfügbar")
+
+    def info(self):
+        return {"keys": len(self.data)}
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    import app as app_module
+    app_module.MAX_REQUESTS_PER_WINDOW = float("inf")
+    app_module.redis_cache = app_module.tiered_cache.redis = InMemoryRedis()
+    return app_module
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def box(app_module, tmp_path, monkeypatch):
+    """Frische Outbox mit den registrierten Handlern, damit Tests sich keine Zeilen teilen."""
+    box = app_module.TransactionalOutbox(str(tmp_path / "outbox.db"))
+    box.handlers = dict(app_module.outbox.handlers)
+    monkeypatch.setattr(app_module, "outbox", box)
+    monkeypatch.setattr(app_module, "USE_SIMULATION", False)
+    return box
@@ -0,0 +1,40 @@
+from conftest import fake_response
+
+
+def ga_payloads(n):
+    return [{"v": "1", "t": "event", "ea": f"e{i}", "z": f"z{i}"} for i in range(n)]
+
+
+def outbox_rows(box, channel):
+    return box._conn().execute("SELECT * FROM outbox WHERE channel = ? ORDER BY id", (channel,)).fetchall()
+
+
+def test_failed_ga_chunk_is_routed_through_outbox(app_module, box, monkeypatch):
+    statuses = [500, 200]
+    monkeypatch.setattr(app_module.http_client, "post", lambda *a, **kw: fake_response(statuses.pop(0)))
+    payloads = ga_payloads(app_module.GA_BATCH_LIMIT + 5)
+
+    app_module.flush_ga_events(payloads)
+
+    rows = outbox_rows(box, "ga")
+    assert [r["idempotency_key"] for r in rows] == [f"ga:z{i}" for i in range(app_module.GA_BATCH_LIMIT)]
+
+    monkeypatch.setattr(app_module.http_client, "post", lambda *a, **kw: fake_response(200))
+    box._relay_batch(box._claim_due())
+    assert {r["status"] for r in outbox_rows(box, "ga")} == {"sent"}
+
+
+def test_successful_flush_does_not_touch_outbox(app_module, box, monkeypatch):
+    monkeypatch.setattr(app_module.http_client, "post", lambda *a, **kw: fake_response(200))
+    app_module.flush_ga_events(ga_payloads(3))
+    assert outbox_rows(box, "ga") == []
+
+
+def test_bus_routes_rejected_matomo_batch_to_outbox(app_module, box, monkeypatch):
+    monkeypatch.setattr(app_module, "MATOMO_URL", "https://matomo.example.invalid")
+    monkeypatch.setattr(app_module.http_client, "post", lambda *a, **kw: fake_response(403, "token ungültig"))
+    bus = app_module.AnalyticsEventBus(batch_size=10, flush_interval=1, max_buffer=10)
+    bus.sinks = app_module.analytics_bus.sinks
+    bus._flush([("matomo", {"idsite": 1, "rand": "r1"})])
+    assert [r["idempotency_key"] for r in outbox_rows(box, "matomo")] == ["matomo:r1"]
+    assert bus.stats()["flushed"] == 1
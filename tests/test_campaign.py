@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def checkpoints(app_module, tmp_path, monkeypatch):
+    checkpoints = app_module.CampaignCheckpoints(str(tmp_path / "campaigns.db"))
+    monkeypatch.setattr(app_module, "campaign_checkpoints", checkpoints)
+    return checkpoints
+
+
+def test_claim_is_exclusive_across_instances(app_module, checkpoints):
+    other_worker = app_module.CampaignCheckpoints(checkpoints.path)
+    assert checkpoints.claim("kampagne-1") is True
+    assert other_worker.claim("kampagne-1") is False
+    assert other_worker.claim("kampagne-2") is True
+
+
+def test_stale_and_interrupted_runs_can_be_reclaimed(app_module, checkpoints):
+    checkpoints.claim("verwaist")
+    stale = (datetime.now() - timedelta(seconds=app_module.CAMPAIGN_CLAIM_TIMEOUT + 60)).isoformat()
+    conn = checkpoints._conn()
+    with conn:
+        conn.execute("UPDATE campaign_checkpoints SET updated_at = ? WHERE campaign_id = 'verwaist'", (stale,))
+    assert checkpoints.claim("verwaist") is True
+
+    checkpoints.save("abgebrochen", 500, status="interrupted")
+    assert checkpoints.claim("abgebrochen") is True
+    assert checkpoints.get("abgebrochen")["next_offset"] == 500
+
+
+def outbox_keys(box):
+    return [r["idempotency_key"] for r in box._conn().execute("SELECT idempotency_key FROM outbox ORDER BY id")]
+
+
+def test_finished_campaign_is_not_run_again(app_module, checkpoints, box):
+    assert app_module.reengagement_campaign("einmalig") == "einmalig"
+    assert app_module.reengagement_campaign("einmalig") is None
+    users = app_module.get_inactive_users()
+    assert sorted(outbox_keys(box)) == sorted(
+        [f"reengagement:einmalig:email:{u}" for u in users] + [f"reengagement:einmalig:push:{u}" for u in users]
+    )
+    assert checkpoints.get("einmalig")["status"] == "done"
+
+
+def test_page_is_in_outbox_before_checkpoint_and_resume_adds_no_duplicates(app_module, checkpoints, box, monkeypatch):
+    monkeypatch.setattr(app_module, "REENGAGEMENT_PAGE_SIZE", 1)
+    saves = []
+    real_save = checkpoints.save
+
+    def crash_after_first_page(campaign_id, next_offset, status="running"):
+        saves.append(len(outbox_keys(box)))
+        real_save(campaign_id, next_offset, status)
+        if status == "running" and next_offset == 1 and len(saves) == 1:
+            raise RuntimeError("Worker abgestürzt")
+
+    monkeypatch.setattr(checkpoints, "save", crash_after_first_page)
+    with pytest.raises(RuntimeError):
+        app_module.reengagement_campaign("resume")
+    assert saves[0] == 2   # E-Mail und Push der ersten Seite lagen vor dem Checkpoint in der Outbox
+    checkpoint = checkpoints.get("resume")
+    assert (checkpoint["next_offset"], checkpoint["status"]) == (1, "interrupted")
+
+    # Seite 1 ein zweites Mal einreihen (Absturz vor dem Checkpoint) bleibt ohne Duplikate
+    app_module._enqueue_reengagement_page("resume", app_module.get_inactive_users()[:1], "x", ["y"], "z")
+    assert app_module.reengagement_campaign("resume") == "resume"
+    assert len(outbox_keys(box)) == 2 * len(app_module.get_inactive_users())
+
+
+def test_smtp_failures_are_retried_per_recipient(app_module, box, monkeypatch):
+    monkeypatch.setattr(app_module, "SENDINBLUE_API_KEY", "")
+    monkeypatch.setattr(app_module.smtp_pool, "send_many",
+                        lambda messages: ["SMTP down" if m["To"] == "b@example.com" else None for m in messages])
+    app_module._enqueue_reengagement_page("smtp", ["a@example.com", "b@example.com"], "Hallo", ["Betreff"], "")
+    box._relay_batch([r for r in box._claim_due() if r["channel"] == "reengagement_email"])
+    status = {r["idempotency_key"]: r["status"] for r in box._conn().execute("SELECT * FROM outbox")}
+    assert status["reengagement:smtp:email:a@example.com"] == "sent"
+    assert status["reengagement:smtp:email:b@example.com"] == "pending"
+
+
+def test_failed_run_is_marked_interrupted(app_module, checkpoints, monkeypatch):
+    def broken_page(offset, limit):
+        raise RuntimeError("DB weg")
+
+    monkeypatch.setattr(app_module, "get_inactive_users_page", broken_page)
+    with pytest.raises(RuntimeError):
+        app_module.reengagement_campaign("kaputt")
+    assert checkpoints.get("kaputt")["status"] == "interrupted"
+
+
+def test_endpoint_returns_409_while_claimed(client, app_module, checkpoints, monkeypatch):
+    monkeypatch.setattr(app_module, "ADMIN_API_TOKEN", "t")
+    monkeypatch.setattr(app_module, "run_reengagement_campaign", lambda campaign_id: None)
+    post = lambda: client.post("/admin/reengagement_campaign", json={"campaign_id": "api"}, headers={"X-Admin-Token": "t"})
+    assert post().status_code == 202
+    assert post().status_code == 409
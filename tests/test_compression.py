@@ -0,0 +1,96 @@
+import gzip
+import types
+
+import pytest
+from flask import Flask, Response, jsonify, request
+
+BODY = "x" * 2048
+
+
+@pytest.fixture
+def fake_brotli(app_module, monkeypatch):
+    """Ersatz für das optionale brotli-Paket; markiert den Body nur, damit die Kodierung sichtbar ist."""
+    monkeypatch.setattr(app_module, "brotli", types.SimpleNamespace(compress=lambda body, quality: b"BR:" + body))
+
+
+@pytest.fixture
+def make_client(app_module):
+    def make():
+        mini = Flask("compression-test")
+
+        @mini.route("/text")
+        def text():
+            resp = Response(BODY, mimetype="text/plain")
+            resp.headers["Vary"] = "Cookie"
+            resp.add_etag()
+            return resp.make_conditional(request)
+
+        @mini.route("/small")
+        def small():
+            return jsonify({"ok": True})
+
+        @mini.route("/webp")
+        def webp():
+            return Response(b"\0" * 4096, mimetype="image/webp")
+
+        @mini.route("/stream")
+        def stream():
+            return Response((BODY for _ in range(2)), mimetype="text/plain")
+
+        @mini.route("/encoded")
+        def encoded():
+            return Response(gzip.compress(BODY.encode()), mimetype="text/plain", headers={"Content-Encoding": "gzip"})
+
+        mini.wsgi_app = app_module.CompressionMiddleware(mini.wsgi_app, min_size=1024)
+        return mini.test_client()
+    return make
+
+
+def test_gzip_response_has_suffixed_etag_and_vary(make_client):
+    resp = make_client().get("/text", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(resp.get_data()).decode() == BODY
+    assert int(resp.headers["Content-Length"]) == len(resp.get_data())
+    assert resp.headers["ETag"].endswith('-gzip"')
+    assert [v.strip() for v in resp.headers["Vary"].split(",")] == ["Cookie", "Accept-Encoding"]
+
+
+def test_brotli_is_preferred_when_available(make_client, fake_brotli):
+    resp = make_client().get("/text", headers={"Accept-Encoding": "gzip, br"})
+    assert resp.headers["Content-Encoding"] == "br"
+    assert resp.get_data() == b"BR:" + BODY.encode()
+    assert resp.headers["ETag"].endswith('-br"')
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_304_round_trip_with_suffixed_etag(make_client, fake_brotli, encoding):
+    client = make_client()
+    first = client.get("/text", headers={"Accept-Encoding": encoding})
+    etag = first.headers["ETag"]
+
+    again = client.get("/text", headers={"Accept-Encoding": encoding, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.get_data() == b""
+
+
+def test_identity_response_keeps_plain_etag(make_client):
+    resp = make_client().get("/text")
+    assert "Content-Encoding" not in resp.headers
+    assert not resp.headers["ETag"].endswith('-gzip"')
+    assert resp.get_data(as_text=True) == BODY
+
+
+@pytest.mark.parametrize("path", ["/small", "/webp", "/stream", "/encoded"])
+def test_skip_rules(make_client, path):
+    resp = make_client().get(path, headers={"Accept-Encoding": "gzip"})
+    body = resp.get_data()
+    assert resp.headers.get("Content-Encoding") == ("gzip" if path == "/encoded" else None)
+    if path == "/encoded":
+        assert gzip.decompress(body).decode() == BODY   # nicht doppelt komprimiert
+    assert "Accept-Encoding" not in resp.headers.get("Vary", "")
+
+
+def test_head_request_is_not_compressed(make_client):
+    resp = make_client().head("/text", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers
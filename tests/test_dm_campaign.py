@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+
+class WorkerCrash(BaseException):
+    """Simuliert einen Prozessabbruch mitten im Chunk (wird nicht als fehlgeschlagene DM gezählt)."""
+
+
+@pytest.fixture
+def dms(app_module, monkeypatch):
+    sent = []
+    monkeypatch.setattr(app_module, "DM_CHUNK_SIZE", 2)
+    monkeypatch.setattr(app_module, "DM_RATE_LIMIT", 1000)
+    monkeypatch.setattr(app_module, "send_influencer_dm", lambda platform, name, message: sent.append(name))
+    return sent
+
+
+@pytest.fixture
+def executor(app_module, tmp_path):
+    return app_module.DmCampaignExecutor(str(tmp_path / "dm.db"))
+
+
+def influencers(n):
+    return [{"name": f"i{i}", "platform": "Instagram" if i % 2 else "TikTok"} for i in range(n)]
+
+
+def run_claimed(executor):
+    job = executor._claim_job()
+    executor._process_job(job["id"], job["template"])
+
+
+def test_job_is_processed_in_chunks(executor, dms):
+    job_id, total = executor.create_job("Test", "Hallo {name}!", influencers(5))
+    assert total == 5
+    run_claimed(executor)
+
+    assert sorted(dms) == [f"i{i}" for i in range(5)]
+    job = executor.get_job(job_id)
+    assert (job["status"], job["sent"], job["failed"]) == ("done", 5, 0)
+    results = list(executor.iter_results(job_id))
+    assert [r["seq"] for r in results] == list(range(5))
+    assert results[3]["message"] == "Hallo i3!"
+    assert results[3]["platform"] == "instagram"
+
+
+def test_claim_is_exclusive_until_the_lease_expires(app_module, executor, dms):
+    executor.create_job("Test", "Hallo {name}!", influencers(1))
+    other_worker = app_module.DmCampaignExecutor(executor.path)
+    assert executor._claim_job() is not None
+    assert other_worker._claim_job() is None
+
+    conn = executor._conn()
+    with conn:
+        conn.execute("UPDATE dm_jobs SET lease_until = ?", (time.time() - 1,))
+    assert other_worker._claim_job() is not None
+
+
+def test_crashed_job_resumes_after_the_last_checkpoint(app_module, executor, dms, monkeypatch):
+    job_id, _ = executor.create_job("Test", "Hallo {name}!", influencers(5))
+
+    def crash_on_i2(platform, name, message):
+        if name == "i2":
+            raise WorkerCrash()
+        dms.append(name)
+
+    monkeypatch.setattr(app_module, "send_influencer_dm", crash_on_i2)
+    with pytest.raises(WorkerCrash):
+        run_claimed(executor)
+    job = executor.get_job(job_id)
+    assert (job["status"], job["sent"]) == ("running", 2)   # erster Chunk ist gespeichert
+
+    # Nach Ablauf der Lease übernimmt ein anderer Worker und sendet nur den Rest
+    conn = executor._conn()
+    with conn:
+        conn.execute("UPDATE dm_jobs SET lease_until = ?", (time.time() - 1,))
+    monkeypatch.setattr(app_module, "send_influencer_dm", lambda platform, name, message: dms.append(name))
+    dms.clear()
+    run_claimed(app_module.DmCampaignExecutor(executor.path))
+
+    assert sorted(dms) == ["i2", "i3", "i4"]
+    job = executor.get_job(job_id)
+    assert (job["status"], job["sent"], job["failed"]) == ("done", 5, 0)
+
+
+def test_failed_dms_are_recorded_per_item(app_module, executor, monkeypatch):
+    monkeypatch.setattr(app_module, "DM_RATE_LIMIT", 1000)
+
+    def flaky(platform, name, message):
+        if name == "i1":
+            raise RuntimeError("IFTTT 500")
+
+    monkeypatch.setattr(app_module, "send_influencer_dm", flaky)
+    job_id, _ = executor.create_job("Test", "Hallo {name}!", influencers(3))
+    run_claimed(executor)
+    job = executor.get_job(job_id)
+    assert (job["sent"], job["failed"]) == (2, 1)
+    failed = [r for r in executor.iter_results(job_id) if r["status"] == "failed"]
+    assert [(r["name"], r["error"]) for r in failed] == [("i1", "IFTTT 500")]
+
+
+def test_invalid_upload_removes_the_job(executor):
+    with pytest.raises(ValueError):
+        executor.create_job("Test", "Hallo {name}!", [{"name": "ok", "platform": "x"}, "kein Objekt"])
+    assert executor._conn().execute("SELECT COUNT(*) FROM dm_jobs").fetchone()[0] == 0
+    with pytest.raises(ValueError):
+        executor.create_job("Test", "Hallo {vorname}!", [])
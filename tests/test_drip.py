@@ -0,0 +1,60 @@
+import sqlite3
+import time
+
+import pytest
+
+from conftest import fake_response
+
+
+@pytest.fixture
+def scheduler(app_module, tmp_path):
+    return app_module.DripScheduler(str(tmp_path / "drip.db"), app_module.deliver_drip_message)
+
+
+def drip_rows(scheduler):
+    return scheduler._conn().execute("SELECT * FROM drip_sends ORDER BY step").fetchall()
+
+
+def test_failed_delivery_is_rescheduled_with_backoff(app_module, scheduler, monkeypatch):
+    def broken_enqueue(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(app_module.outbox, "enqueue", broken_enqueue)
+    scheduler.schedule("drip@example.com", "welcome_series", [(0, "Hallo", "Willkommen")])
+
+    before = time.time()
+    for row in scheduler._claim_due():
+        scheduler._dispatch(row)
+
+    row = drip_rows(scheduler)[0]
+    assert row["status"] == "pending"
+    assert row["attempts"] == 1
+    assert row["due_at"] >= before + 120
+    assert "locked" in row["last_error"]
+
+
+def test_last_attempt_marks_send_failed(app_module, scheduler):
+    scheduler.deliver = lambda row: 1 / 0
+    scheduler.schedule("drip@example.com", "welcome_series", [(0, "Hallo", "Willkommen")])
+    scheduler._conn().execute("UPDATE drip_sends SET attempts = ?", (app_module.DRIP_MAX_ATTEMPTS - 1,))
+    scheduler._conn().commit()
+    for row in scheduler._claim_due():
+        scheduler._dispatch(row)
+    assert drip_rows(scheduler)[0]["status"] == "failed"
+
+
+def test_transport_failure_after_handoff_is_retried_by_outbox(app_module, scheduler, box, monkeypatch):
+    monkeypatch.setattr(app_module, "SENDINBLUE_API_KEY", "key")
+    monkeypatch.setattr(app_module.http_client, "post", lambda *a, **kw: fake_response(500))
+    monkeypatch.setattr(app_module.smtp_pool, "send_many", lambda messages: ["SMTP down"] * len(messages))
+
+    scheduler.schedule("drip@example.com", "welcome_series", [(0, "Hallo", "Willkommen")])
+    for row in scheduler._claim_due():
+        scheduler._dispatch(row)
+    assert drip_rows(scheduler)[0]["status"] == "sent"
+
+    box._relay_batch(box._claim_due())
+    row = box._conn().execute("SELECT * FROM outbox").fetchone()
+    assert row["idempotency_key"] == "drip:drip@example.com:welcome_series:0"
+    assert row["status"] == "pending"
+    assert row["attempts"] == 1
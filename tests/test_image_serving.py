@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def legacy_image(app_module):
+    """Manifest-Eintrag im alten Format (eine WebP-Datei je Variante, ohne "formats")."""
+    os.makedirs(app_module.IMAGE_DIR, exist_ok=True)
+    entry = {"variants": {}, "created_at": "2024-01-01T00:00:00"}
+    for vname, width in (("small", 480), ("large", 1600)):
+        file_name = f"legacy.{vname}.abc.webp"
+        with open(os.path.join(app_module.IMAGE_DIR, file_name), "wb") as f:
+            f.write(vname.encode("ascii") * 10)
+        entry["variants"][vname] = {
+            "file": file_name, "width": width, "height": width // 2,
+            "bytes": 50, "hash": "abc", "mimetype": "image/webp"
+        }
+    app_module.image_manifest.put("legacy", entry)
+    return entry
+
+
+def test_legacy_manifest_entries_are_served(client, legacy_image):
+    resp = client.get("/serve_image/legacy", headers={"Accept": "image/webp"})
+    assert resp.status_code == 200
+    assert resp.mimetype == "image/webp"
+    assert resp.get_data() == b"large" * 10
+
+
+def test_mobile_client_hint_picks_small_variant_without_vary_user_agent(client, legacy_image):
+    resp = client.get("/serve_image/legacy", headers={"Sec-CH-UA-Mobile": "?1", "User-Agent": "Mobile Safari"})
+    assert resp.get_data() == b"small" * 10
+    assert "User-Agent" not in resp.vary
+    assert "Sec-CH-UA-Mobile" in resp.vary
+
+
+def test_x_sendfile_is_off_by_default_and_scoped_to_images(client, app_module, legacy_image, monkeypatch):
+    assert app_module.app.config["USE_X_SENDFILE"] is False
+    monkeypatch.setattr(app_module, "IMAGE_SENDFILE_MODE", "x-sendfile")
+    resp = client.get("/serve_image/legacy?w=100")
+    assert resp.headers["X-Sendfile"].endswith("legacy.small.abc.webp")
+    assert resp.get_data() == b""
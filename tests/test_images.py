@@ -0,0 +1,86 @@
+import io
+import json
+import struct
+import zlib
+
+import pytest
+from PIL import Image
+
+
+def png_header_only(width, height):
+    """PNG, dessen Header riesige Maße behauptet, ohne die Pixel mitzuliefern (Decompression Bomb)."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", zlib.compress(b"\x00" * 16)) + chunk(b"IEND", b"")
+
+
+def small_png():
+    out = io.BytesIO()
+    Image.new("RGB", (32, 16), (200, 10, 10)).save(out, "png")
+    return out.getvalue()
+
+
+def upload(client, path, data, filename="bild.png", field="file"):
+    return client.post(path, data={field: (io.BytesIO(data), filename)}, content_type="multipart/form-data")
+
+
+@pytest.fixture
+def limits(app_module):
+    # 2x über der Grenze wirft Pillow DecompressionBombError, dazwischen nur eine (hochgestufte) Warnung
+    limit = app_module.MAX_IMAGE_PIXELS
+    return {"error": png_header_only(limit, 3), "warning": png_header_only(limit + 1000, 1)}
+
+
+@pytest.mark.filterwarnings("error::PIL.Image.DecompressionBombWarning")   # wie configure_pil, pytest setzt Filter je Test zurück
+@pytest.mark.parametrize("kind", ["error", "warning"])
+@pytest.mark.parametrize("path", ["/compress_image", "/upload_image"])
+def test_decompression_bomb_returns_413(client, limits, path, kind):
+    resp = upload(client, path, limits[kind])
+    assert resp.status_code == 413
+    assert "Pixel" in resp.get_json()["error"]
+
+
+def test_batch_rejects_bomb_per_file(client, limits):
+    resp = upload(client, "/compress_images_batch", limits["error"], filename="bombe.png", field="files")
+    lines = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert resp.status_code == 200
+    assert lines[0]["file"] == "bombe.png" and lines[0]["status"] == "error"
+    assert lines[-1]["failed"] == 1
+
+
+def test_oversized_request_body_is_rejected_before_parsing(client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "MAX_IMAGE_REQUEST_BYTES", 1000)
+    assert upload(client, "/compress_image", b"\x00" * 5000).status_code == 413
+    assert app_module.app.config["MAX_CONTENT_LENGTH"] == app_module.MAX_REQUEST_BYTES
+
+
+def test_compress_image_runs_in_forkserver_pool(client, app_module):
+    resp = upload(client, "/compress_image", small_png())
+    body = resp.get_json()
+    assert resp.status_code == 200
+    assert (body["width"], body["height"]) == (32, 16)
+    assert app_module.get_image_pool()._mp_context.get_start_method() == "forkserver"
+
+
+def test_variant_worker_timeout_is_not_treated_as_missing_format(client, app_module, monkeypatch, caplog):
+    from concurrent.futures import Future
+
+    class StalledWebpPool:
+        def submit(self, fn, data, width, quality, fmt):
+            future = Future()
+            if fmt != "webp":
+                future.set_result(fn(data, width, quality, fmt))
+            return future
+
+    monkeypatch.setattr(app_module, "get_image_pool", StalledWebpPool)
+    monkeypatch.setattr(app_module, "IMAGE_FORMATS", ["webp", "jpeg"])
+    monkeypatch.setattr(app_module, "IMAGE_ENCODE_TIMEOUT", 0.01)
+
+    resp = client.post("/upload_image", data={"file": (io.BytesIO(small_png()), "bild.png"), "name": "stau"},
+                       content_type="multipart/form-data")
+    assert resp.status_code == 503
+    assert app_module.image_manifest.get("stau") is None
+    assert "Bild-Worker-Timeout" in caplog.text
+    assert "nicht verfügbar" not in caplog.text
+    assert client.get("/serve_image/stau").status_code == 503
@@ -0,0 +1,99 @@
+import time
+
+import pytest
+
+from conftest import fake_response
+
+
+@pytest.fixture
+def make_dispatcher(app_module):
+    def make(deliver=None, dedup_window=60):
+        sent = []
+        dispatcher = app_module.NotificationDispatcher(
+            deliver or (lambda message, title: sent.append((title, message))), dedup_window, flush_interval=0
+        )
+        dispatcher._threads = []   # keine Hintergrund-Threads, der Test leert die Queue selbst
+        dispatcher.sent = sent
+        return dispatcher
+    return make
+
+
+def drain(dispatcher):
+    batch = []
+    while not dispatcher._normal.empty():
+        batch.append(dispatcher._normal.get_nowait())
+    dispatcher._flush(batch)
+
+
+def test_duplicate_within_window_is_dropped(make_dispatcher):
+    dispatcher = make_dispatcher()
+    assert dispatcher.notify("Backup ok", "Ops") is True
+    assert dispatcher.notify("Backup ok", "Ops") is False
+    assert dispatcher.notify("Backup ok", "Andere") is True
+    assert dispatcher.stats()["deduplicated"] == 1
+
+
+def test_expired_entries_are_popped_from_the_front(make_dispatcher):
+    dispatcher = make_dispatcher(dedup_window=0.05)
+    dispatcher.notify("a", "Ops")
+    dispatcher.notify("b", "Ops")
+    time.sleep(0.06)
+    assert dispatcher.notify("a", "Ops") is True
+    assert list(dispatcher._recent) == [("Ops", "a")]
+
+
+def test_only_coalescible_messages_are_merged(make_dispatcher):
+    dispatcher = make_dispatcher()
+    dispatcher.notify("Hey anna, neue Angebote!", "Re-Engagement")
+    dispatcher.notify("Hey ben, neue Angebote!", "Re-Engagement")
+    dispatcher.notify("Cleanup Fehler: x", "Ops", coalesce=True)
+    dispatcher.notify("Cleanup Fehler: y", "Ops", coalesce=True)
+    drain(dispatcher)
+
+    assert ("Re-Engagement", "Hey anna, neue Angebote!") in dispatcher.sent
+    assert ("Re-Engagement", "Hey ben, neue Angebote!") in dispatcher.sent
+    assert ("Ops", "2 Meldungen: Cleanup Fehler: x | Cleanup Fehler: y") in dispatcher.sent
+    assert len(dispatcher.sent) == 3
+    assert dispatcher.stats()["coalesced"] == 1
+
+
+def test_failed_delivery_is_counted(make_dispatcher):
+    def broken(message, title):
+        raise RuntimeError("outbox nicht erreichbar")
+
+    dispatcher = make_dispatcher(deliver=broken)
+    dispatcher.notify("x", "Ops")
+    drain(dispatcher)
+    stats = dispatcher.stats()
+    assert stats["failed"] == 1
+    assert stats["sent"] == 0
+
+
+def test_high_priority_uses_direct_lane(make_dispatcher):
+    direct = []
+    dispatcher = make_dispatcher()
+    dispatcher.deliver_high = lambda message, title: direct.append((title, message))
+    dispatcher.notify("Server down", "Alarm", priority="high")
+    dispatcher._send(*dispatcher._high.get_nowait()[:2], dispatcher.deliver_high)
+    assert direct == [("Alarm", "Server down")]
+    assert dispatcher.sent == []
+
+
+def test_priority_alert_skips_outbox_backlog(app_module, box, monkeypatch):
+    monkeypatch.setattr(app_module, "FCM_SERVER_KEY", "key")
+    posted = []
+    monkeypatch.setattr(app_module.http_client, "post", lambda *a, **kw: posted.append(kw["json"]) or fake_response(200))
+    box.enqueue_many("email", [(f"backlog:{i}", {"recipient": "x@example.com", "subject": "s", "body": "b"}) for i in range(5)])
+
+    app_module.deliver_fcm_priority("Server down", "Alarm")
+    assert len(posted) == 1
+    assert box.stats()["pending"] == 5
+
+
+def test_failed_priority_alert_falls_back_to_outbox(app_module, box, monkeypatch):
+    monkeypatch.setattr(app_module, "FCM_SERVER_KEY", "key")
+    monkeypatch.setattr(app_module.http_client, "post", lambda *a, **kw: fake_response(503))
+    app_module.deliver_fcm_priority("Server down", "Alarm")
+    row = box._conn().execute("SELECT channel, payload FROM outbox").fetchone()
+    assert row["channel"] == "fcm"
+    assert "Server down" in row["payload"]
@@ -0,0 +1,103 @@
+import time
+
+from conftest import fake_response
+
+
+def relay_all(box):
+    box._relay_batch(box._claim_due())
+
+
+def rows(box):
+    return box._conn().execute("SELECT * FROM outbox ORDER BY id").fetchall()
+
+
+def test_failing_sendinblue_and_smtp_moves_row_to_backoff(app_module, box, monkeypatch):
+    monkeypatch.setattr(app_module, "SENDINBLUE_API_KEY", "key")
+    monkeypatch.setattr(app_module.http_client, "post", lambda *a, **kw: fake_response(503, "unavailable"))
+    monkeypatch.setattr(app_module.smtp_pool, "send_many", lambda messages: ["SMTP down"] * len(messages))
+    box.enqueue("sendinblue", {"user_email": "retry@example.com", "base_content": "Hallo",
+                               "possible_subjects": ["Betreff"], "user_behavior": ""}, "sib:1")
+
+    before = time.time()
+    relay_all(box)
+
+    row = rows(box)[0]
+    assert row["status"] == "pending"
+    assert row["attempts"] == 1
+    assert row["next_attempt_at"] >= before + 60
+    assert "SMTP down" in row["last_error"]
+
+
+def test_failing_fcm_is_retried_and_sent_on_next_attempt(app_module, box, monkeypatch):
+    monkeypatch.setattr(app_module, "FCM_SERVER_KEY", "key")
+    responses = [fake_response(500, "boom"), fake_response(200)]
+    monkeypatch.setattr(app_module.http_client, "post", lambda *a, **kw: responses.pop(0))
+    app_module.enqueue_fcm_notification("Server down", "Alarm")
+
+    relay_all(box)
+    assert rows(box)[0]["status"] == "pending"
+
+    box._conn().execute("UPDATE outbox SET next_attempt_at = 0")
+    box._conn().commit()
+    relay_all(box)
+    assert rows(box)[0]["status"] == "sent"
+
+
+def test_fcm_enqueue_is_idempotent_within_dedup_window(app_module, box):
+    app_module.enqueue_fcm_notification("Gleiche Meldung", "Info")
+    app_module.enqueue_fcm_notification("Gleiche Meldung", "Info")
+    assert len(rows(box)) == 1
+
+
+def test_failed_matomo_flush_is_routed_through_outbox(app_module, box, monkeypatch):
+    monkeypatch.setattr(app_module, "MATOMO_URL", "https://matomo.example.invalid")
+    monkeypatch.setattr(app_module, "MATOMO_TOKEN", "token")
+    monkeypatch.setattr(app_module.http_client, "post", lambda *a, **kw: fake_response(502))
+    payloads = [{"idsite": 1, "e_n": "klick", "rand": "a"}, {"idsite": 1, "e_n": "kauf", "rand": "b"}]
+
+    app_module.flush_matomo_events(payloads)
+    app_module.flush_matomo_events(payloads)
+    assert [r["channel"] for r in rows(box)] == ["matomo", "matomo"]
+
+    relay_all(box)
+    assert {r["status"] for r in rows(box)} == {"pending"}
+
+    monkeypatch.setattr(app_module.http_client, "post", lambda *a, **kw: fake_response(200))
+    box._conn().execute("UPDATE outbox SET next_attempt_at = 0")
+    box._conn().commit()
+    relay_all(box)
+    assert {r["status"] for r in rows(box)} == {"sent"}
+
+
+def test_row_goes_dead_after_max_attempts(app_module, box, monkeypatch):
+    box.register_handler("broken", lambda payload: 1 / 0)
+    box.enqueue("broken", {}, "broken:1")
+    box._conn().execute("UPDATE outbox SET attempts = ?", (app_module.OUTBOX_MAX_ATTEMPTS - 1,))
+    box._conn().commit()
+    relay_all(box)
+    assert rows(box)[0]["status"] == "dead"
+
+
+def test_purge_removes_expired_sent_and_dead_rows(app_module, box):
+    box.register_handler("ok", lambda payload: None)
+    box.register_handler("broken", lambda payload: 1 / 0)
+    box.enqueue("ok", {}, "ok:alt")
+    box.enqueue("broken", {}, "broken:alt")
+    box._conn().execute("UPDATE outbox SET attempts = ?", (app_module.OUTBOX_MAX_ATTEMPTS - 1,))
+    box._conn().commit()
+    relay_all(box)
+    box.enqueue("ok", {}, "ok:neu")
+    relay_all(box)
+
+    now = time.time()
+    assert box.purge(now + app_module.OUTBOX_SENT_RETENTION - 60) == {"sent": 0, "dead": 0}
+    box._conn().execute("UPDATE outbox SET next_attempt_at = next_attempt_at - ? WHERE idempotency_key != 'ok:neu'",
+                        (app_module.OUTBOX_DEAD_RETENTION,))
+    box._conn().commit()
+    assert box.purge(now) == {"sent": 1, "dead": 1}
+    assert [r["idempotency_key"] for r in rows(box)] == ["ok:neu"]
+    assert box.stats() == {"sent": 1, "purged_sent": 1, "purged_dead": 1}
+
+    # Innerhalb der Aufbewahrung bleibt der Key wirksam, danach darf er neu eingereiht werden
+    assert box.enqueue("ok", {}, "ok:neu") is False
+    assert box.enqueue("ok", {}, "ok:alt") is True
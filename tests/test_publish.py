@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from conftest import fake_response
+
+
+@pytest.fixture
+def channels(app_module, monkeypatch):
+    channels = OrderedDict()
+    monkeypatch.setattr(app_module, "PUBLISHING_CHANNELS", channels)
+    return channels
+
+
+def test_http_calls_are_bounded_by_the_thread_deadline(app_module, monkeypatch):
+    session = app_module.http_client._provider("deadline-test")["session"]
+    seen = []
+    monkeypatch.setattr(session, "request", lambda method, url, **kw: seen.append(kw["timeout"]) or fake_response(200))
+
+    app_module.http_client.get("deadline-test", "https://example.invalid/")
+    with app_module.http_client.deadline(0.5):
+        app_module.http_client.get("deadline-test", "https://example.invalid/")
+    assert seen[0] == (app_module.HTTP_CONNECT_TIMEOUT, app_module.HTTP_READ_TIMEOUT)
+    assert max(seen[1]) <= 0.5
+
+    with app_module.http_client.deadline(0):
+        with pytest.raises(requests.Timeout):
+            app_module.http_client.get("deadline-test", "https://example.invalid/")
+
+
+def test_deadline_starts_when_the_channel_runs(app_module, channels, monkeypatch):
+    monkeypatch.setattr(app_module, "_publish_executor", ThreadPoolExecutor(max_workers=1))
+    app_module.register_channel("Langsam", timeout=1)(lambda text: time.sleep(0.2) or "langsam")
+    app_module.register_channel("Schnell", timeout=0.1)(lambda text: "schnell")
+
+    results = app_module.distribute_content_multichannel("Text")
+    assert results["Langsam"]["status"] == "ok"
+    assert (results["Schnell"]["status"], results["Schnell"]["result"]) == ("ok", "schnell")
+
+
+def test_channel_that_never_gets_a_worker_is_cancelled(app_module, channels, monkeypatch):
+    monkeypatch.setattr(app_module, "_publish_executor", ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(app_module, "PUBLISH_QUEUE_TIMEOUT", 0.05)
+    release = threading.Event()
+    app_module.register_channel("Hängt", timeout=0.05)(lambda text: release.wait(2))
+    app_module.register_channel("Wartet")(lambda text: "nie ausgeführt")
+    try:
+        results = app_module.distribute_content_multichannel("Text")
+    finally:
+        release.set()
+    assert results["Hängt"]["status"] == "timeout"
+    assert results["Wartet"]["status"] == "timeout"
+    assert "Nicht gestartet" in results["Wartet"]["error"]
+
+
+def test_in_flight_calls_are_capped_per_channel(app_module, channels, monkeypatch):
+    monkeypatch.setattr(app_module, "PUBLISH_MAX_INFLIGHT", 2)
+    release = threading.Event()
+    app_module.register_channel("Hängt", timeout=0.01)(lambda text: release.wait(2))
+
+    statuses = [app_module.distribute_content_multichannel("Text")["Hängt"]["status"] for _ in range(3)]
+    assert statuses == ["timeout", "timeout", "busy"]
+
+    release.set()
+    time.sleep(0.05)
+    assert app_module.distribute_content_multichannel("Text")["Hängt"]["status"] == "ok"
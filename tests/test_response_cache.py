@@ -0,0 +1,86 @@
+import uuid
+
+import pytest
+from flask import Flask, Response, request
+
+
+@pytest.fixture
+def mini(app_module):
+    """Kleine App mit gecachten Routen; eindeutige Endpoint-Namen trennen die Cache-Keys der Tests."""
+    mini = Flask("response-cache-test")
+    mini.calls = []
+    suffix = uuid.uuid4().hex
+
+    @mini.route("/report", endpoint=f"report-{suffix}")
+    @app_module.cached_response(ttl=120, vary_args=("lang",), vary_headers=("Accept-Language",))
+    def report():
+        mini.calls.append(request.args.get("lang"))
+        return {"lang": request.args.get("lang"), "n": len(mini.calls)}
+
+    @mini.route("/missing", endpoint=f"missing-{suffix}")
+    @app_module.cached_response(ttl=120)
+    def missing():
+        mini.calls.append("missing")
+        return {"error": "nicht gefunden"}, 404
+
+    @mini.route("/stream", endpoint=f"stream-{suffix}")
+    @app_module.cached_response(ttl=120)
+    def stream():
+        mini.calls.append("stream")
+        return Response((c for c in "abc"), mimetype="text/plain")
+
+    return mini
+
+
+def test_etag_cache_control_and_vary(mini):
+    resp = mini.test_client().get("/report?lang=de")
+    assert resp.status_code == 200
+    assert resp.headers["ETag"].startswith('"')
+    assert resp.cache_control.public is True
+    assert resp.cache_control.max_age == 120
+    assert "Accept-Language" in resp.vary
+
+
+def test_if_none_match_returns_304_without_calling_the_view(mini):
+    client = mini.test_client()
+    first = client.get("/report?lang=de")
+    again = client.get("/report?lang=de", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.get_data() == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert again.cache_control.max_age == 120
+
+    stale = client.get("/report?lang=de", headers={"If-None-Match": '"veraltet"'})
+    assert stale.status_code == 200
+    assert stale.get_json() == first.get_json()
+    assert mini.calls == ["de"]
+
+
+def test_vary_args_and_headers_are_part_of_the_key(mini):
+    client = mini.test_client()
+    de = client.get("/report?lang=de").get_json()
+    en = client.get("/report?lang=en").get_json()
+    de_at = client.get("/report?lang=de", headers={"Accept-Language": "de-AT"}).get_json()
+    assert (de["lang"], en["lang"]) == ("de", "en")
+    assert de_at["n"] == 3
+    assert client.get("/report?lang=de&unrelated=1").get_json() == de
+
+
+def test_errors_and_streams_bypass_the_cache(mini):
+    client = mini.test_client()
+    for _ in range(2):
+        missing = client.get("/missing")
+        assert missing.status_code == 404
+        assert "ETag" not in missing.headers
+        assert client.get("/stream").get_data(as_text=True) == "abc"
+    assert mini.calls == ["missing", "stream", "missing", "stream"]
+
+
+def test_app_route_round_trip(client):
+    first = client.get("/list_high_ticket")
+    assert first.status_code == 200
+    assert first.cache_control.max_age == 3600
+    assert client.get("/list_high_ticket", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+    es = client.get("/multi_language_content?lang=es")
+    en = client.get("/multi_language_content?lang=en")
+    assert es.headers["ETag"] != en.headers["ETag"]
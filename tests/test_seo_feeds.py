@@ -0,0 +1,34 @@
+from email.utils import format_datetime
+
+import pytest
+
+
+@pytest.fixture
+def articles(app_module):
+    return [app_module.seo_articles.add(title=f"Feed {i}", content="Inhalt & mehr", keywords=["Feed"]) for i in range(2)]
+
+
+@pytest.mark.parametrize("path", ["/sitemap.xml", "/news.xml"])
+def test_last_modified_and_if_modified_since(client, articles, path):
+    resp = client.get(path)
+    body = resp.get_data(as_text=True)
+    assert resp.status_code == 200
+    assert all(a in body for a in articles)
+    last_modified = resp.headers["Last-Modified"]
+
+    assert client.get(path, headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(path, headers={"If-None-Match": resp.headers["ETag"]}).status_code == 304
+    older = format_datetime(resp.last_modified.replace(year=2000), usegmt=True)
+    fresh = client.get(path, headers={"If-Modified-Since": older})
+    fresh.get_data()   # Stream ausschöpfen, solange der Request-Kontext aktiv ist
+    assert fresh.status_code == 200
+
+
+def test_update_invalidates_conditional_get(client, app_module, articles, monkeypatch):
+    first = client.get("/sitemap.xml")
+    first.get_data()
+    monkeypatch.setattr(app_module, "ADMIN_API_TOKEN", "t")
+    client.put(f"/seo_articles/{articles[0]}", json={"title": "Neu"}, headers={"X-Admin-Token": "t"})
+    again = client.get("/sitemap.xml", headers={"If-None-Match": first.headers["ETag"]})
+    again.get_data()
+    assert again.status_code == 200
@@ -0,0 +1,70 @@
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def tag():
+    """Eindeutiges Keyword/Suchwort, damit Tests sich die Session-Datenbank teilen können."""
+    return "tag" + uuid.uuid4().hex[:10]
+
+
+@pytest.fixture
+def tagged(app_module, tag):
+    return [
+        app_module.seo_articles.add(title=f"Artikel {i}", content=f"Text {i} über {tag} und mehr.", keywords=[tag.upper(), "Allgemein"])
+        for i in range(5)
+    ]
+
+
+def test_keyword_filter_and_pagination(client, tag, tagged):
+    first = client.get(f"/seo_articles?keyword={tag}&per_page=2").get_json()
+    assert first["total"] == 5
+    assert first["page"] == 1 and first["per_page"] == 2
+    assert len(first["articles"]) == 2
+
+    pages = [client.get(f"/seo_articles?keyword={tag}&per_page=2&page={p}").get_json()["articles"] for p in (1, 2, 3)]
+    ids = [a["id"] for page in pages for a in page]
+    assert sorted(ids) == sorted(tagged)
+    assert [len(p) for p in pages] == [2, 2, 1]
+    assert all(tag.upper() in a["keywords"] for a in pages[0])
+
+
+@pytest.mark.parametrize("query, page, per_page", [
+    ("page=0&per_page=0", 1, 1),
+    ("page=-3&per_page=100000", 1, 100),
+    ("page=abc&per_page=x", 1, 20),
+])
+def test_pagination_bounds(client, app_module, tag, tagged, query, page, per_page):
+    data = client.get(f"/seo_articles?keyword={tag}&{query}").get_json()
+    assert data["page"] == page
+    assert data["per_page"] == min(per_page, app_module.SEO_MAX_PER_PAGE)
+    assert len(data["articles"]) == min(per_page, 5)
+
+
+def test_page_past_end_is_empty(client, tag, tagged):
+    data = client.get(f"/seo_articles?keyword={tag}&per_page=2&page=9").get_json()
+    assert data["articles"] == []
+    assert data["total"] == 5
+
+
+def test_search_returns_snippets(client, tag, tagged):
+    resp = client.get(f"/seo_articles/search?q={tag}&per_page=10")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["total"] == 5
+    assert sorted(a["id"] for a in data["articles"]) == sorted(tagged)
+    assert all(tag in a["snippet"] for a in data["articles"])
+
+
+def test_search_escapes_fts_syntax(client, tag, tagged):
+    resp = client.get(f'/seo_articles/search?q="{tag}" OR NEAR(')
+    assert resp.status_code == 200
+    assert resp.get_json()["total"] == 0
+
+
+def test_empty_results(client, tag):
+    assert client.get(f"/seo_articles?keyword={tag}").get_json() == {"articles": [], "page": 1, "per_page": 20, "total": 0}
+    data = client.get(f"/seo_articles/search?q={tag}").get_json()
+    assert data["articles"] == [] and data["total"] == 0
+    assert client.get("/seo_articles/search?q=%20").status_code == 400
@@ -0,0 +1,65 @@
+import json
+import re
+
+import pytest
+
+TOKEN = "test-admin-token"
+
+
+@pytest.fixture
+def article_id(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "ADMIN_API_TOKEN", TOKEN)
+    return app_module.seo_articles.add(title="Guide zu Kaffee", content="Alles über Kaffee.", keywords=["Kaffee"])
+
+
+def put(client, article_id, body, token=TOKEN):
+    headers = {"X-Admin-Token": token} if token else {}
+    return client.put(f"/seo_articles/{article_id}", data=json.dumps(body), content_type="application/json", headers=headers)
+
+
+def test_update_requires_admin_token(client, article_id):
+    assert put(client, article_id, {"title": "Neu"}, token=None).status_code == 403
+    assert put(client, article_id, {"title": "Neu"}, token="falsch").status_code == 403
+
+
+@pytest.mark.parametrize("body", [
+    [],
+    {},
+    {"article_id": "anderer"},
+    {"schema_markup": "<script>alert(1)</script>"},
+    {"keywords": 5},
+    {"keywords": ["ok", 3]},
+    {"title": {"de": "x"}},
+    {"title": "   "},
+])
+def test_invalid_update_bodies_return_400(client, article_id, body):
+    assert put(client, article_id, body).status_code == 400
+
+
+def test_unknown_article_returns_404(client, article_id):
+    assert put(client, "gibtsnicht", {"title": "Neu"}).status_code == 404
+
+
+def test_json_ld_is_built_server_side_and_escaped(client, article_id):
+    payload = "</script><script>alert(1)</script>"
+    resp = put(client, article_id, {"title": f"Titel {payload}", "content": f"Text {payload}", "keywords": [payload]})
+    assert resp.status_code == 200
+
+    html = client.get(f"/view_seo_article/{article_id}").get_data(as_text=True)
+    assert "<script>alert(1)" not in html
+    blocks = re.findall(r'<script type="application/ld\+json">(.*?)</script>', html, re.S)
+    schemas = [json.loads(b) for b in blocks]
+    assert [s["@type"] for s in schemas] == ["Article", "FAQPage"]
+    assert schemas[0]["headline"] == f"Dein Artikel zu {payload}"
+    assert schemas[0]["articleBody"].startswith(f"Text {payload}")
+
+
+def test_list_and_search_after_add(client, article_id):
+    listed = client.get("/seo_articles?keyword=kaffee")
+    assert listed.status_code == 200
+    assert article_id in [a["id"] for a in listed.get_json()["articles"]]
+    assert client.get("/seo_articles").status_code == 200
+
+    found = client.get("/seo_articles/search?q=Kaffee")
+    assert found.status_code == 200
+    assert article_id in [a["id"] for a in found.get_json()["articles"]]
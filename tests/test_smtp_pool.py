@@ -0,0 +1,105 @@
+import smtplib
+
+import pytest
+
+
+class FakeSMTP:
+    """Zeichnet Verbindungen und Sends auf; `failures` enthält Exceptions für die nächsten send_message-Aufrufe,
+    Empfänger in `refused` werden immer abgelehnt."""
+
+    connections = []
+    failures = []
+    refused = set()
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.closed = False
+        FakeSMTP.connections.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def send_message(self, msg):
+        if FakeSMTP.failures:
+            failure = FakeSMTP.failures.pop(0)
+            if failure is not None:
+                raise failure
+        if msg["To"] in FakeSMTP.refused:
+            raise smtplib.SMTPRecipientsRefused({msg["To"]: (550, b"unknown")})
+        self.sent.append(msg["To"])
+
+    def quit(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool(app_module, monkeypatch):
+    FakeSMTP.connections, FakeSMTP.failures, FakeSMTP.refused = [], [], set()
+    monkeypatch.setattr(app_module.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(app_module, "SMTP_MAX_MESSAGES_PER_SESSION", 2)
+    return app_module.SmtpSessionPool(1)
+
+
+def messages(app_module, n):
+    return [app_module.build_email_message(f"u{i}@example.com", "Betreff", "Text") for i in range(n)]
+
+
+def test_session_is_renewed_after_max_messages(app_module, pool):
+    assert pool.send_many(messages(app_module, 5)) == [None] * 5
+    assert [c.sent for c in FakeSMTP.connections] == [
+        ["u0@example.com", "u1@example.com"], ["u2@example.com", "u3@example.com"], ["u4@example.com"]
+    ]
+    assert all(c.closed for c in FakeSMTP.connections[:2])
+
+
+def test_idle_session_is_reused_across_batches(app_module, pool, monkeypatch):
+    monkeypatch.setattr(app_module, "SMTP_MAX_MESSAGES_PER_SESSION", 100)
+    pool.send_many(messages(app_module, 1))
+    pool.send_many(messages(app_module, 1))
+    assert len(FakeSMTP.connections) == 1
+
+    monkeypatch.setattr(app_module, "SMTP_IDLE_TIMEOUT", -1)
+    pool.send_many(messages(app_module, 1))
+    assert len(FakeSMTP.connections) == 2
+    assert FakeSMTP.connections[0].closed
+
+
+@pytest.mark.parametrize("error", [
+    smtplib.SMTPServerDisconnected("weg"),
+    smtplib.SMTPResponseException(421, b"Service not available"),
+])
+def test_connection_error_reconnects_and_resends(app_module, pool, error):
+    FakeSMTP.failures = [None, error]
+    assert pool.send_many(messages(app_module, 3)) == [None] * 3
+    assert [c.sent for c in FakeSMTP.connections] == [["u0@example.com"], ["u1@example.com", "u2@example.com"]]
+
+
+def test_message_errors_are_reported_per_message(app_module, pool):
+    FakeSMTP.failures = [None, smtplib.SMTPRecipientsRefused({"u1@example.com": (550, b"unknown")})]
+    results = pool.send_many(messages(app_module, 2))
+    assert results[0] is None
+    assert "u1@example.com" in results[1]
+    assert len(FakeSMTP.connections) == 1
+
+
+def test_failed_connect_fails_the_batch_and_frees_the_slot(app_module, pool, monkeypatch):
+    def refuse(*args, **kwargs):
+        raise ConnectionRefusedError("SMTP nicht erreichbar")
+
+    monkeypatch.setattr(app_module.smtplib, "SMTP", refuse)
+    assert pool.send_many(messages(app_module, 2)) == ["SMTP nicht erreichbar"] * 2
+
+    monkeypatch.setattr(app_module.smtplib, "SMTP", FakeSMTP)
+    assert pool.send_many(messages(app_module, 1)) == [None]
+
+
+def test_send_many_emails_keeps_input_order_across_sessions(app_module, pool, monkeypatch):
+    monkeypatch.setattr(app_module, "USE_SIMULATION", False)
+    monkeypatch.setattr(app_module, "smtp_pool", pool)
+    FakeSMTP.refused = {"u2@example.com"}
+    results = app_module.send_many_emails([(f"u{i}@example.com", "Betreff", "Text") for i in range(5)])
+    assert [r is None for r in results] == [True, True, False, True, True]
+    assert sorted(to for c in FakeSMTP.connections for to in c.sent) == [f"u{i}@example.com" for i in (0, 1, 3, 4)]
@@ -0,0 +1,77 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+ALL_FEATURES = ("core", "shop", "affiliate", "images", "marketing", "seo", "ai", "admin")
+WORKER_ROLES = {
+    "edge": ("core", "shop", "affiliate", "images"),
+    "ai": ("core", "ai", "seo"),
+    "backoffice": ("core", "marketing", "admin"),
+}
+
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", 3.0))
+STARTUP_BUDGET_RSS_MB = float(os.getenv("STARTUP_BUDGET_RSS_MB", 250))
+HEAVY_MODULES = ("numpy", "PIL", "transformers", "torch", "pandas", "sklearn")
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import app
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [m for m in %r if m in sys.modules],
+    "blueprints": sorted(app.app.blueprints),
+    "rules": sorted(r.rule for r in app.app.url_map.iter_rules()),
+}))
+""" % (HEAVY_MODULES,)
+
+
+def run_probe(tmp_path, **env):
+    proc_env = dict(os.environ, PYTHONPATH=ROOT, APP_DB_PATH=str(tmp_path / "app_data.db"),
+                    IMAGE_DIR=str(tmp_path / "images"), **env)
+    return subprocess.run([sys.executable, "-c", PROBE], cwd=tmp_path, env=proc_env,
+                          capture_output=True, text=True, timeout=60)
+
+
+def import_app(tmp_path, **env):
+    """Importiert app in einem frischen Interpreter mit leerem Arbeitsverzeichnis und liefert die Probe-Werte."""
+    proc = run_probe(tmp_path, **env)
+    assert proc.returncode == 0, proc.stderr[-4000:]
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_import_is_lazy_and_within_budget(tmp_path):
+    probe = import_app(tmp_path)
+    assert probe["heavy"] == []
+    assert probe["seconds"] < STARTUP_BUDGET_SECONDS
+    assert probe["rss_mb"] < STARTUP_BUDGET_RSS_MB
+
+
+@pytest.mark.parametrize("role, present, absent", [
+    ("edge", ["/compress_image", "/add_vip_points/bulk"], ["/translate_text", "/admin/restore_database", "/sitemap.xml"]),
+    ("ai", ["/translate_text", "/sitemap.xml"], ["/compress_image", "/admin/restore_database"]),
+    ("backoffice", ["/admin/restore_database", "/send_welcome_series"], ["/compress_image", "/translate_text"]),
+])
+def test_worker_role_selects_blueprints(tmp_path, role, present, absent):
+    probe = import_app(tmp_path, WORKER_ROLE=role)
+    expected = set(WORKER_ROLES[role])
+    assert expected <= set(probe["blueprints"])
+    assert not (set(ALL_FEATURES) - expected) & set(probe["blueprints"])
+    assert all(rule in probe["rules"] for rule in present)
+    assert not any(rule in probe["rules"] for rule in absent)
+
+
+def test_worker_features_override_and_unknown_role(tmp_path):
+    probe = import_app(tmp_path, WORKER_ROLE="edge", WORKER_FEATURES="seo")
+    assert {"core", "seo"} <= set(probe["blueprints"])
+    assert "images" not in probe["blueprints"]
+
+    proc = run_probe(tmp_path, WORKER_ROLE="gibtsnicht")
+    assert proc.returncode != 0
+    assert "Unbekannte WORKER_ROLE" in proc.stderr
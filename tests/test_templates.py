@@ -0,0 +1,29 @@
+from markupsafe import Markup
+
+XSS = "<script>alert(1)</script>"
+
+
+def test_landing_page_escapes_query_input(client):
+    html = client.get("/landing_page", query_string={"interest": XSS}).get_data(as_text=True)
+    assert XSS not in html
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+
+
+def test_registered_templates_autoescape_but_keep_markup(app_module):
+    registry = app_module.TemplateRegistry(app_module.app.jinja_env)
+    registry.register("probe", "<p>{{ text }}</p>{{ widget }}")
+    html = registry.render("probe", text=XSS, widget=Markup("<b>Widget</b>"))
+    assert html == "<p>&lt;script&gt;alert(1)&lt;/script&gt;</p><b>Widget</b>"
+
+
+def test_template_is_compiled_once_and_recompiled_on_register(app_module, monkeypatch):
+    registry = app_module.TemplateRegistry(app_module.app.jinja_env)
+    compiled = []
+    from_string = registry.env.from_string
+    monkeypatch.setattr(registry.env, "from_string", lambda source: compiled.append(source) or from_string(source))
+
+    registry.register("probe", "{{ a }}")
+    assert [registry.render("probe", a=i) for i in range(3)] == ["0", "1", "2"]
+    registry.register("probe", "[{{ a }}]")
+    assert registry.render("probe", a=1) == "[1]"
+    assert compiled == ["{{ a }}", "[{{ a }}]"]
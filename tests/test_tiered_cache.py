@@ -0,0 +1,118 @@
+import queue
+import time
+
+import pytest
+import redis
+
+from conftest import InMemoryRedis
+
+
+class PubSubRedis(InMemoryRedis):
+    """InMemoryRedis mit funktionierendem Pub/Sub, geteilt von mehreren Cache-Instanzen ("Workern")."""
+
+    def __init__(self):
+        super().__init__()
+        self.subscribers = []
+
+    def publish(self, channel, message):
+        targets = [q for ch, q in self.subscribers if ch == channel]
+        for q in targets:
+            q.put({"type": "message", "data": message})
+        return len(targets)
+
+    def pubsub(self, **kwargs):
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, broker):
+        self.broker = broker
+        self.queue = queue.Queue()
+
+    def subscribe(self, channel):
+        self.broker.subscribers.append((channel, self.queue))
+
+    def listen(self):
+        while True:
+            yield self.queue.get()
+
+
+class BrokenRedis(InMemoryRedis):
+    def get(self, key):
+        raise redis.ConnectionError("Redis weg")
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Bedingung nicht rechtzeitig erfüllt"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def broker():
+    return PubSubRedis()
+
+
+@pytest.fixture
+def make_cache(app_module, broker):
+    def make(max_items=16):
+        cache = app_module.TwoTierCache(broker, "test-invalidation", max_items, local_ttl=60)
+        subscribed = len(broker.subscribers)
+        cache.get("warmup")   # startet den Listener
+        wait_for(lambda: len(broker.subscribers) > subscribed)
+        return cache
+    return make
+
+
+def test_lru_evicts_least_recently_used_and_expires(app_module):
+    lru = app_module.LRUCache(max_items=2, default_ttl=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    lru.set("c", 3)
+    assert (lru.get("a"), lru.get("b"), lru.get("c")) == (1, None, 3)
+
+    lru.set("kurz", 4, ttl=-1)
+    assert lru.get("kurz", "weg") == "weg"
+
+
+def test_local_tier_serves_after_first_redis_hit(make_cache, broker):
+    cache = make_cache()
+    broker.setex("k", 60, '{"v": 1}')
+    assert cache.get("k") == {"v": 1}
+    broker.data.clear()
+    assert cache.get("k") == {"v": 1}
+    stats = cache.stats()
+    assert (stats["redis_hits"], stats["local_hits"]) == (1, 1)
+
+
+def test_publish_invalidates_other_workers_local_copy(make_cache):
+    worker_a, worker_b = make_cache(), make_cache()
+    worker_a.set("preis", 10)
+    assert worker_b.get("preis") == 10
+
+    worker_a.set("preis", 12)
+    wait_for(lambda: worker_b.stats()["invalidations_received"] >= 2)
+    assert worker_b.get("preis") == 12
+
+    worker_b.delete("preis")
+    wait_for(lambda: worker_a.local.get("preis") is None)
+    assert worker_a.get("preis") is None
+
+
+def test_own_invalidations_are_ignored(make_cache):
+    cache = make_cache()
+    cache.set("k", 1)
+    time.sleep(0.05)
+    assert cache.stats()["invalidations_received"] == 0
+    assert cache.local.get("k") == 1
+
+
+def test_redis_errors_degrade_to_a_miss(app_module):
+    cache = app_module.TwoTierCache(BrokenRedis(), "test-invalidation", 16, local_ttl=60)
+    cache._listener = object()   # kein Listener-Thread für diesen Test
+    assert cache.get("k", "default") == "default"
+    assert cache.stats()["redis_errors"] == 1
+    assert cache.get_or_set("k", lambda: "geladen") == "geladen"
+    assert cache.get("k") == "geladen"
@@ -0,0 +1,43 @@
+import json
+
+
+def post_csv(client, body):
+    return client.post("/add_vip_points/bulk", data=body, content_type="text/csv")
+
+
+def test_csv_coerces_numeric_points(client, app_module):
+    resp = post_csv(client, b"email,points\ncsv-a@example.com,3.0\ncsv-b@example.com, 7 \n")
+    assert resp.status_code == 200
+    assert resp.get_json()["applied"] == 2
+    assert app_module.vip_ledger.total("csv-a@example.com") == 3
+    assert app_module.vip_ledger.total("csv-b@example.com") == 7
+
+
+def test_out_of_range_and_non_numeric_points_are_row_errors(client):
+    resp = post_csv(client, b"big@example.com,1e12\nnan@example.com,nan\ntext@example.com,viele\nok@example.com,1\n")
+    summary = resp.get_json()
+    assert resp.status_code == 200
+    assert summary["applied"] == 1
+    assert [e["line"] for e in summary["errors"]] == [1, 2, 3]
+
+
+def test_ndjson_rejects_boolean_points(client):
+    body = "\n".join(json.dumps(r) for r in [{"email": "b@example.com", "points": True}, {"email": "f@example.com", "points": 2.0}])
+    resp = client.post("/add_vip_points/bulk", data=body, content_type="application/x-ndjson")
+    summary = resp.get_json()
+    assert summary["applied"] == 1
+    assert summary["errors"][0]["line"] == 1
+
+
+def test_non_utf8_upload_returns_400_with_row_error(client):
+    resp = post_csv(client, b"latin@example.com,5\nm\xfcller@example.com,5\n")
+    summary = resp.get_json()
+    assert resp.status_code == 400
+    assert summary["applied"] == 1
+    assert summary["errors"][0]["line"] == 2
+    assert "UTF-8" in summary["error"]
+
+
+def test_broken_csv_returns_400(client):
+    resp = post_csv(client, b'quote@example.com,"5"x\n')
+    assert resp.status_code == 400